@@ -0,0 +1,159 @@
+import json
+import pathlib
+import threading
+from typing import Dict, Optional, Tuple
+
+from app.Img import Img
+from app.Moves import Moves
+
+
+class AssetCache:
+    """
+    Process-wide cache for piece assets.
+
+    Sprite frames are keyed on (sprites_dir, cell_size, interpolation) and are
+    decoded, resized and converted to the blend layout exactly once; every
+    Graphics built for the same folder shares the same Img objects, whose
+    pixel arrays are frozen (read-only).
+    Parsed `config.json` files and `Moves` tables are cached the same way.
+    An AssetPack fills the cache up front through the `put_*` methods.
+    """
+    def __init__(self):
+        self._frames: Dict[tuple, Tuple[Img, ...]] = {}
+        self._configs: Dict[pathlib.Path, dict] = {}
+        self._moves: Dict[tuple, Moves] = {}
+        self._move_lists: Dict[pathlib.Path, list] = {}   # parsed moves.txt, from a pack
+        self._resolved: Dict[str, pathlib.Path] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, path) -> pathlib.Path:
+        # resolve() hits the file system; remember it per spelling of the path.
+        name = str(path)
+        key = self._resolved.get(name)
+        if key is None:
+            key = self._resolved[name] = pathlib.Path(path).resolve()
+        return key
+
+    def get_frames(self,
+                   sprites_dir: pathlib.Path,
+                   cell_size: Tuple[int, int],
+                   interpolation: Optional[int] = None,
+                   img_cls=Img) -> Tuple[Img, ...]:
+        """
+        Return the sprite frames of `sprites_dir` resized to `cell_size`,
+        sorted alphabetically. Frames are loaded on the first call only.
+        """
+        sprites_dir = pathlib.Path(sprites_dir)
+        key = (self._key(sprites_dir), tuple(cell_size), interpolation)
+        with self._lock:
+            frames = self._frames.get(key)
+            if frames is not None:
+                self.hits += 1
+                return frames
+            self.misses += 1
+
+        frames = self._read_frames(sprites_dir, cell_size, interpolation, img_cls)
+        with self._lock:
+            # Another thread may have won the race; keep the first copy.
+            return self._frames.setdefault(key, frames)
+
+    @staticmethod
+    def _read_frames(sprites_dir: pathlib.Path,
+                     cell_size: Tuple[int, int],
+                     interpolation: Optional[int],
+                     img_cls) -> Tuple[Img, ...]:
+        if not sprites_dir.exists():
+            return ()
+        return tuple(AssetCache.read_frame(file, cell_size, interpolation, img_cls)
+                     for file in sorted(sprites_dir.glob("*.png")))
+
+    @staticmethod
+    def read_frame(file: pathlib.Path,
+                   cell_size: Tuple[int, int],
+                   interpolation: Optional[int] = None,
+                   img_cls=Img) -> Img:
+        """Decode and resize one sprite file into a frozen, blend-ready frame."""
+        kwargs = {} if interpolation is None else {"interpolation": interpolation}
+        img = img_cls().read(file, (cell_size[0], cell_size[1]), **kwargs)
+        pixels = getattr(img, "img", None)
+        if pixels is not None:
+            pixels.flags.writeable = False  # frames are shared, never draw into them
+            img.prepare_blend()
+        return img
+
+    def get_config(self, cfg_path: pathlib.Path) -> dict:
+        """Return the parsed JSON config at `cfg_path` (treat it as read-only)."""
+        key = self._key(cfg_path)
+        with self._lock:
+            cfg = self._configs.get(key)
+            if cfg is not None:
+                self.hits += 1
+                return cfg
+            self.misses += 1
+        with open(cfg_path, "r", encoding="utf-8") as f:
+            cfg = json.load(f)
+        with self._lock:
+            return self._configs.setdefault(key, cfg)
+
+    def get_moves(self, txt_path: pathlib.Path, dims: Tuple[int, int]) -> Moves:
+        """Return the Moves table for `txt_path` on a board of `dims`, shared per piece type."""
+        key = (self._key(txt_path), tuple(dims))
+        with self._lock:
+            moves = self._moves.get(key)
+            if moves is not None:
+                self.hits += 1
+                return moves
+            self.misses += 1
+        moves = Moves(txt_path, dims, self._move_lists.get(key[0]))
+        with self._lock:
+            return self._moves.setdefault(key, moves)
+
+    def has_frames(self, sprites_dir: pathlib.Path, cell_size: Tuple[int, int],
+                   interpolation: Optional[int] = None) -> bool:
+        with self._lock:
+            return (self._key(sprites_dir), tuple(cell_size), interpolation) in self._frames
+
+    def put_frames(self, sprites_dir: pathlib.Path, cell_size: Tuple[int, int],
+                   interpolation: Optional[int], frames: Tuple[Img, ...]):
+        """Serve `frames` for `sprites_dir` without reading it (frames must be read-only)."""
+        with self._lock:
+            self._frames[(self._key(sprites_dir), tuple(cell_size), interpolation)] = tuple(frames)
+
+    def put_config(self, cfg_path: pathlib.Path, cfg: dict):
+        """Serve `cfg` for `cfg_path` without reading it."""
+        with self._lock:
+            self._configs[self._key(cfg_path)] = cfg
+
+    def put_move_list(self, txt_path: pathlib.Path, moves_list: list):
+        """Build Moves tables for `txt_path` from an already parsed move list."""
+        with self._lock:
+            self._move_lists[self._key(txt_path)] = moves_list
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and the number of cached entries."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "frame_sets": len(self._frames),
+                "frames": sum(len(f) for f in self._frames.values()),
+                "configs": len(self._configs),
+                "moves": len(self._moves),
+            }
+
+    def clear(self):
+        """Drop every cached asset and reset the counters."""
+        with self._lock:
+            self._frames.clear()
+            self._configs.clear()
+            self._moves.clear()
+            self._move_lists.clear()
+            self._resolved.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared instance used by Graphics, GraphicsFactory and PieceFactory.
+asset_cache = AssetCache()
@@ -0,0 +1,166 @@
+"""
+Precompiled asset pack for a pieces/ tree.
+
+    python -m app.AssetPack pieces pieces.pack --cell 100
+
+A pack holds, for one cell size, the tree's SpriteAtlas (every sprite
+frame already resized and converted to BGRA in one contiguous array)
+plus the parsed config.json files and move lists. PieceFactory loads it
+with a single mmap; a pack whose sources changed since it was built is
+stale and ignored, and assets are read from the tree as before.
+
+File layout: header `<4sHHI` (magic, version, reserved, meta length), the
+meta JSON, zero padding to a 64-byte boundary, then the frame array.
+"""
+import argparse
+import json
+import pathlib
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.AssetCache import AssetCache, asset_cache
+from app.Moves import Moves
+from app.SpriteAtlas import SpriteAtlas
+
+MAGIC = b"CFAP"
+PACK_VERSION = 1
+_HEADER = struct.Struct("<4sHHI")
+_ALIGN = 64
+
+
+class AssetPackError(Exception): ...
+
+
+def _sources(pieces_root: pathlib.Path) -> Dict[str, List[int]]:
+    """(mtime_ns, size) of every file under `pieces_root`, keyed by relative path."""
+    sources = {}
+    for path in sorted(pieces_root.rglob("*")):
+        if path.is_file():
+            st = path.stat()
+            sources[path.relative_to(pieces_root).as_posix()] = [st.st_mtime_ns, st.st_size]
+    return sources
+
+
+def build_pack(pieces_root: pathlib.Path, out_path: pathlib.Path,
+               cell_size: Tuple[int, int] = (100, 100)) -> dict:
+    """Compile `pieces_root` into a pack at `out_path`; returns the pack's meta data."""
+    pieces_root = pathlib.Path(pieces_root)
+    sources = _sources(pieces_root)
+    atlas = SpriteAtlas.from_tree(pieces_root, cell_size)
+    meta = {"version": PACK_VERSION, "cell_size": list(cell_size),
+            "frame_shape": [cell_size[1], cell_size[0], 4], "n_frames": len(atlas.frames),
+            "sources": sources, "configs": {}, "moves": {},
+            "frames": {f"{p_type}/states/{state}/sprites": list(run)
+                       for (p_type, state), run in atlas.index.items()}}
+    for piece_dir in sorted(p for p in pieces_root.iterdir() if p.is_dir()):
+        moves_path = piece_dir / "moves.txt"
+        if moves_path.exists():
+            meta["moves"][moves_path.relative_to(pieces_root).as_posix()] = Moves.read(moves_path)
+        for cfg_path in sorted(piece_dir.glob("states/*/config.json")):
+            with open(cfg_path, "r", encoding="utf-8") as f:
+                meta["configs"][cfg_path.relative_to(pieces_root).as_posix()] = json.load(f)
+
+    meta_bytes = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+    head = _HEADER.size + len(meta_bytes)
+    padding = -head % _ALIGN
+    with open(out_path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, PACK_VERSION, 0, len(meta_bytes)))
+        f.write(meta_bytes)
+        f.write(b"\0" * padding)
+        f.write(np.ascontiguousarray(atlas.frames).tobytes())
+    return meta
+
+
+class AssetPack:
+    """A pack file opened read-only; `frames` is a memory map of the frame array."""
+    def __init__(self, path: pathlib.Path, meta: dict, frames: np.ndarray):
+        self.path = path
+        self.meta = meta
+        self.frames = frames
+
+    @classmethod
+    def open(cls, path: pathlib.Path) -> "AssetPack":
+        path = pathlib.Path(path)
+        with open(path, "rb") as f:
+            head = f.read(_HEADER.size)
+            if len(head) < _HEADER.size:
+                raise AssetPackError(f"{path}: truncated pack.")
+            magic, version, _, meta_len = _HEADER.unpack(head)
+            if magic != MAGIC:
+                raise AssetPackError(f"{path}: not an asset pack (magic {magic!r}).")
+            if version != PACK_VERSION:
+                raise AssetPackError(f"{path}: pack version {version}, expected {PACK_VERSION}.")
+            meta = json.loads(f.read(meta_len).decode("utf-8"))
+        offset = _HEADER.size + meta_len
+        offset += -offset % _ALIGN
+        shape = (meta["n_frames"], *meta["frame_shape"])
+        if meta["n_frames"]:
+            frames = np.memmap(path, dtype=np.uint8, mode="r", offset=offset, shape=shape)
+        else:
+            frames = np.zeros(shape, dtype=np.uint8)
+        return cls(path, meta, frames)
+
+    @property
+    def cell_size(self) -> Tuple[int, int]:
+        return tuple(self.meta["cell_size"])
+
+    def is_fresh(self, pieces_root: pathlib.Path) -> bool:
+        """True if no file under `pieces_root` was added, removed or modified since the build."""
+        return _sources(pathlib.Path(pieces_root)) == self.meta["sources"]
+
+    def atlas(self) -> SpriteAtlas:
+        """The pack's frames as a SpriteAtlas backed by the memory map."""
+        index = {}
+        for rel, (start, count) in self.meta["frames"].items():
+            p_type, _, state, _ = rel.split("/")
+            index[(p_type, state)] = (start, count)
+        return SpriteAtlas(self.frames, index, self.cell_size)
+
+    def install(self, pieces_root: pathlib.Path, cache: AssetCache = asset_cache):
+        """Serve every asset of the pack from `cache` as if it was read from `pieces_root`."""
+        pieces_root = pathlib.Path(pieces_root)
+        self.atlas().install(pieces_root, cache)
+        for rel, cfg in self.meta["configs"].items():
+            cache.put_config(pieces_root / rel, cfg)
+        for rel, moves_list in self.meta["moves"].items():
+            cache.put_move_list(pieces_root / rel, [tuple(m) for m in moves_list])
+
+
+def load_pack(path: pathlib.Path, pieces_root: pathlib.Path, cell_size: Tuple[int, int],
+              cache: AssetCache = asset_cache) -> bool:
+    """
+    Install the pack at `path` into `cache` if it was built from the current
+    `pieces_root` for `cell_size`. Returns False (and the tree is read as
+    usual) when the pack is missing, unreadable, stale or for another size.
+    """
+    try:
+        pack = AssetPack.open(path)
+    except (OSError, AssetPackError, ValueError, KeyError) as e:
+        print(f"[WARN] Ignoring asset pack: {e}")
+        return False
+    if pack.cell_size != tuple(cell_size):
+        print(f"[WARN] Asset pack {path} is for cell size {pack.cell_size}, not {tuple(cell_size)}.")
+        return False
+    if not pack.is_fresh(pieces_root):
+        print(f"[WARN] Asset pack {path} is stale; loading {pieces_root} instead.")
+        return False
+    pack.install(pieces_root, cache)
+    return True
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pieces_root", type=pathlib.Path)
+    parser.add_argument("out", type=pathlib.Path)
+    parser.add_argument("--cell", type=int, default=100, help="cell size in pixels")
+    args = parser.parse_args(argv)
+    meta = build_pack(args.pieces_root, args.out, (args.cell, args.cell))
+    print(f"wrote {args.out}: {meta['n_frames']} frames, {len(meta['configs'])} configs, "
+          f"{len(meta['moves'])} move tables, {args.out.stat().st_size // 1024} KiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -26,6 +26,13 @@ class Board:
             img=self.img.clone()  
         )
     
+    def cursor_rect(self, pos: Tuple[int, int]) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Return the two corners, in pixel (x, y) coordinates, of the cursor rectangle for cell `pos`."""
+        x, y = pos
+        pixel_x = x * self.cell_W_pix
+        pixel_y = y * self.cell_H_pix
+        return (pixel_y, pixel_x), (pixel_y + self.cell_W_pix, pixel_x + self.cell_H_pix)
+
     def draw_cursor(self, pos: Tuple[int, int], color: Tuple[int, int, int], thickness: int = 3):
         """
         Draw a colored rectangle around a cell to show cursor position.
@@ -39,14 +46,12 @@ class Board:
         if not (0 <= x < self.W_cells and 0 <= y < self.H_cells):
             return  # Position is out of bounds
             
-        # Calculate pixel coordinates
-        pixel_x = x * self.cell_W_pix
-        pixel_y = y * self.cell_H_pix
         # Draw rectangle around the cell
+        pt1, pt2 = self.cursor_rect(pos)
         cv2.rectangle(
             self.img.img,
-            (pixel_y, pixel_x),
-            (pixel_y + self.cell_W_pix, pixel_x + self.cell_H_pix),
+            pt1,
+            pt2,
             color,
             thickness
-        )
\ No newline at end of file
+        )
@@ -0,0 +1,34 @@
+import csv
+import pathlib
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+
+@dataclass
+class BoardLayout:
+    """Starting position read from a board csv: its size and the pieces on it."""
+    rows: int
+    cols: int
+    pieces: List[Tuple[str, Tuple[int, int]]] = field(default_factory=list)   # (p_type, (row, col))
+
+
+def read_layout(path: pathlib.Path) -> BoardLayout:
+    """
+    Read a board csv: a header line (one entry per column) followed by one
+    line per board row, each cell holding a piece type such as "PW" or
+    nothing. Blank lines are ignored; short lines are padded with empty cells.
+    """
+    with open(path, newline="") as f:
+        lines = [line for line in csv.reader(f) if line]
+    if not lines:
+        raise ValueError(f"Empty board layout: {path}")
+    header, body = lines[0], lines[1:]
+    layout = BoardLayout(rows=len(body), cols=len(header))
+    for row, line in enumerate(body):
+        if len(line) > layout.cols:
+            raise ValueError(f"{path}: row {row} has {len(line)} cells, expected {layout.cols}")
+        for col, cell in enumerate(line):
+            p_type = cell.strip()
+            if p_type:
+                layout.pieces.append((p_type, (row, col)))
+    return layout
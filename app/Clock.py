@@ -0,0 +1,36 @@
+import time
+
+
+class MonotonicClock:
+    """Wall-clock game time: milliseconds since the clock was created."""
+    def __init__(self):
+        self._start = time.monotonic()
+
+    def now_ms(self) -> int:
+        """Return the current game time in milliseconds."""
+        return int((time.monotonic() - self._start) * 1000)
+
+    def set_ms(self, now_ms: int):
+        """Shift the clock so that it reads `now_ms` right now."""
+        self._start = time.monotonic() - now_ms / 1000
+
+
+class VirtualClock:
+    """Game time that only moves when told to, for headless and replayed games."""
+    def __init__(self, start_ms: int = 0):
+        self._now_ms = start_ms
+
+    def now_ms(self) -> int:
+        """Return the current game time in milliseconds."""
+        return self._now_ms
+
+    def set_ms(self, now_ms: int):
+        """Jump to `now_ms`."""
+        self._now_ms = now_ms
+
+    def advance(self, delta_ms: int) -> int:
+        """Move time forward by `delta_ms` and return the new time."""
+        if delta_ms < 0:
+            raise ValueError("A virtual clock cannot go backwards.")
+        self._now_ms += delta_ms
+        return self._now_ms
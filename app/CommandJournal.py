@@ -0,0 +1,307 @@
+import pathlib
+import queue
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from app.Clock import VirtualClock
+from app.Command import Command
+from app.Physics import notation_to_cell
+
+# ─── file format ────────────────────────────────────────────────────────────
+# header:  magic, start_ms (int64), tick_ms (float64)
+# records: one tag byte followed by a fixed struct (+ variable tail)
+#   'S' string:  code (uint16), length (uint8), utf-8 bytes – piece ids, command types, state names
+#   'C' command: applied (uint32), timestamp (int32), piece (uint16), type (uint16), n params (uint8),
+#                then n cells (uint16, row << 8 | col) – times are ms relative to start_ms
+#   'K' skip:    first (uint32), count (uint32) – ticks the live loop dropped to catch up
+#   'E' end:     end (uint32), n pieces (uint16), then n x (piece, cell, state) (uint16 each)
+MAGIC = b"CFJ1"
+_HEADER = struct.Struct("<4sqd")
+_TAG = struct.Struct("<c")
+_STRING = struct.Struct("<HB")
+_COMMAND = struct.Struct("<IiHHB")
+_SKIP = struct.Struct("<II")
+_END = struct.Struct("<IH")
+_PIECE_END = struct.Struct("<HHH")
+_CELL = struct.Struct("<H")
+_MAX_STRINGS = 0x10000
+_MAX_STRING_BYTES = 0xFF
+
+
+class JournalFormatError(Exception): ...
+
+
+def encode_cell(notation: str) -> int:
+    """Pack a cell in chess notation ('g1') into a uint16."""
+    a, b = notation_to_cell(notation)
+    if not (0 <= a < 256 and 0 <= b < 256) or decode_cell((a << 8) | b) != notation:
+        raise ValueError(f"Cannot encode command parameter {notation!r} as a cell.")
+    return (a << 8) | b
+
+
+def decode_cell(code: int) -> str:
+    """Inverse of `encode_cell`."""
+    return f"{chr((code >> 8) + ord('a'))}{(code & 0xFF) + 1}"
+
+
+@dataclass
+class JournalEntry:
+    applied_ms: int          # game time of the tick that applied the command
+    command: Command
+
+
+@dataclass
+class Journal:
+    start_ms: int
+    tick_ms: float
+    entries: List[JournalEntry] = field(default_factory=list)
+    skips: List[Tuple[int, int]] = field(default_factory=list)   # (first tick ms, count) not run live
+    end_ms: Optional[int] = None
+    final_board: Optional[Dict[str, Tuple[Tuple[int, int], str]]] = None   # piece_id -> (cell, state)
+
+
+class JournalWriter:
+    """
+    Append-only binary journal of the Commands a game applies.
+
+    `record()` only puts a tuple on a queue; a background thread encodes
+    the records and writes them through a large buffered file, so the game
+    loop never makes a syscall per command. The buffer is flushed every
+    `flush_interval_s` and on `close()`.
+
+    Values the format cannot hold are refused by `record()` with ValueError;
+    an error in the writer thread stops the journal and is re-raised by the
+    next `record()` or by `close()`.
+    """
+    def __init__(self, path: pathlib.Path, start_ms: int, tick_ms: float,
+                 buffer_size: int = 64 * 1024, flush_interval_s: float = 1.0):
+        self.path = pathlib.Path(path)
+        self.start_ms = start_ms
+        self.flush_interval_s = flush_interval_s
+        self._file = open(self.path, "wb", buffering=buffer_size)
+        self._file.write(_HEADER.pack(MAGIC, start_ms, tick_ms))
+        self._queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        self._codes: Dict[str, int] = {}
+        self._closed = False
+        self.records = 0
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="journal", daemon=True)
+        self._thread.start()
+
+    # ─── game thread ────────────────────────────────────────────────────────
+    def record(self, applied_ms: int, cmd: Command):
+        """
+        Journal `cmd`, applied at game time `applied_ms`. Raises ValueError for
+        non-cell params, ids longer than 255 utf-8 bytes and times the format
+        cannot hold, and re-raises an error that stopped the writer thread.
+        """
+        if self.error is not None:
+            raise self.error
+        cells = tuple(encode_cell(param) for param in cmd.params)
+        for text in (cmd.piece_id, cmd.type):
+            if len(text.encode("utf-8")) > _MAX_STRING_BYTES:
+                raise ValueError(f"Cannot journal {text[:16]!r}...: longer than {_MAX_STRING_BYTES} bytes.")
+        if not 0 <= applied_ms - self.start_ms <= 0xFFFFFFFF:
+            raise ValueError(f"Cannot journal a command applied at {applied_ms} ms (start {self.start_ms} ms).")
+        if not -0x80000000 <= cmd.timestamp - self.start_ms <= 0x7FFFFFFF:
+            raise ValueError(f"Cannot journal a command stamped {cmd.timestamp} ms (start {self.start_ms} ms).")
+        self._queue.put(("C", applied_ms, cmd.timestamp, cmd.piece_id, cmd.type, cells))
+
+    def skip(self, first_ms: int, count: int):
+        """Journal that the `count` ticks from game time `first_ms` were dropped (see FramePacer)."""
+        if self.error is not None:
+            raise self.error
+        if not 0 <= first_ms - self.start_ms <= 0xFFFFFFFF or not 0 < count <= 0xFFFFFFFF:
+            raise ValueError(f"Cannot journal {count} ticks skipped from {first_ms} ms (start {self.start_ms} ms).")
+        self._queue.put(("K", first_ms, count))
+
+    def close(self, end_ms: Optional[int] = None, pieces=()):
+        """
+        Write the end record (final cell and state of `pieces`), flush and stop
+        the writer thread; re-raises an error that stopped the writer thread.
+        """
+        if self._closed:
+            return
+        if end_ms is not None:
+            board = tuple((p.piece_id, tuple(p.current_state.physics.cell), p.current_state.name)
+                          for p in pieces)
+            self._queue.put(("E", end_ms, board))
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+        self._closed = True
+        if self.error is not None:
+            raise self.error
+
+    # ─── writer thread ──────────────────────────────────────────────────────
+    def _code(self, out: bytearray, text: str) -> int:
+        code = self._codes.get(text)
+        if code is None:
+            code = len(self._codes)
+            if code >= _MAX_STRINGS:
+                raise ValueError(f"Cannot journal more than {_MAX_STRINGS} distinct strings.")
+            raw = text.encode("utf-8")
+            self._codes[text] = code
+            out += _TAG.pack(b"S") + _STRING.pack(code, len(raw)) + raw
+        return code
+
+    def _encode(self, out: bytearray, item: tuple):
+        if item[0] == "C":
+            _, applied, timestamp, piece_id, cmd_type, params = item
+            piece, kind = self._code(out, piece_id), self._code(out, cmd_type)
+            out += _TAG.pack(b"C")
+            out += _COMMAND.pack(applied - self.start_ms, timestamp - self.start_ms, piece, kind, len(params))
+            for cell in params:
+                out += _CELL.pack(cell)
+            self.records += 1
+        elif item[0] == "K":
+            _, first_ms, count = item
+            out += _TAG.pack(b"K") + _SKIP.pack(first_ms - self.start_ms, count)
+        else:
+            _, end_ms, board = item
+            rows = [(self._code(out, pid), (cell[0] << 8) | cell[1], self._code(out, state or ""))
+                    for pid, cell, state in board]
+            out += _TAG.pack(b"E") + _END.pack(end_ms - self.start_ms, len(rows))
+            for row in rows:
+                out += _PIECE_END.pack(*row)
+
+    def _run(self):
+        try:
+            self._write_loop()
+        except BaseException as exc:  # keep the game running; surface it in record()/close()
+            self.error = exc
+
+    def _write_loop(self):
+        last_flush = time.monotonic()
+        done = False
+        while not done:
+            batch = []
+            try:
+                batch.append(self._queue.get(timeout=self.flush_interval_s))
+                while True:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            out = bytearray()
+            for item in batch:
+                if item is None:
+                    done = True
+                    break
+                self._encode(out, item)
+            if out:
+                self._file.write(out)
+            if time.monotonic() - last_flush >= self.flush_interval_s:
+                self._file.flush()
+                last_flush = time.monotonic()
+
+
+def read_journal(path: pathlib.Path) -> Journal:
+    """Decode a journal file written by JournalWriter."""
+    data = pathlib.Path(path).read_bytes()
+    if len(data) < _HEADER.size:
+        raise JournalFormatError("Journal is truncated.")
+    magic, start_ms, tick_ms = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise JournalFormatError(f"Not a command journal (magic {magic!r}).")
+    journal = Journal(start_ms, tick_ms)
+    strings: Dict[int, str] = {}
+    offset = _HEADER.size
+    try:
+        while offset < len(data):
+            tag = data[offset:offset + 1]
+            offset += 1
+            if tag == b"S":
+                code, length = _STRING.unpack_from(data, offset)
+                offset += _STRING.size
+                strings[code] = data[offset:offset + length].decode("utf-8")
+                offset += length
+            elif tag == b"C":
+                applied, timestamp, piece, kind, n = _COMMAND.unpack_from(data, offset)
+                offset += _COMMAND.size
+                params = [decode_cell(_CELL.unpack_from(data, offset + i * _CELL.size)[0]) for i in range(n)]
+                offset += n * _CELL.size
+                cmd = Command(timestamp + start_ms, strings[piece], strings[kind], params)
+                journal.entries.append(JournalEntry(applied + start_ms, cmd))
+            elif tag == b"K":
+                first, count = _SKIP.unpack_from(data, offset)
+                offset += _SKIP.size
+                journal.skips.append((first + start_ms, count))
+            elif tag == b"E":
+                end, n = _END.unpack_from(data, offset)
+                offset += _END.size
+                journal.end_ms = end + start_ms
+                journal.final_board = {}
+                for _ in range(n):
+                    piece, cell, state = _PIECE_END.unpack_from(data, offset)
+                    offset += _PIECE_END.size
+                    journal.final_board[strings[piece]] = ((cell >> 8, cell & 0xFF), strings[state])
+            else:
+                raise JournalFormatError(f"Unknown record tag {tag!r} at byte {offset - 1}.")
+    except (struct.error, KeyError) as exc:
+        raise JournalFormatError(f"Corrupt journal near byte {offset}: {exc}") from exc
+    return journal
+
+
+@dataclass
+class ReplayResult:
+    ticks: int
+    game_time_ms: int
+    wall_time_s: float
+    commands: int
+    mismatches: List[str]     # empty when the final board matches the journal's end record
+
+    @property
+    def matches(self) -> bool:
+        return not self.mismatches
+
+
+def replay(journal: Journal, game, realtime: bool = False) -> ReplayResult:
+    """
+    Feed the journal into `game` (created with a VirtualClock) tick by tick,
+    on the same fixed tick times as the recorded run (ticks the live loop
+    dropped to catch up are dropped here too), and compare the final
+    board with the journal's end record. With `realtime` the replay sleeps
+    to keep game time in step with the wall clock; otherwise it runs as
+    fast as possible.
+    """
+    if not isinstance(game.clock, VirtualClock):
+        raise ValueError("Replay needs a Game created with a VirtualClock.")
+    start_wall = time.perf_counter()
+    game.clock.set_ms(journal.start_ms)
+    game.reset_pieces(journal.start_ms)
+
+    entries = journal.entries
+    end_ms = journal.end_ms
+    if end_ms is None:
+        end_ms = entries[-1].applied_ms if entries else journal.start_ms
+    skips = dict(journal.skips)
+    next_tick = journal.start_ms + journal.tick_ms
+    i = ticks = 0
+    while int(next_tick) <= end_ms and not game._is_win():
+        if int(next_tick) in skips:
+            next_tick += skips.pop(int(next_tick)) * journal.tick_ms    # as FramePacer.ticks_due does
+            continue
+        now = int(next_tick)
+        next_tick += journal.tick_ms
+        if realtime:
+            delay = (now - journal.start_ms) / 1000.0 - (time.perf_counter() - start_wall)
+            if delay > 0:
+                time.sleep(delay)
+        game.clock.set_ms(now)
+        while i < len(entries) and entries[i].applied_ms <= now:
+            game.user_input_queue.put(entries[i].command)
+            i += 1
+        game.tick(now)
+        ticks += 1
+
+    mismatches = []
+    if journal.final_board is not None:
+        actual = {p.piece_id: (tuple(p.current_state.physics.cell), p.current_state.name or "")
+                  for p in game.pieces}
+        for pid in sorted(set(actual) | set(journal.final_board)):
+            if actual.get(pid) != journal.final_board.get(pid):
+                mismatches.append(f"{pid}: recorded {journal.final_board.get(pid)}, replayed {actual.get(pid)}")
+    return ReplayResult(ticks, game.clock.now_ms(), time.perf_counter() - start_wall, i, mismatches)
@@ -0,0 +1,125 @@
+import math
+import time
+from typing import Callable, List, Optional, Tuple
+
+
+class FramePacer:
+    """
+    Paces the main loop: a fixed simulation tick rate, a separate capped
+    render rate, and sleeping in between instead of spinning.
+
+    All times are game milliseconds. `ticks_due(now)` returns the fixed-step
+    simulation times that should run now (catching up when the loop fell
+    behind, but at most `max_catch_up` ticks at once), `render_due(now)`
+    says whether a frame should be drawn, and `wait(now)` sleeps until the
+    next tick or frame is due. Achieved rates are measured over a window.
+    `wait(now, deadline, idle=True)` does not wake for ticks that have no
+    work; they run (in order) on the next wake-up instead.
+    """
+    def __init__(self,
+                 tick_hz: float = 100.0,
+                 render_hz: float = 60.0,
+                 start_ms: int = 0,
+                 max_catch_up: int = 10,
+                 window_ms: int = 1000,
+                 sleep: Callable[[float], None] = time.sleep):
+        if tick_hz <= 0 or render_hz <= 0:
+            raise ValueError("tick_hz and render_hz must be positive.")
+        self.tick_ms = 1000.0 / tick_hz
+        self.render_ms = 1000.0 / render_hz
+        self.max_catch_up = max_catch_up
+        self.window_ms = window_ms
+        self._sleep = sleep
+        self._next_tick = float(start_ms) + self.tick_ms
+        self._next_render = float(start_ms)
+        self.ticks = 0
+        self.frames = 0
+        self.skipped_ticks = 0      # ticks dropped because the loop was too far behind
+        self.last_skipped: Optional[Tuple[int, int]] = None   # (first tick ms, count) dropped by the last ticks_due
+        self.skipped_frames = 0     # frames not drawn because rendering fell behind
+        self.achieved_tick_hz = 0.0
+        self.achieved_render_hz = 0.0
+        self._window_start = float(start_ms)
+        self._window_ticks = 0
+        self._window_frames = 0
+
+    def ticks_due(self, now_ms: int) -> List[int]:
+        """
+        Return the simulation times (ms) of every tick due at `now_ms`, oldest
+        first. Ticks dropped to catch up are reported in `last_skipped`.
+        """
+        due = []
+        self.last_skipped = None
+        while self._next_tick <= now_ms and len(due) < self.max_catch_up:
+            due.append(int(self._next_tick))
+            self._next_tick += self.tick_ms
+        if self._next_tick <= now_ms:
+            # Too far behind: drop the backlog rather than spiral.
+            behind = int((now_ms - self._next_tick) // self.tick_ms) + 1
+            self.skipped_ticks += behind
+            self.last_skipped = (int(self._next_tick), behind)
+            self._next_tick += behind * self.tick_ms
+        self.ticks += len(due)
+        self._window_ticks += len(due)
+        self._roll_window(now_ms)
+        return due
+
+    def render_due(self, now_ms: int) -> bool:
+        """Return True (and count the frame) if a frame should be drawn at `now_ms`."""
+        if now_ms < self._next_render:
+            return False
+        missed = int((now_ms - self._next_render) // self.render_ms)
+        self.skipped_frames += missed
+        self._next_render += (missed + 1) * self.render_ms
+        self.frames += 1
+        self._window_frames += 1
+        self._roll_window(now_ms)
+        return True
+
+    def next_due_ms(self, extra_deadline: Optional[int] = None, idle: bool = False) -> float:
+        """
+        Game time of the next tick, frame or `extra_deadline`, whichever is first.
+        With `idle` no tick before `extra_deadline` (None: no tick at all) has
+        work, so the first tick due is the one at or after it; the wait is
+        still cut short before more than `max_catch_up` ticks pile up.
+        """
+        if not idle:
+            due = min(self._next_tick, self._next_render)
+            if extra_deadline is not None:
+                due = min(due, extra_deadline)
+            return due
+        tick = self._next_tick
+        if extra_deadline is not None and extra_deadline > tick:
+            tick += math.ceil((extra_deadline - tick) / self.tick_ms) * self.tick_ms
+        latest = self._next_tick + (self.max_catch_up - 1) * self.tick_ms
+        if extra_deadline is None or tick > latest:
+            tick = latest
+        return min(tick, self._next_render)
+
+    def wait(self, now_ms: int, extra_deadline: Optional[int] = None, idle: bool = False):
+        """Sleep until the next tick or frame is due (or `extra_deadline`; see `next_due_ms`)."""
+        delay_ms = self.next_due_ms(extra_deadline, idle) - now_ms
+        if delay_ms > 0:
+            self._sleep(delay_ms / 1000.0)
+
+    def _roll_window(self, now_ms: int):
+        elapsed = now_ms - self._window_start
+        if elapsed >= self.window_ms:
+            self.achieved_tick_hz = self._window_ticks * 1000.0 / elapsed
+            self.achieved_render_hz = self._window_frames * 1000.0 / elapsed
+            self._window_start = now_ms
+            self._window_ticks = 0
+            self._window_frames = 0
+
+    def rates(self) -> dict:
+        """Return target and achieved rates plus counters."""
+        return {
+            "tick_hz": 1000.0 / self.tick_ms,
+            "render_hz": 1000.0 / self.render_ms,
+            "achieved_tick_hz": self.achieved_tick_hz,
+            "achieved_render_hz": self.achieved_render_hz,
+            "ticks": self.ticks,
+            "frames": self.frames,
+            "skipped_ticks": self.skipped_ticks,
+            "skipped_frames": self.skipped_frames,
+        }
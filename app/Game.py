@@ -1,43 +1,82 @@
 import inspect
 import pathlib
-import queue, threading, time, cv2, math
+import marshal
+import queue, struct, threading, time, math
 import numpy as np
 from typing import List, Dict, Tuple, Optional
 from app.Board   import Board
+from app.Clock import MonotonicClock
+from app.FramePacer import FramePacer
 from app.Command import Command
+from app.CommandJournal import JournalWriter
+from app.GameRecorder import GameRecorder
 from app.Piece   import Piece
 from app.Img import Img
 from app.InputHandler import InputHandler
-import keyboard
+from app.LayeredRenderer import LayeredRenderer, SpriteDraw, CursorDraw
+from app.OccupancyGrid import OccupancyGrid
+from app.PieceStore import PieceStore
+from app.Profiler import Profiler
+from app.RenderBackend import RenderBackend, CvWindowBackend
+from app.RenderPipeline import FrameSnapshot, SnapshotBuffer, RenderThread
+from app.TimerScheduler import TimerScheduler
 
 
 class InvalidBoard(Exception): ...
+
+SNAPSHOT_VERSION = 2
+_SNAPSHOT_HEADER = struct.Struct("<H")     # version, then the state marshalled
 # ────────────────────────────────────────────────────────────────────
 class Game:
-    def __init__(self, pieces: List[Piece], board: Board):
-        """Initialize the game with pieces and board."""
+    def __init__(self, pieces: List[Piece], board: Board, clock=None,
+                 use_piece_store: bool = False, use_scheduler: bool = False,
+                 profiler: Optional[Profiler] = None,
+                 backend: Optional[RenderBackend] = None):
+        """Initialize the game with pieces and board.
+        `clock` provides game time (`now_ms()`); defaults to the monotonic wall clock.
+        `use_piece_store` updates pieces in one vectorized step per tick (see PieceStore).
+        `use_scheduler` only wakes pieces whose state deadline expired (see TimerScheduler).
+        `profiler` times every loop phase and counts commands, captures and dropped frames.
+        `backend` receives the drawn frames (see RenderBackend); defaults to an OpenCV window."""
+        if use_piece_store and use_scheduler:
+            raise ValueError("use_piece_store and use_scheduler are alternative update modes.")
         self.pieces = pieces
         # Build a dictionary for quick lookup by unique piece_id
         self.pieces_by_id = {p.piece_id: p for p in pieces}
+        # Every piece the game started with, captured or not (for restore()).
+        self._all_pieces = dict(self.pieces_by_id)
         self.board = board
+        self.occupancy = OccupancyGrid(board.W_cells, board.H_cells)
+        for p in pieces:
+            self.occupancy.add(p)
+        self.piece_store = PieceStore(pieces) if use_piece_store else None
+        self.scheduler = TimerScheduler() if use_scheduler else None
         self.user_input_queue = queue.Queue()
-        self._start_time = time.monotonic()
+        self.clock = clock if clock is not None else MonotonicClock()
         self._current_frame = self.clone_board()
+        self.renderer = LayeredRenderer(board)
+        self.pacer: Optional[FramePacer] = None
+        self.render_thread: Optional[RenderThread] = None
+        self._snapshot_seq = 0
+        self.journal: Optional[JournalWriter] = None
+        self.recorder: Optional[GameRecorder] = None
+        self.journal_error: Optional[BaseException] = None     # why journaling stopped early
+        self.recording_error: Optional[BaseException] = None   # why the last recording failed
+        self._last_tick_ms = 0
+        self.profiler = profiler
+        self.backend = backend if backend is not None else CvWindowBackend()
         # Pass get_piece_at callback to InputHandler
         self.input_handler = InputHandler(board.W_cells, board.H_cells, self.get_piece_at)
 
 
     def get_piece_at(self, pos: Tuple[int, int]) -> Optional[Piece]:
         """Return the piece at the given board cell, or None if empty."""
-        for p in self.pieces:
-            if p.current_state.physics.cell == pos:
-                return p
-        return None
+        return self.occupancy.get(tuple(pos))
 
     # ─── helpers ─────────────────────────────────────────────────────────────
     def game_time_ms(self) -> int:
         """Return the current game time in milliseconds."""
-        return int((time.monotonic() - self._start_time) * 1000)
+        return self.clock.now_ms()
 
     def clone_board(self) -> Board:
         """
@@ -48,6 +87,7 @@ class Game:
 
     def start_user_input_thread(self):
         """Start the user input thread that uses the keyboard library for input."""
+        import keyboard     # imported on first use: headless games never need it
         def key_thread():
             while True:
                 event = keyboard.read_event() 
@@ -73,86 +113,374 @@ class Game:
         
 
     # ─── main public entrypoint ──────────────────────────────────────────────
-    def run(self):
-        """Main game loop."""
+    def run(self, tick_hz: float = 100.0, render_hz: float = 60.0, threaded_render: bool = False,
+            journal_path: Optional[pathlib.Path] = None, record_path: Optional[pathlib.Path] = None):
+        """
+        Main game loop. The rules advance at a fixed `tick_hz`; frames are
+        drawn at most `render_hz` times per second, and the loop sleeps until
+        the next tick or frame is due. See `self.pacer.rates()` for achieved rates.
+        With `threaded_render` the loop only publishes immutable snapshots and a
+        render thread composites and shows the newest one (stale ones are dropped).
+        With `journal_path` every applied Command is journaled (see CommandJournal).
+        With `record_path` the game is recorded to a video file (see GameRecorder).
+        """
         self.start_user_input_thread() # QWe2e5
 
         start_ms = self.game_time_ms()
-        for p in self.pieces:
-            p.reset(start_ms)
+        self.reset_pieces(start_ms)
+        self.pacer = FramePacer(tick_hz, render_hz, start_ms=start_ms)
+        if journal_path is not None:
+            self.start_journal(journal_path, start_ms, self.pacer.tick_ms)
+        if record_path is not None:
+            self.start_recording(record_path)
+        if threaded_render and self.backend.composites:
+            self.render_thread = RenderThread(LayeredRenderer(self.board), SnapshotBuffer(), self._present,
+                                              profiler=self.profiler)
+            self.render_thread.start()
 
         # ─────── main loop ──────────────────────────────────────────────────
-        while not self._is_win():
-            now = self.game_time_ms() # monotonic time ! not computer time.
+        try:
+            while not self._is_win():
+                now = self.game_time_ms() # monotonic time ! not computer time.
 
-            # (1) update physics & animations
-            for p in self.pieces:
-                p.update(now)
+                # (1) physics & animations, queued Commands, captures – fixed steps
+                self._advance(now)
 
-            # (2) handle queued Commands from mouse thread
-            while not self.user_input_queue.empty(): # QWe2e5
-                cmd: Command = self.user_input_queue.get()
-                self._process_input(cmd)
+                # (2) draw current position – capped rate
+                prof = self.profiler
+                if self.pacer.render_due(now):
+                    if self.render_thread is not None:
+                        t0 = prof.clock() if prof is not None else 0
+                        snapshot = self.frame_snapshot(now)
+                        self.render_thread.buffer.publish(snapshot)
+                        if self.recorder is not None:
+                            self.recorder.offer(snapshot)
+                        if prof is not None:
+                            prof.record("publish", t0)
+                        if self.render_thread.stop_requested.is_set():
+                            break
+                    else:
+                        t0 = prof.clock() if prof is not None else 0
+                        self._draw()
+                        if prof is not None:
+                            prof.record("draw", t0)
+                            t0 = prof.clock()
+                        shown = self._show()           # returns False if user closed window
+                        if prof is not None:
+                            prof.record("show", t0)
+                        if not shown:
+                            break
 
-            # (3) draw current position
-            self._draw()
-            if not self._show():           # returns False if user closed window
-                break
+                if prof is not None:
+                    self._count_dropped(prof)
+                    prof.tick_report(now)
 
-            # (4) detect captures
-            self._resolve_collisions()
+                # (3) sleep until the next tick or frame; with the scheduler and no
+                #     queued input, ticks before the next state change are idle and
+                #     run on the next wake-up rather than waking the loop each
+                self.pacer.wait(self.game_time_ms(), self.next_deadline_ms(),
+                                idle=self.scheduler is not None and self.user_input_queue.empty())
+        finally:
+            if self.render_thread is not None:
+                self.render_thread.stop()
+            self.stop_journal()
+            self.stop_recording()
+            self.backend.close()
 
+        if self.render_thread is not None and self.render_thread.error is not None:
+            raise self.render_thread.error
         self._announce_win()
-        cv2.destroyAllWindows()
+
+    def _count_dropped(self, prof: Profiler):
+        prof.set("frames_dropped", self.pacer.skipped_frames +
+                 (self.render_thread.buffer.dropped if self.render_thread is not None else 0))
+        prof.set("ticks_dropped", self.pacer.skipped_ticks)
+
+    def start_journal(self, path: pathlib.Path, start_ms: int, tick_ms: float):
+        """Journal every Command applied from now on; `tick_ms` is the fixed step the game ticks at."""
+        self.stop_journal()
+        self.journal = JournalWriter(path, start_ms, tick_ms)
+
+    def stop_journal(self):
+        """
+        Close the journal (if any) with the final position as its end record.
+        A journal error never stops the game: it is reported as a warning,
+        kept in `journal_error` and journaling is turned off.
+        """
+        if self.journal is not None:
+            journal, self.journal = self.journal, None
+            try:
+                journal.close(self._last_tick_ms, self.pieces)
+            except Exception as exc:
+                self._journal_failed(exc)
+
+    def _advance(self, now: int):
+        """Run the paced ticks due at `now`; a backlog the pacer drops is journaled so replay drops it too."""
+        for tick_ms in self.pacer.ticks_due(now):
+            self.tick(tick_ms)
+            if self._is_win():
+                break
+        if self.pacer.last_skipped is not None and self.journal is not None:
+            self._journaling(self.journal.skip, *self.pacer.last_skipped)
+
+    def _journaling(self, write, *args):
+        try:
+            write(*args)
+        except Exception as exc:
+            journal, self.journal = self.journal, None
+            self._journal_failed(exc)
+            try:
+                journal.close()
+            except Exception:
+                pass    # the same error again
+
+    def _journal_failed(self, exc: BaseException):
+        print(f"[WARN] Journaling stopped: {exc!r}")
+        self.journal_error = exc
+
+    def start_recording(self, path: pathlib.Path, **kwargs):
+        """Record every drawn frame to a video file from now on (kwargs: see GameRecorder)."""
+        self.stop_recording()
+        self.recorder = GameRecorder(path, self.board, **kwargs)
+
+    def stop_recording(self) -> Optional[dict]:
+        """
+        Finish the recording (if any) and return its stats; on an encoder
+        error warn, keep it in `recording_error` and return None.
+        """
+        if self.recorder is None:
+            return None
+        recorder, self.recorder = self.recorder, None
+        try:
+            return recorder.close()
+        except Exception as exc:
+            print(f"[WARN] Recording to {recorder.path} failed: {exc!r}")
+            self.recording_error = exc
+            return None
+
+    # ─── state snapshots ────────────────────────────────────────────────────
+    def snapshot(self) -> bytes:
+        """
+        Return a small, pixel-free blob of the game state: every piece's state,
+        timers and animation cursor (captured pieces included), both players'
+        cursor and selection, and the game clock. See `restore`.
+        The state is nested tuples of numbers, strings and None, stored with
+        `marshal` behind a version header.
+        """
+        alive = {id(p) for p in self.pieces}
+        pieces = [(True, p.snapshot()) for p in self.pieces]
+        pieces += [(False, p.snapshot()) for p in self._all_pieces.values() if id(p) not in alive]
+        state = (self.game_time_ms(), self._last_tick_ms, tuple(pieces), self.input_handler.snapshot())
+        return _SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION) + marshal.dumps(state)
+
+    def restore(self, blob: bytes):
+        """
+        Rewind (or fast-forward) this game to a `snapshot()` taken from this game
+        or from another one created from the same layout. Queued input is dropped.
+        Raises ValueError, leaving the game untouched, for a blob of another
+        version, one that does not decode or one from a different layout.
+        """
+        if len(blob) < _SNAPSHOT_HEADER.size:
+            raise ValueError("Truncated snapshot.")
+        (version,) = _SNAPSHOT_HEADER.unpack_from(blob)
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {version}.")
+        try:
+            now, last_tick_ms, pieces, inputs = marshal.loads(blob[_SNAPSHOT_HEADER.size:])
+        except (EOFError, TypeError, ValueError) as exc:
+            raise ValueError(f"Corrupt snapshot: {exc}") from exc
+        self._check_snapshot(pieces, inputs)   # before any state changes
+
+        self.pieces = []
+        for alive, data in pieces:
+            piece = self._all_pieces[data[0]]
+            piece.restore(data)
+            if alive:
+                self.pieces.append(piece)
+        self.pieces_by_id = {p.piece_id: p for p in self.pieces}
+        self.clock.set_ms(now)
+        self._last_tick_ms = last_tick_ms
+        self.input_handler.restore(inputs)
+        while not self.user_input_queue.empty():
+            self.user_input_queue.get_nowait()
+
+        # Rebuild the indexes from scratch.
+        self.occupancy = OccupancyGrid(self.board.W_cells, self.board.H_cells)
+        for p in self.pieces:
+            self.occupancy.add(p)
+        if self.piece_store is not None:
+            self.piece_store = PieceStore(self.pieces)
+        if self.scheduler is not None:
+            self.scheduler = TimerScheduler()
+            for p in self.pieces:
+                self._schedule(p, now)
+        self.renderer.invalidate()
+
+    def _check_snapshot(self, pieces, inputs):
+        """Raise ValueError unless `pieces` and `inputs` fit this game's pieces, board and players."""
+        try:
+            ids = [data[0] for _, data in pieces]
+            if sorted(ids) != sorted(self._all_pieces):
+                raise ValueError(f"pieces {sorted(ids)} are not this game's {sorted(self._all_pieces)}")
+            for _, (piece_id, _, state_data) in pieces:
+                name, _, cmd_data, (cell, attrs), (frame_idx, _) = state_data
+                state = self._all_pieces[piece_id].states.get(name)
+                if state is None:
+                    raise ValueError(f"{piece_id} has no state {name!r}")
+                row, col = cell
+                if not (0 <= row < self.board.H_cells and 0 <= col < self.board.W_cells):
+                    raise ValueError(f"{piece_id} is off the board at {cell}")
+                if any(attr not in state.physics.STATE_ATTRS for attr, _ in attrs):
+                    raise ValueError(f"{piece_id} has unknown physics attributes")
+                if cmd_data is not None and len(cmd_data) != 4:
+                    raise ValueError(f"{piece_id} has a malformed command")
+                if state.graphics.frames and not 0 <= frame_idx < len(state.graphics.frames):
+                    raise ValueError(f"{piece_id} has no frame {frame_idx}")
+            for user, pos, selected, mode, piece_id in inputs:
+                if user not in self.input_handler.player_states:
+                    raise ValueError(f"no player {user}")
+        except (TypeError, ValueError) as exc:
+            raise ValueError(f"Snapshot does not fit this game: {exc}") from exc
+
+    def reset_pieces(self, now: int):
+        """Put every piece in Idle at game time `now`."""
+        for p in self.pieces:
+            p.reset(now)
+            self._piece_changed(p)
+
+    def _piece_changed(self, piece: Piece):
+        """Bring the indexes up to date after `piece` changed state or cell."""
+        self.occupancy.sync(piece)
+        if self.piece_store is not None:
+            self.piece_store.refresh(piece)
+        if self.scheduler is not None:
+            self._schedule(piece, self.game_time_ms())
+
+    def _schedule(self, piece: Piece, now: int):
+        """(Re)register the next deadline of `piece` with the scheduler."""
+        deadline = piece.current_state.next_deadline(now)
+        if deadline is None:
+            self.scheduler.cancel(piece)
+        else:
+            self.scheduler.schedule(piece, max(deadline, now + 1))
+
+    def next_deadline_ms(self) -> Optional[int]:
+        """Game time of the next scheduled state change, or None (scheduler mode only)."""
+        return self.scheduler.next_deadline() if self.scheduler is not None else None
+
+    def tick(self, now: int):
+        """
+        Advance the rules by one step at game time `now`, without rendering:
+        update physics & animations, apply queued Commands, then detect captures.
+        """
+        self._last_tick_ms = now
+        prof = self.profiler
+        t0 = prof.clock() if prof is not None else 0
+        # (1) update physics & animations
+        if self.scheduler is not None:
+            for p in self.scheduler.pop_due(now):
+                p.update(now)
+                self.occupancy.sync(p)
+                self._schedule(p, now)
+        elif self.piece_store is not None:
+            for p in self.piece_store.update(now):
+                self.occupancy.sync(p)
+        else:
+            for p in self.pieces:
+                p.update(now)
+                self.occupancy.sync(p)
+
+        if prof is not None:
+            prof.record("update", t0)
+            t0 = prof.clock()
+
+        # (2) handle queued Commands from the input thread
+        while not self.user_input_queue.empty(): # QWe2e5
+            cmd: Command = self.user_input_queue.get()
+            self._process_input(cmd, now)
+        if prof is not None:
+            prof.record("input", t0)
+            t0 = prof.clock()
+
+        # (3) detect captures
+        self._resolve_collisions()
+        if prof is not None:
+            prof.record("collisions", t0)
+            prof.count("ticks")
 
     # ─── drawing helpers ────────────────────────────────────────────────────
     def _draw(self):
-        """Draw the current game state."""
-        board_copy = self.clone_board()  
-        now = self.game_time_ms()
-        
-        user1_pos = self.input_handler.get_cursor_position(1)
-        user2_pos = self.input_handler.get_cursor_position(2)
-        
+        """Draw the current game state (only the regions that changed since the last frame)."""
+        if not self.backend.composites and self.recorder is None:
+            return
+        snapshot = self.frame_snapshot(self.game_time_ms())
+        if self.recorder is not None:
+            self.recorder.offer(snapshot)
+        if self.backend.composites:
+            self._current_frame = self.renderer.render(snapshot.sprites, snapshot.cursors)
+
+    def frame_snapshot(self, now: int) -> FrameSnapshot:
+        """Capture what the board looks like at game time `now`, safe to hand to another thread."""
+        if self.scheduler is not None:
+            # Sleeping pieces were not updated by tick(); bring their visuals up to date.
+            for p in self.pieces:
+                p.current_state.advance_visuals(now)
+        self._snapshot_seq += 1
+        return FrameSnapshot(self._snapshot_seq, now, tuple(self._sprites()), tuple(self._cursors()))
+
+    def _sprites(self) -> List[SpriteDraw]:
+        """Return what every piece looks like right now."""
+        sprites = []
         for piece in self.pieces:
-            piece.draw_on_board(board_copy, now)
-       
-        board_copy.draw_cursor(user1_pos, (0, 0, 255), thickness=3)        
-        board_copy.draw_cursor(user2_pos, (0, 255, 0), thickness=3)
-        
-        self._current_frame = board_copy
+            img = piece.current_state.graphics.get_img()
+            if img is None:
+                continue
+            pos_x, pos_y = piece.current_state.physics.get_pos()
+            sprites.append(SpriteDraw(piece.piece_id, img, int(pos_x), int(pos_y), piece.is_static()))
+        return sprites
+
+    def _cursors(self) -> List[CursorDraw]:
+        """Return both players' cursors (user 1 red, user 2 green)."""
+        return [CursorDraw(self.input_handler.get_cursor_position(1), (0, 0, 255), 3),
+                CursorDraw(self.input_handler.get_cursor_position(2), (0, 255, 0), 3)]
 
     def _show(self) -> bool:
         """Show the current frame and handle window events."""
-        if self._current_frame is None:
+        if self._current_frame is None or not self.backend.composites:
             return True 
+        return self._present(self._current_frame)
 
-        cv2.imshow("Cong Fu Chess", self._current_frame.img.img)
-        key = cv2.waitKey(1)
-        if key == 27:  # ESC
-            return False  
-        return True
+    def _present(self, frame: Board) -> bool:
+        """Hand `frame` to the render backend; False if it asks to stop (e.g. ESC pressed)."""
+        return self.backend.present(frame)
 
 
-    def _process_input(self, cmd: Command):
+    def _process_input(self, cmd: Command, now_ms: Optional[int] = None):
         """
         Process an input command by finding the unique piece (based on piece_id)
-        and invoking its on_command() handler with the current game time.
+        and invoking its on_command() handler at game time `now_ms` (the tick time;
+        defaults to the current game time).
         """
-        now_ms = self.game_time_ms()
+        if now_ms is None:
+            now_ms = self.game_time_ms()
         piece = self.pieces_by_id.get(cmd.piece_id)
         if piece:
+            if self.journal is not None:
+                self._journaling(self.journal.record, now_ms, cmd)
+            if self.profiler is not None:
+                self.profiler.count("commands")
             piece.on_command(cmd, now_ms)
+            self._piece_changed(piece)
             
 
     # ─── capture resolution ────────────────────────────────────────────────          
     def _resolve_collisions(self):
-        """Resolve piece collisions and captures."""
+        """Resolve piece collisions and captures (only cells holding more than one piece)."""
         captured = set()
-        for i in range(len(self.pieces)):
-            for j in range(i + 1, len(self.pieces)):
-                p1, p2 = self.pieces[i], self.pieces[j]
-                if p1.current_state.physics.cell == p2.current_state.physics.cell:
+        for _, occupants in self.occupancy.shared_cells():
+            for i in range(len(occupants)):
+                for j in range(i + 1, len(occupants)):
+                    p1, p2 = occupants[i], occupants[j]
                     p1_can_capture = p1.current_state.physics.can_capture()
                     p1_can_be_captured = p1.current_state.physics.can_be_captured()
                     p2_can_capture = p2.current_state.physics.can_capture()
@@ -163,14 +491,22 @@ class Game:
                     elif p2_can_capture and p1_can_be_captured and not (p1_can_capture):
                         captured.add(p1)
                     elif p1_can_capture and p1_can_be_captured and p2_can_capture and p2_can_be_captured:
-                        if p1.current_state.last_update < p2.current_state.last_update:
+                        # Both are attacking: the one that started its command first wins.
+                        if p1.current_state.command_start_time < p2.current_state.command_start_time:
                             captured.add(p2)
                         else:
                             captured.add(p1)
         for p in captured:
             if p in self.pieces:
+                if self.profiler is not None:
+                    self.profiler.count("captures")
                 self.pieces.remove(p)
                 self.pieces_by_id.pop(p.piece_id, None)
+                self.occupancy.remove(p)
+                if self.piece_store is not None:
+                    self.piece_store.remove(p)
+                if self.scheduler is not None:
+                    self.scheduler.cancel(p)
 
     # ─── board validation & win detection ───────────────────────────────────
     def _is_win(self) -> bool:
@@ -180,13 +516,20 @@ class Game:
         # Game continues only if both kings are still present.
         return not (has_black_king and has_white_king)
 
-    def _announce_win(self):
-        """Announce the winner based on which king remains."""
+    def winner(self) -> Optional[str]:
+        """Return "Black" or "White" once only that side's king is left, else None."""
         has_black_king = any(p.piece_id.startswith("KB") for p in self.pieces)
         has_white_king = any(p.piece_id.startswith("KW") for p in self.pieces)
         if has_black_king and not has_white_king:
-            print("Game Over! Black wins!")
-        elif has_white_king and not has_black_king:
-            print("Game Over! White wins!")
+            return "Black"
+        if has_white_king and not has_black_king:
+            return "White"
+        return None
+
+    def _announce_win(self):
+        """Announce the winner based on which king remains."""
+        winner = self.winner()
+        if winner is not None:
+            print(f"Game Over! {winner} wins!")
         else:
-            print("Game Over! No clear winner.")
\ No newline at end of file
+            print("Game Over! No clear winner.")
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from app import NetProtocol as proto
+from app.SpectatorFeed import SpectatorView
+
+
+class GameClient:
+    """
+    Minimal asyncio client for GameServer, standing in for a remote player
+    (or spectator) in tests and load runs.
+
+    A background task reads server frames: ACKs are matched to requests in
+    order, TABLE/UPDATE frames keep `pieces` (piece_id -> (cell, state id,
+    pixel position)) up to date, FEED frames (spectators) update `view`
+    and WINNER sets `winner`.
+    """
+    def __init__(self):
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+        self.piece_ids: List[str] = []
+        self.pieces: Dict[str, Tuple[Tuple[int, int], int, Tuple[int, int]]] = {}
+        self.game_time_ms = 0
+        self.updates = 0
+        self.view = SpectatorView()
+        self.winner: Optional[str] = None
+        self._acks: "asyncio.Queue[int]" = asyncio.Queue()
+        self._changed = asyncio.Condition()
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def connect(self, host: str, port: int) -> "GameClient":
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self._reader_task = asyncio.create_task(self._read_loop())
+        return self
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            try:
+                await self._reader_task
+            except asyncio.CancelledError:
+                pass
+
+    # ─── requests ───────────────────────────────────────────────────────────
+    async def join(self, game_id: int, player: int, timeout: float = 5.0) -> int:
+        """
+        Join (or create) game `game_id` as player 1 (black), 2 (white) or 0
+        (spectator); returns OK once the game's position arrived, or the
+        status the server refused the JOIN with (BUSY: too many games).
+        """
+        self.writer.write(proto.join(game_id, player))
+        if player == proto.SPECTATOR:
+            joined = lambda: self.view.synced
+        else:
+            joined = lambda: self.updates > 0
+        await self.wait_for(lambda: joined() or not self._acks.empty(), timeout)
+        return proto.OK if joined() else self._acks.get_nowait()
+
+    async def move(self, src: Tuple[int, int], dst: Tuple[int, int]) -> int:
+        """Ask to move the piece on `src` to `dst`; returns the ACK status."""
+        return await self._request(proto.move(src, dst))
+
+    async def jump(self, cell: Tuple[int, int]) -> int:
+        return await self._request(proto.jump(cell))
+
+    async def key(self, name: str) -> int:
+        """Send a key press to the game's InputHandler."""
+        return await self._request(proto.key(name))
+
+    async def _request(self, data: bytes) -> int:
+        self.writer.write(data)
+        await self.writer.drain()
+        return await self._acks.get()
+
+    async def wait_for(self, predicate, timeout: float = 5.0):
+        """Wait until `predicate()` holds after some server frame (asyncio.TimeoutError otherwise)."""
+        async def wait():
+            async with self._changed:
+                await self._changed.wait_for(predicate)
+        await asyncio.wait_for(wait(), timeout)
+
+    # ─── replies ────────────────────────────────────────────────────────────
+    async def _read_loop(self):
+        try:
+            while True:
+                reply = proto.parse_reply(await proto.read_frame(self.reader))
+                kind = reply[0]
+                if kind == proto.ACK:
+                    self._acks.put_nowait(reply[1])
+                elif kind == proto.TABLE:
+                    self.piece_ids = reply[1]
+                elif kind == proto.UPDATE:
+                    self.game_time_ms = reply[1]
+                    self.pieces = {self.piece_ids[i]: (proto.decode_cell(cell), state, (x, y))
+                                   for i, cell, state, x, y in reply[2]}
+                    self.updates += 1
+                elif kind == proto.FEED:
+                    self.view.apply(reply[1])
+                elif kind == proto.WINNER:
+                    self.winner = reply[1]
+                async with self._changed:
+                    self._changed.notify_all()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
@@ -1,31 +1,55 @@
+import contextlib
 import pathlib
+from typing import Optional
 from app.Board import Board
+from app.BoardLayout import read_layout
 from app.Game import Game
 from app.Img import Img
 from app.PieceFactory import PieceFactory
-import pandas as pd
+from app.StartupTimer import StartupTimer
+
+CELL_PX = 100
 
 class GameFactory:
-    def create(self) -> Game:
-        board = self.load_board('my_board.png')
-        game_pieces = []
-    
-        board_pieces = pd.read_csv('board.csv')
-        piece_factory = PieceFactory(board, 'pieces')
-        for i in range(board_pieces.shape[0]):
-            for j in range(board_pieces.shape[1]):
-                # Use .iloc with two indices
-                p_type = board_pieces.iloc[i, j]
-                if pd.isna(p_type) or not isinstance(p_type, str):
-                    continue
-                
-                p = piece_factory.create_piece(p_type, (i, j))
-                game_pieces.append(p)
-        
-        game = Game(game_pieces, board)
-        return game    
-        
-    def load_board(self, board_path: pathlib.Path) -> Board:
-        board_img = Img().read(board_path, [800, 800])
-        board = Board(100, 100, 0.2, 0.2, 8, 8, board_img)
+    def __init__(self, load_workers: Optional[int] = None):
+        """`load_workers` bounds the threads that decode sprites (None: the executor default)."""
+        self.load_workers = load_workers
+        self.load_times = {}    # seconds per piece type spent by the last create()
+
+    def create(self,
+               board_csv: pathlib.Path = 'board.csv',
+               board_img: pathlib.Path = 'my_board.png',
+               pieces_root: pathlib.Path = 'pieces',
+               clock=None,
+               use_piece_store: bool = False,
+               use_scheduler: bool = False,
+               profiler=None,
+               timer: Optional[StartupTimer] = None,
+               asset_pack: Optional[pathlib.Path] = None,
+               backend=None) -> Game:
+        """Create a game from a board layout csv, a board image and a pieces directory.
+        Pass a `VirtualClock` as `clock` to run the game headless (see SimulationEngine).
+        The board takes its size from the csv; `timer` records how long each step took.
+        `asset_pack` is a pack built from `pieces_root` (see AssetPack) to load assets from.
+        `backend` is where frames go (see RenderBackend; default: an OpenCV window)."""
+        phase = timer.phase if timer is not None else lambda name: contextlib.nullcontext()
+        with phase("layout"):
+            layout = read_layout(board_csv)
+        with phase("board"):
+            board = self.load_board(board_img, layout.cols, layout.rows)
+        with phase("pieces"):
+            piece_factory = PieceFactory(board, pieces_root, asset_pack)
+            piece_factory.preload((p_type for p_type, _ in layout.pieces), self.load_workers)
+            self.load_times = piece_factory.load_times
+            game_pieces = [piece_factory.create_piece(p_type, cell) for p_type, cell in layout.pieces]
+
+        game = Game(game_pieces, board, clock=clock,
+                    use_piece_store=use_piece_store, use_scheduler=use_scheduler,
+                    profiler=profiler, backend=backend)
+        return game
+
+    def load_board(self, board_path: pathlib.Path, w_cells: int = 8, h_cells: int = 8) -> Board:
+        """Load the board image scaled to `w_cells` x `h_cells` cells of CELL_PX pixels."""
+        board_img = Img().read(board_path, [w_cells * CELL_PX, h_cells * CELL_PX])
+        board = Board(CELL_PX, CELL_PX, 0.2, 0.2, w_cells, h_cells, board_img)
         return board
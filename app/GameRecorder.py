@@ -0,0 +1,151 @@
+import pathlib
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple
+
+from app.Board import Board
+from app.LayeredRenderer import LayeredRenderer
+from app.RenderPipeline import FrameSnapshot
+
+DROP_OLDEST = "oldest"      # keep the newest frames when the encoder falls behind
+DROP_NEWEST = "newest"      # keep the frames already queued, refuse new ones
+
+
+def _cv_writer(path: pathlib.Path, fps: float, size: Tuple[int, int], fourcc: str):
+    import cv2
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*fourcc), fps, size)
+    if not writer.isOpened():
+        raise OSError(f"Cannot open a {fourcc} video writer for {path}")
+    return writer
+
+
+class GameRecorder:
+    """
+    Records a game to a video file without encoding on the game loop.
+
+    The loop `offer()`s the FrameSnapshot it already built for drawing (a
+    few tuples, no pixels). Offers are sampled down to `fps` frames per
+    second of game time and appended to a bounded queue; an encoder thread
+    renders each snapshot with its own LayeredRenderer and writes it. When
+    the queue is full the `drop` policy decides which frame is lost.
+
+    `stats()` reports queue depth, dropped frames and what `offer()` cost
+    the loop (mean and max microseconds).
+    """
+    def __init__(self,
+                 path: pathlib.Path,
+                 board: Board,
+                 fps: float = 30.0,
+                 max_queue: int = 64,
+                 drop: str = DROP_OLDEST,
+                 fourcc: str = "mp4v",
+                 writer_factory: Optional[Callable] = None):
+        if drop not in (DROP_OLDEST, DROP_NEWEST):
+            raise ValueError(f"Unknown drop policy {drop!r}")
+        self.path = pathlib.Path(path)
+        self.fps = fps
+        self.frame_ms = 1000.0 / fps
+        self.max_queue = max_queue
+        self.drop = drop
+        size = (board.img.img.shape[1], board.img.img.shape[0])
+        factory = writer_factory or (lambda p, f, s: _cv_writer(p, f, s, fourcc))
+        self._writer = factory(self.path, fps, size)
+        self._renderer = LayeredRenderer(board)
+        self._queue: Deque[FrameSnapshot] = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._next_ms: Optional[float] = None
+        self.offered = 0
+        self.queued = 0
+        self.encoded = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.offer_ns = 0
+        self.max_offer_ns = 0
+        self.error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._encode_loop, name="recorder", daemon=True)
+        self._thread.start()
+
+    def offer(self, snapshot: FrameSnapshot) -> bool:
+        """Queue `snapshot` if a frame is due at its game time; never blocks on the encoder."""
+        start = time.perf_counter_ns()
+        self.offered += 1
+        accepted = False
+        if self._next_ms is None or snapshot.time_ms >= self._next_ms:
+            # Stay on the fps grid, but do not try to catch up after a pause.
+            due = snapshot.time_ms if self._next_ms is None else self._next_ms
+            self._next_ms = max(due + self.frame_ms, snapshot.time_ms)
+            with self._cond:
+                if not self._closed:
+                    if len(self._queue) >= self.max_queue:
+                        self.dropped += 1
+                        if self.drop == DROP_OLDEST:
+                            self._queue.popleft()
+                    if len(self._queue) < self.max_queue:
+                        self._queue.append(snapshot)
+                        self.queued += 1
+                        accepted = True
+                        self.max_depth = max(self.max_depth, len(self._queue))
+                        self._cond.notify()
+        elapsed = time.perf_counter_ns() - start
+        self.offer_ns += elapsed
+        if elapsed > self.max_offer_ns:
+            self.max_offer_ns = elapsed
+        return accepted
+
+    def _encode_loop(self):
+        import cv2
+        try:
+            while True:
+                with self._cond:
+                    while not self._queue and not self._closed:
+                        self._cond.wait()
+                    if not self._queue:
+                        return
+                    snapshot = self._queue.popleft()
+                frame = self._renderer.render(snapshot.sprites, snapshot.cursors).img.img
+                if frame.ndim == 3 and frame.shape[2] == 4:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+                self._writer.write(frame)
+                self.encoded += 1
+        except BaseException as exc:  # keep the game running; surface it in stats()/close()
+            self.error = exc
+            with self._cond:
+                self._closed = True
+                self._queue.clear()
+
+    @property
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def stats(self) -> dict:
+        return {
+            "offered": self.offered,
+            "queued": self.queued,
+            "encoded": self.encoded,
+            "dropped": self.dropped,
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "mean_offer_us": self.offer_ns / self.offered / 1e3 if self.offered else 0.0,
+            "max_offer_us": self.max_offer_ns / 1e3,
+        }
+
+    def close(self, timeout: Optional[float] = None) -> dict:
+        """
+        Encode what is queued, finish the file and return `stats()`; re-raises
+        encoder errors. If the encoder is still busy after `timeout` seconds,
+        raises TimeoutError and leaves the file open; call close() again later.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError(f"Recorder still encoding {self.depth} queued frames after {timeout}s.")
+        if self._writer is not None:
+            self._writer.release()
+            self._writer = None
+        if self.error is not None:
+            raise self.error
+        return self.stats()
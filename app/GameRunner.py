@@ -0,0 +1,232 @@
+import multiprocessing as mp
+import os
+import queue
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from app.Clock import VirtualClock
+from app.Command import Command
+from app.GameFactory import GameFactory
+from app.SimulationEngine import SimulationEngine
+from app.SpriteAtlas import AtlasHandle, SpriteAtlas
+
+
+@dataclass
+class GameSpec:
+    """One headless game to run: layout, scripted Commands and limits."""
+    game_id: int
+    board_csv: str = 'board.csv'
+    board_img: str = 'my_board.png'
+    pieces_root: str = 'pieces'
+    commands: List[Command] = field(default_factory=list)
+    max_ms: Optional[int] = None          # None: run until the game ends or settles
+    tick_ms: int = 10
+    use_scheduler: bool = False
+    on_start: Optional[Callable] = None   # top-level function called with the Game before it runs
+
+
+@dataclass
+class GameOutcome:
+    game_id: int
+    winner: Optional[str] = None
+    finished: bool = False
+    ticks: int = 0
+    game_time_ms: int = 0
+    setup_s: float = 0.0                 # building the Game (assets come from the worker's cache)
+    run_s: float = 0.0                   # wall time spent ticking this game
+    worker_pid: int = 0
+    attempts: int = 1
+    error: Optional[str] = None
+
+
+class _HostedRun:
+    """A game in progress inside a worker."""
+    def __init__(self, spec: GameSpec, attempt: int):
+        start = time.perf_counter()
+        game = GameFactory().create(spec.board_csv, spec.board_img, spec.pieces_root,
+                                    clock=VirtualClock(), use_scheduler=spec.use_scheduler)
+        if spec.on_start is not None:
+            spec.on_start(game)
+        self.spec = spec
+        self.engine = SimulationEngine(game, spec.tick_ms)
+        self.engine.submit_all(spec.commands)
+        self.engine.start()
+        self.attempt = attempt
+        self.outcome = GameOutcome(spec.game_id, setup_s=time.perf_counter() - start, worker_pid=os.getpid(),
+                                   attempts=attempt)
+
+    def step(self) -> bool:
+        """Advance one tick; returns False once the game is done."""
+        start = time.perf_counter()
+        engine = self.engine
+        if self.spec.max_ms is None:
+            done = engine.is_settled() or not engine.step()
+        else:
+            done = engine.clock.now_ms() >= self.spec.max_ms or not engine.step()
+        self.outcome.run_s += time.perf_counter() - start
+        return not done
+
+    def finish(self) -> GameOutcome:
+        game = self.engine.game
+        self.outcome.winner = game.winner()
+        self.outcome.finished = game._is_win()
+        self.outcome.ticks = self.engine.ticks
+        self.outcome.game_time_ms = game.game_time_ms()
+        return self.outcome
+
+
+def _worker_main(tasks, results, capacity: int, atlas_handle: Optional[AtlasHandle] = None, worker: int = 0):
+    """
+    Worker process: host up to `capacity` games at once, stepping them
+    round-robin. Takes (spec, attempt) tasks and puts (worker, attempt,
+    outcome) results, so the runner can tell a retry's result from a stale one.
+    """
+    atlas = SpriteAtlas.attach(atlas_handle) if atlas_handle is not None else None
+    atlas_roots = set()     # pieces roots whose sprites are served from the atlas
+    active: List[_HostedRun] = []
+    closing = False
+    while active or not closing:
+        # Top up from the task queue (block only when idle).
+        while not closing and len(active) < capacity:
+            try:
+                task = tasks.get(block=not active)
+            except queue.Empty:
+                break
+            if task is None:
+                closing = True
+                break
+            spec, attempt = task
+            # Other trees are read from disk as usual: the atlas holds one tree's sprites.
+            if atlas is not None and spec.pieces_root not in atlas_roots and atlas.serves(spec.pieces_root):
+                atlas.install(spec.pieces_root)
+                atlas_roots.add(spec.pieces_root)
+            try:
+                active.append(_HostedRun(spec, attempt))
+            except Exception:
+                results.put((worker, attempt, GameOutcome(spec.game_id, worker_pid=os.getpid(), attempts=attempt,
+                                                          error=traceback.format_exc())))
+        still = []
+        for run in active:
+            try:
+                if run.step():
+                    still.append(run)
+                else:
+                    results.put((worker, run.attempt, run.finish()))
+            except Exception:
+                outcome = run.outcome
+                outcome.error = traceback.format_exc()
+                results.put((worker, run.attempt, outcome))
+        active = still
+
+
+class GameRunner:
+    """
+    Runs many headless games across a pool of worker processes.
+
+    Each worker hosts up to `games_per_worker` games concurrently (one tick
+    each in turn) and builds them through the process-wide asset cache, so
+    sprites, configs and move tables are loaded once per worker rather than
+    once per game. The runner hands games to workers as slots free up,
+    collects a GameOutcome per game (result and timing), and restarts any
+    worker that dies, re-running its games up to `max_attempts` times.
+
+    With a SpriteAtlas, the sprites are published once in shared memory and
+    every worker maps them instead of decoding its own copy (games on
+    another pieces tree load their own sprites); the caller closes the
+    atlas when done with the runner.
+    """
+    def __init__(self,
+                 workers: Optional[int] = None,
+                 games_per_worker: int = 8,
+                 max_attempts: int = 2,
+                 mp_context: Optional[str] = None,
+                 atlas: Optional[SpriteAtlas] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.games_per_worker = games_per_worker
+        self.max_attempts = max_attempts
+        self._ctx = mp.get_context(mp_context)
+        self.atlas = atlas
+        self._atlas_handle: Optional[AtlasHandle] = None
+        self.restarts = 0
+        self.wall_time_s = 0.0
+
+    def run(self, specs: List[GameSpec], timeout_s: Optional[float] = None) -> List[GameOutcome]:
+        """Run every spec and return the outcomes in spec order."""
+        start = time.perf_counter()
+        pending = deque(specs)
+        attempts: Dict[int, int] = {}
+        outcomes: Dict[int, GameOutcome] = {}
+        if self.atlas is not None and self._atlas_handle is None:
+            self._atlas_handle = self.atlas.publish()
+        results = self._ctx.Queue()
+        pool = [self._spawn(results, i) for i in range(min(self.workers, max(len(specs), 1)))]
+        in_flight: List[Dict[int, GameSpec]] = [{} for _ in pool]
+        try:
+            while len(outcomes) < len(specs):
+                for i, worker in enumerate(pool):
+                    while pending and len(in_flight[i]) < self.games_per_worker:
+                        spec = pending.popleft()
+                        attempts[spec.game_id] = attempts.get(spec.game_id, 0) + 1
+                        in_flight[i][spec.game_id] = spec
+                        worker[1].put((spec, attempts[spec.game_id]))
+                try:
+                    index, attempt, outcome = results.get(timeout=0.05)
+                except queue.Empty:
+                    outcome = None
+                # Only the current attempt counts: a worker that died after putting a
+                # result must not finish (or pop) the retry running elsewhere.
+                if outcome is not None and outcome.game_id in in_flight[index] \
+                        and attempts[outcome.game_id] == attempt:
+                    del in_flight[index][outcome.game_id]
+                    outcomes[outcome.game_id] = outcome
+                for i, (process, _) in enumerate(pool):
+                    if process.is_alive():
+                        continue
+                    # Crashed worker: restart it and retry (or give up on) its games.
+                    self.restarts += 1
+                    for spec in in_flight[i].values():
+                        if attempts[spec.game_id] < self.max_attempts:
+                            pending.appendleft(spec)
+                        else:
+                            outcomes[spec.game_id] = GameOutcome(
+                                spec.game_id, attempts=attempts[spec.game_id],
+                                error=f"worker exited with code {process.exitcode}")
+                    in_flight[i] = {}
+                    pool[i] = self._spawn(results, i)
+                if timeout_s is not None and time.perf_counter() - start > timeout_s:
+                    raise TimeoutError(f"{len(specs) - len(outcomes)} games still running after {timeout_s}s.")
+        finally:
+            for process, tasks in pool:
+                if process.is_alive():
+                    tasks.put(None)
+            for process, _ in pool:
+                process.join(timeout=5)
+                if process.is_alive():
+                    process.terminate()
+            self.wall_time_s = time.perf_counter() - start
+        return [outcomes[spec.game_id] for spec in specs]
+
+    def _spawn(self, results, index: int):
+        tasks = self._ctx.Queue()
+        process = self._ctx.Process(target=_worker_main,
+                                    args=(tasks, results, self.games_per_worker, self._atlas_handle, index),
+                                    daemon=True)
+        process.start()
+        return process, tasks
+
+    @staticmethod
+    def summary(outcomes: List[GameOutcome], wall_time_s: float) -> dict:
+        """Aggregate throughput and timing over a run."""
+        ok = [o for o in outcomes if o.error is None]
+        return {
+            "games": len(outcomes),
+            "failed": len(outcomes) - len(ok),
+            "games_per_s": len(ok) / wall_time_s if wall_time_s else 0.0,
+            "ticks": sum(o.ticks for o in ok),
+            "mean_setup_ms": 1000 * sum(o.setup_s for o in ok) / len(ok) if ok else 0.0,
+            "mean_run_ms": 1000 * sum(o.run_s for o in ok) / len(ok) if ok else 0.0,
+            "workers": len({o.worker_pid for o in ok}),
+        }
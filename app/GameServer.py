@@ -0,0 +1,322 @@
+import asyncio
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Set, Tuple
+
+from app import NetProtocol as proto
+from app.Command import Command
+from app.Game import Game
+from app.Physics import notation_to_cell
+from app.PieceStore import STATE_IDS
+from app.SpectatorFeed import SpectatorFeed
+
+
+@dataclass(eq=False)
+class ClientSession:
+    writer: asyncio.StreamWriter
+    game: Optional["HostedGame"] = None
+    player: int = proto.SPECTATOR
+    dropped_updates: int = 0
+    resync: bool = False          # spectator missed a feed message; send a keyframe next
+
+
+@dataclass(eq=False)
+class HostedGame:
+    game_id: int
+    game: Game
+    piece_index: Dict[str, int]
+    feed: SpectatorFeed
+    clients: Set[ClientSession] = field(default_factory=set)
+    last_rows: bytes = b""
+    over: bool = False
+
+
+class GameServer:
+    """
+    Hosts many games on one asyncio event loop and accepts Commands from
+    remote clients over TCP (see NetProtocol for the framing).
+
+    Requests are validated on arrival with the game's own rules: the
+    InputHandler decides who may command a piece and State.is_move_legal
+    whether a move is legal; accepted Commands are stamped with the
+    server's game time and queued for the next tick. Every `update_ms` each
+    game's position is encoded once and written to all of its players;
+    spectators get the delta-encoded SpectatorFeed instead.
+    A client whose send buffer is over `max_buffer` bytes skips updates
+    (the next one supersedes them) and is not read from until it drains;
+    a game with more than `max_pending` queued Commands answers BUSY.
+    At most `max_games` games are hosted at once (a JOIN that would create
+    another is answered BUSY); a game is dropped when it ends or when its
+    last client leaves. A game whose tick or update raises is logged, ended
+    (its clients get an empty WINNER) and dropped; the others keep running.
+    """
+    def __init__(self,
+                 game_factory: Callable[[], Game],
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 tick_ms: int = 10,
+                 update_ms: int = 50,
+                 max_buffer: int = 64 * 1024,
+                 max_pending: int = 256,
+                 keyframe_every: int = 100,
+                 max_games: int = 1024):
+        self.game_factory = game_factory
+        self.host = host
+        self.port = port
+        self.tick_ms = tick_ms
+        self.update_ms = update_ms
+        self.max_buffer = max_buffer
+        self.max_pending = max_pending
+        self.keyframe_every = keyframe_every
+        self.max_games = max_games
+        self.games: Dict[int, HostedGame] = {}
+        self.sessions: Set[ClientSession] = set()
+        self.commands_accepted = 0
+        self.commands_rejected = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._ticker: Optional[asyncio.Task] = None
+
+    # ─── lifecycle ──────────────────────────────────────────────────────────
+    async def start(self) -> int:
+        """Start listening and ticking; returns the bound port."""
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ticker = asyncio.create_task(self._run_games())
+        return self.port
+
+    async def close(self):
+        """Stop ticking, disconnect every client and stop listening."""
+        if self._ticker is not None:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+        for session in list(self.sessions):
+            session.writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> "GameServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _host(self, game_id: int) -> Optional[HostedGame]:
+        """The game `game_id`, created if needed; None if the server is full."""
+        hosted = self.games.get(game_id)
+        if hosted is None:
+            if len(self.games) >= self.max_games:
+                return None
+            game = self.game_factory()
+            game.reset_pieces(game.game_time_ms())
+            piece_ids = sorted(game.pieces_by_id)
+            index = {pid: i for i, pid in enumerate(piece_ids)}
+            feed = SpectatorFeed(piece_ids, self.keyframe_every)
+            feed.next(game)
+            hosted = self.games[game_id] = HostedGame(game_id, game, index, feed)
+        return hosted
+
+    def _evict(self, hosted: HostedGame):
+        if self.games.get(hosted.game_id) is hosted:
+            del self.games[hosted.game_id]
+
+    # ─── clients ────────────────────────────────────────────────────────────
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        session = ClientSession(writer)
+        self.sessions.add(session)
+        try:
+            while True:
+                payload = await proto.read_frame(reader)
+                try:
+                    request = proto.parse_request(payload)
+                except proto.ProtocolError:
+                    writer.write(proto.ack(proto.BAD_FRAME))
+                    continue
+                if request[0] == proto.JOIN:
+                    if request[2] not in (proto.SPECTATOR, 1, 2):
+                        writer.write(proto.ack(proto.BAD_FRAME))
+                    else:
+                        self._join(session, request[1], request[2])
+                else:
+                    status = self._submit(session, request)
+                    if status == proto.OK:
+                        self.commands_accepted += 1
+                    else:
+                        self.commands_rejected += 1
+                    writer.write(proto.ack(status))
+                if writer.transport.get_write_buffer_size() > self.max_buffer:
+                    await writer.drain()     # stop reading from a client that does not read
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.sessions.discard(session)
+            self._leave(session)
+            writer.close()
+
+    def _leave(self, session: ClientSession):
+        hosted, session.game = session.game, None
+        if hosted is not None:
+            hosted.clients.discard(session)
+            if not hosted.clients:
+                self._evict(hosted)
+
+    def _join(self, session: ClientSession, game_id: int, player: int):
+        if session.game is not None and session.game is not self.games.get(game_id):
+            self._leave(session)
+        hosted = self._host(game_id)
+        if hosted is None:
+            session.writer.write(proto.ack(proto.BUSY))
+            return
+        session.game, session.player = hosted, player
+        hosted.clients.add(session)
+        if player == proto.SPECTATOR:
+            session.writer.write(proto.feed(hosted.feed.keyframe()))
+        else:
+            session.writer.write(proto.table(hosted.feed.piece_ids))
+            rows, n = self._encode_rows(hosted)
+            session.writer.write(proto.update(hosted.game.game_time_ms(), rows, n))
+        winner = hosted.game.winner()
+        if winner is not None:
+            session.writer.write(proto.winner(winner))
+
+    def _submit(self, session: ClientSession, request: tuple) -> int:
+        """Validate a MOVE/JUMP/KEY request and queue the resulting Command; return an ACK status."""
+        hosted = session.game
+        if hosted is None:
+            return proto.NOT_JOINED
+        if hosted.over:
+            return proto.GAME_OVER
+        if session.player == proto.SPECTATOR:
+            return proto.NOT_YOURS
+        game = hosted.game
+        if game.user_input_queue.qsize() >= self.max_pending:
+            return proto.BUSY
+        now = game.game_time_ms()
+        handler = game.input_handler
+        kind = request[0]
+
+        if kind == proto.KEY:
+            if request[1] not in handler.movement_keys[session.player] and \
+                    request[1] not in (handler.select_keys[session.player], handler.jump_keys[session.player]):
+                return proto.ILLEGAL
+            cmd = handler.handle_key(session.player, request[1], timestamp=now)
+            if cmd is None:
+                return proto.OK
+            dst = notation_to_cell(cmd.params[1]) if cmd.type == "Move" else None
+            return self._queue(game, session.player, game.pieces_by_id.get(cmd.piece_id), cmd, dst)
+
+        if kind == proto.MOVE:
+            src, dst = request[1], request[2]
+            piece = game.get_piece_at(src)
+            cmd = None if piece is None else Command(
+                now, piece.piece_id, "Move", [handler.coord_to_notation(src), handler.coord_to_notation(dst)])
+            return self._queue(game, session.player, piece, cmd, dst)
+
+        cell = request[1]
+        piece = game.get_piece_at(cell)
+        cmd = None if piece is None else Command(now, piece.piece_id, "Jump", [handler.coord_to_notation(cell)])
+        return self._queue(game, session.player, piece, cmd, None)
+
+    def _queue(self, game: Game, player: int, piece, cmd: Optional[Command], dst: Optional[Tuple[int, int]]) -> int:
+        if piece is None or cmd is None:
+            return proto.NO_PIECE
+        if not game.input_handler.can_control(player, piece):
+            return proto.NOT_YOURS
+        state = piece.current_state
+        if cmd.type not in state.transitions:
+            return proto.ILLEGAL      # resting or already moving
+        if dst is not None and not state.is_move_legal(dst):
+            return proto.ILLEGAL
+        game.user_input_queue.put(cmd)
+        return proto.OK
+
+    # ─── game loop ──────────────────────────────────────────────────────────
+    async def _run_games(self):
+        loop = asyncio.get_running_loop()
+        tick_s = self.tick_ms / 1000
+        update_s = self.update_ms / 1000
+        next_tick = next_update = loop.time()
+        while True:
+            for hosted in list(self.games.values()):
+                if hosted.over:
+                    continue
+                game = hosted.game
+                try:
+                    game.tick(game.game_time_ms())
+                    if game._is_win():
+                        self._broadcast(hosted)
+                        self._end(hosted, game.winner())
+                except Exception:
+                    self._abort(hosted)
+            if loop.time() >= next_update:
+                for hosted in list(self.games.values()):
+                    if not hosted.over:
+                        try:
+                            self._broadcast(hosted)
+                        except Exception:
+                            self._abort(hosted)
+                next_update += update_s
+            next_tick += tick_s
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def _end(self, hosted: HostedGame, winner: str):
+        hosted.over = True
+        data = proto.winner(winner)
+        for session in hosted.clients:
+            session.writer.write(data)
+        self._evict(hosted)
+
+    def _abort(self, hosted: HostedGame):
+        """End a game that raised, so one broken game cannot stop the loop hosting the others."""
+        print(f"[WARN] Game {hosted.game_id} aborted:\n{traceback.format_exc()}")
+        self._end(hosted, "")
+
+    def _encode_rows(self, hosted: HostedGame) -> Tuple[bytes, int]:
+        index = hosted.piece_index
+        pack = proto.UPDATE_ROW.pack
+        rows = []
+        for p in hosted.game.pieces:
+            state = p.current_state
+            x, y = state.physics.get_pos()
+            rows.append(pack(index[p.piece_id], proto.encode_cell(state.physics.cell),
+                             STATE_IDS.get(state.name, 0xFF), int(x), int(y)))
+        return b"".join(rows), len(rows)
+
+    def _broadcast(self, hosted: HostedGame):
+        """Send the game's position to all its clients, once encoded, skipping unchanged positions."""
+        players = [c for c in hosted.clients if c.player != proto.SPECTATOR]
+        spectators = [c for c in hosted.clients if c.player == proto.SPECTATOR]
+        rows, n = self._encode_rows(hosted)
+        if rows != hosted.last_rows:
+            hosted.last_rows = rows
+            self._send(players, proto.update(hosted.game.game_time_ms(), rows, n))
+
+        message = hosted.feed.next(hosted.game)
+        if message is None:
+            return
+        data, keyframe = proto.feed(message), None
+        for session in spectators:
+            if session.resync and not self._congested(session):
+                keyframe = keyframe or proto.feed(hosted.feed.keyframe())
+                session.writer.write(keyframe)
+                session.resync = False
+            elif self._send((session,), data) == 0:
+                session.resync = True
+
+    def _congested(self, session: ClientSession) -> bool:
+        return session.writer.transport.get_write_buffer_size() > self.max_buffer
+
+    def _send(self, sessions, data: bytes) -> int:
+        """Write `data` to every session that keeps up; returns how many got it."""
+        sent = 0
+        for session in sessions:
+            if self._congested(session):
+                session.dropped_updates += 1
+                continue
+            session.writer.write(data)
+            sent += 1
+        return sent
@@ -1,43 +1,37 @@
+import copy
 import pathlib
 from typing import Optional
 
 from app.Img import Img
 from app.Command import Command
+from app.AssetCache import asset_cache
 
 class Graphics:
     def __init__(self,
                  sprites_folder: pathlib.Path,
                  cell_size: tuple[int, int],
                  loop: bool = True,
-                 fps: float = 6.0):
+                 fps: float = 6.0,
+                 interpolation: Optional[int] = None):
         """Initialize graphics with sprites folder, cell size, loop flag, and FPS."""
         self.sprites_folder = sprites_folder
         self.cell_size = cell_size
         self.loop = loop
         self.fps = fps
+        self.interpolation = interpolation
         self.frames = self._load_frames()
         self.current_frame_idx = 0
         self.last_update_ms = 0
         self.img: Optional[Img] = self.frames[0] if self.frames else None
 
     def _load_frames(self):
-        """Load sprite frames from the folder, sorted alphabetically."""
-        frames = []
-        if not self.sprites_folder.exists():
-            return frames
-        for file in sorted(self.sprites_folder.glob("*.png")):
-            img = Img().read(file, (self.cell_size[0], self.cell_size[1]))
-            frames.append(img)
-        return frames
+        """Load sprite frames from the folder, sorted alphabetically (shared via the asset cache)."""
+        return list(asset_cache.get_frames(self.sprites_folder, self.cell_size,
+                                           self.interpolation, Img))
 
     def copy(self):
         """Create a shallow copy of the Graphics object."""
-        new_gfx = Graphics(self.sprites_folder, self.cell_size, self.loop, self.fps)
-        new_gfx.frames = self.frames
-        new_gfx.current_frame_idx = self.current_frame_idx
-        new_gfx.last_update_ms = self.last_update_ms
-        new_gfx.img = self.img
-        return new_gfx
+        return copy.copy(self)
 
     def reset(self, cmd: Command):
         """Reset the animation (e.g. on state change)."""
@@ -46,32 +40,69 @@ class Graphics:
         if self.frames:
             self.img = self.frames[0]
 
+    def frame_time_ms(self) -> int:
+        """Milliseconds each frame stays on screen."""
+        return max(int(1000 / self.fps), 1)
+
     def update(self, now_ms: int):
-        """Advance the animation frame based on game time."""
+        """Advance the animation frame based on game time (catching up on skipped frames)."""
         if not self.frames or self.fps <= 0:
             return
         if self.last_update_ms == 0:
             self.last_update_ms = now_ms
             return
         elapsed = now_ms - self.last_update_ms
-        frame_time = int(1000 / self.fps)
+        frame_time = self.frame_time_ms()
         if elapsed >= frame_time:
-            self.current_frame_idx += 1
+            steps = elapsed // frame_time
+            self.current_frame_idx += steps
             if self.current_frame_idx >= len(self.frames):
-                self.current_frame_idx = 0 if self.loop else len(self.frames) - 1
+                if self.loop:
+                    self.current_frame_idx %= len(self.frames)
+                else:
+                    self.current_frame_idx = len(self.frames) - 1
+            self.img = self.frames[self.current_frame_idx]
+            self.last_update_ms += steps * frame_time
+
+    def last_frame_deadline(self) -> Optional[int]:
+        """
+        Game time at which a non-looping animation reaches its last frame,
+        or None if it loops, has already finished or has not started yet.
+        """
+        if self.loop or not self.frames or self.fps <= 0 or self.last_update_ms == 0:
+            return None
+        remaining = len(self.frames) - 1 - self.current_frame_idx
+        if remaining <= 0:
+            return None
+        return self.last_update_ms + remaining * self.frame_time_ms()
+
+    def is_animating(self) -> bool:
+        """Return True while the displayed frame can still change without a reset."""
+        if not self.frames or self.fps <= 0 or len(self.frames) < 2:
+            return False
+        return self.loop or self.current_frame_idx < len(self.frames) - 1
+
+    def snapshot(self) -> tuple:
+        """Return the animation cursor (see `restore`)."""
+        return (self.current_frame_idx, self.last_update_ms)
+
+    def restore(self, data: tuple):
+        """Load a `snapshot()`."""
+        self.current_frame_idx, self.last_update_ms = data
+        if self.frames:
             self.img = self.frames[self.current_frame_idx]
-            self.last_update_ms = now_ms
 
     def get_img(self) -> Img:
         """Return the current frame image."""
         return self.img
 
     def clone(self):
-        """Create a deep copy of the Graphics object."""
-        new_gfx = Graphics(self.sprites_folder, self.cell_size, self.loop, self.fps)
-        new_gfx.frames = [frame.clone() for frame in self.frames]
-        new_gfx.current_frame_idx = self.current_frame_idx
-        new_gfx.last_update_ms = self.last_update_ms
-        new_gfx.img = self.img.clone()
+        """
+        Create an independent copy of the Graphics object.
+        Only the animation cursor is copied; frame pixels are read-only and shared,
+        so nothing is reloaded from disk.
+        """
+        new_gfx = copy.copy(self)
+        new_gfx.frames = list(self.frames)
         return new_gfx
 
@@ -8,8 +8,10 @@ class GraphicsFactory:
     def load(self,
              sprites_dir: pathlib.Path,
              cfg: dict,
-             cell_size: tuple[int, int]) -> Graphics:
-        """Load graphics from sprites directory with configuration."""
+             cell_size: tuple[int, int],
+             interpolation: int | None = None) -> Graphics:
+        """Load graphics from sprites directory with configuration.
+        Frames come from the shared asset cache, so each folder is decoded once per process."""
         
         loop = cfg.get("is_loop", True)
         fps = cfg.get("frames_per_sec", 6.0)
@@ -17,7 +19,8 @@ class GraphicsFactory:
             sprites_folder=sprites_dir,
             cell_size=cell_size,
             loop=loop,
-            fps=fps
+            fps=fps,
+            interpolation=interpolation
         )
         # Ensure that all frames have valid dimensions and valid channel count.
         valid_frames = [
@@ -7,6 +7,9 @@ import numpy as np
 class Img:
     def __init__(self):
         self.img = None
+        self._blend_src = None     # pixels the cached blend planes were built from
+        self._blend_planes = {}    # target channel count -> (premultiplied, inverse alpha)
+        self._opaque = False
 
     def read(self, path: str | pathlib.Path,
              size: tuple[int, int] | None = None,
@@ -59,35 +62,74 @@ class Img:
             cloned_img.img = self.img.copy()  # שימוש ב-copy כדי להעתיק את התמונה
         return cloned_img
 
+    def prepare_blend(self) -> Img:
+        """
+        Precompute the compositing layout used by `draw_on`: premultiplied
+        BGRA colour plus an inverse-alpha plane, both uint8 and read-only.
+        Called once per sprite at load time; `draw_on` calls it lazily otherwise.
+        """
+        if self.img is None:
+            raise ValueError("Image not loaded.")
+        src = self.img
+        if src.ndim == 2:
+            src = cv2.cvtColor(src, cv2.COLOR_GRAY2BGRA)
+        elif src.shape[2] == 3:
+            src = cv2.cvtColor(src, cv2.COLOR_BGR2BGRA)
+
+        alpha = src[..., 3:4]
+        self._opaque = bool((alpha == 255).all())
+        premult = src.copy()
+        if not self._opaque:
+            premult[..., :3] = (src[..., :3].astype(np.uint16) * alpha + 127) // 255
+        inv_alpha = np.repeat(255 - alpha, 4, axis=2)
+
+        planes = {4: (premult, inv_alpha),
+                  3: (np.ascontiguousarray(premult[..., :3]), np.ascontiguousarray(inv_alpha[..., :3]))}
+        for pair in planes.values():
+            for plane in pair:
+                plane.flags.writeable = False
+        self._blend_planes = planes
+        self._blend_src = self.img
+        return self
+
     def draw_on(self, other_img, x, y):
+        """
+        Alpha-composite this image onto `other_img` with its top-left corner at (x, y).
+        The parts that fall outside `other_img` are clipped. `self` is never modified.
+        """
         if self.img is None or other_img.img is None:
             raise ValueError("Both images must be loaded before drawing.")
-
-        if self.img.shape[2] != other_img.img.shape[2]:
-            if self.img.shape[2] == 3 and other_img.img.shape[2] == 4:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGR2BGRA)
-            elif self.img.shape[2] == 4 and other_img.img.shape[2] == 3:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGRA2BGR)
-
-        h, w = self.img.shape[:2]
-        H, W = other_img.img.shape[:2]
-
-        if y + h > H or x + w > W:
-            raise ValueError("Logo does not fit at the specified position.")
-
-        roi = other_img.img[y:y + h, x:x + w]
-
-        if self.img.shape[2] == 4:
-            b, g, r, a = cv2.split(self.img)
-            mask = a / 255.0
-            for c in range(3):
-                roi[..., c] = (1 - mask) * roi[..., c] + mask * self.img[..., c]
-        else:
-            other_img.img[y:y + h, x:x + w] = self.img
+        if getattr(self, "_blend_src", None) is not self.img:
+            self.prepare_blend()
+
+        dst = other_img.img
+        channels = 1 if dst.ndim == 2 else dst.shape[2]
+        if channels not in self._blend_planes:
+            raise ValueError(f"Cannot draw onto an image with {channels} channels.")
+        premult, inv_alpha = self._blend_planes[channels]
+
+        h, w = premult.shape[:2]
+        H, W = dst.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, W), min(y + h, H)
+        if x0 >= x1 or y0 >= y1:
+            return  # entirely off the target
+
+        roi = dst[y0:y1, x0:x1]
+        sy, sx = y0 - y, x0 - x
+        src = premult[sy:sy + (y1 - y0), sx:sx + (x1 - x0)]
+        if self._opaque:
+            roi[...] = src
+            return
+        inv = inv_alpha[sy:sy + (y1 - y0), sx:sx + (x1 - x0)]
+        # dst = dst * (255 - a) / 255 + premultiplied src, in place on the ROI.
+        cv2.multiply(roi, inv, dst=roi, scale=1 / 255.0)
+        cv2.add(roi, src, dst=roi)
 
     def put_text(self, txt, x, y, font_size, color=(255, 255, 255, 255), thickness=1):
         if self.img is None:
             raise ValueError("Image not loaded.")
+        self._blend_src = None  # pixels change, blend planes must be rebuilt
         cv2.putText(self.img, txt, (x, y),
                     cv2.FONT_HERSHEY_SIMPLEX, font_size,
                     color, thickness, cv2.LINE_AA)
@@ -45,6 +45,11 @@ class InputHandler:
         x, y = pos
         return f"{chr(x + ord('a'))}{y + 1}"
     
+    def can_control(self, user: int, piece) -> bool:
+        """Return True if `user` may command `piece` (user 1 plays black, user 2 white)."""
+        color = piece.piece_id[1]
+        return (user == 1 and color == 'B') or (user == 2 and color == 'W')
+
     def handle_key(self, user: int, key: str, timestamp: Optional[int] = None) -> Optional[Command]:
         """
         Processes a key event for the specified user.
@@ -88,7 +93,7 @@ class InputHandler:
                 piece = self.get_piece_at(state["pos"])
                 if piece is None:
                     return None
-                if (user == 1 and not piece.piece_id[1] == 'B') or (user == 2 and not piece.piece_id[1] == 'W'):
+                if not self.can_control(user, piece):
                     return None
                 state["selected"] = state["pos"]
                 state["piece_id"] = piece.piece_id
@@ -111,7 +116,7 @@ class InputHandler:
             piece = self.get_piece_at(state["pos"])
             if piece is None:
                 return None
-            if (user == 1 and not piece.piece_id[1] == 'B') or (user == 2 and not piece.piece_id[1] == 'W'):
+            if not self.can_control(user, piece):
                 return None
             command = Command(
                 timestamp=timestamp if timestamp is not None else 0,
@@ -133,6 +138,16 @@ class InputHandler:
         """
         return self.player_states[user].copy()
     
+    def snapshot(self) -> tuple:
+        """Return every user's cursor and selection state as plain tuples."""
+        return tuple((user, s["pos"], s["selected"], s["mode"], s["piece_id"])
+                     for user, s in sorted(self.player_states.items()))
+
+    def restore(self, data: tuple):
+        """Load a `snapshot()`."""
+        for user, pos, selected, mode, piece_id in data:
+            self.player_states[user] = {"pos": pos, "selected": selected, "mode": mode, "piece_id": piece_id}
+
     def get_cursor_position(self, user: int) -> Tuple[int, int]:
         """
         Returns the current cursor position for the specified user.
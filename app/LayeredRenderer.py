@@ -0,0 +1,173 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import cv2
+
+from app.Board import Board
+from app.Img import Img
+
+Rect = Tuple[int, int, int, int]  # (x0, y0, x1, y1), x1/y1 exclusive
+
+
+@dataclass(frozen=True)
+class SpriteDraw:
+    """One sprite to draw this frame. `static` sprites are cached in the static layer."""
+    key: str
+    img: Img
+    x: int
+    y: int
+    static: bool = False
+
+    def rect(self) -> Rect:
+        h, w = self.img.img.shape[:2]
+        return (self.x, self.y, self.x + w, self.y + h)
+
+
+@dataclass(frozen=True)
+class CursorDraw:
+    """A player cursor drawn on top of every sprite."""
+    pos: Tuple[int, int]
+    color: Tuple[int, int, int]
+    thickness: int = 3
+
+
+class LayeredRenderer:
+    """
+    Composites the board into a persistent frame buffer and only redraws what changed.
+
+    Two layers are kept:
+      • static layer – background plus the static sprites (idle, not animating);
+      • frame        – static layer plus moving/animating sprites and cursors.
+    Every call to `render` diffs the sprites and cursors against the previous
+    call, collects dirty rectangles and recomposites only those regions, so the
+    cost per frame follows the amount of change rather than board area × pieces.
+    """
+    # Above this fraction of the board area a full recomposite is cheaper than many rects.
+    FULL_REDRAW_RATIO = 0.6
+
+    def __init__(self, board: Board):
+        self.board = board
+        self._background = board.img.img
+        self._static: Optional[Img] = None
+        self._frame: Optional[Board] = None
+        self._prev_static: Dict[str, SpriteDraw] = {}
+        self._prev_dynamic: Dict[str, SpriteDraw] = {}
+        self._prev_cursors: Tuple[CursorDraw, ...] = ()
+        self.last_dirty_rects: List[Rect] = []
+
+    def invalidate(self):
+        """Force a full recomposite on the next render (e.g. after the background changed)."""
+        self._frame = None
+
+    # ─── public API ─────────────────────────────────────────────────────────
+    def render(self, sprites: Iterable[SpriteDraw], cursors: Sequence[CursorDraw] = ()) -> Board:
+        """
+        Bring the frame buffer up to date and return it as a Board.
+        The returned Board is reused by the next call; copy it to keep a frame.
+        """
+        static: Dict[str, SpriteDraw] = {}
+        dynamic: Dict[str, SpriteDraw] = {}
+        for s in sprites:
+            (static if s.static else dynamic)[s.key] = s
+        cursors = tuple(cursors)
+
+        if self._frame is None:
+            self._full_redraw(static, dynamic, cursors)
+        else:
+            static_dirty = self._diff(self._prev_static, static)
+            frame_dirty = static_dirty + self._diff(self._prev_dynamic, dynamic)
+            if cursors != self._prev_cursors:
+                frame_dirty += [self._cursor_rect(c) for c in self._prev_cursors + cursors]
+
+            frame_dirty = [r for r in (self._clip(r) for r in frame_dirty) if r is not None]
+            if self._area(frame_dirty) > self.FULL_REDRAW_RATIO * self._background.shape[0] * self._background.shape[1]:
+                self._full_redraw(static, dynamic, cursors)
+            else:
+                for rect in static_dirty:
+                    rect = self._clip(rect)
+                    if rect is not None:
+                        self._compose_static(rect, static.values())
+                for rect in frame_dirty:
+                    self._compose_frame(rect, dynamic.values(), cursors)
+                self.last_dirty_rects = frame_dirty
+
+        self._prev_static, self._prev_dynamic, self._prev_cursors = static, dynamic, cursors
+        return self._frame
+
+    # ─── helpers ────────────────────────────────────────────────────────────
+    def _full_redraw(self, static: Dict[str, SpriteDraw], dynamic: Dict[str, SpriteDraw],
+                     cursors: Tuple[CursorDraw, ...]):
+        H, W = self._background.shape[:2]
+        if self._frame is None:
+            self._static = Img()
+            self._static.img = self._background.copy()
+            frame_img = Img()
+            frame_img.img = self._background.copy()
+            self._frame = Board(self.board.cell_H_pix, self.board.cell_W_pix,
+                                self.board.cell_H_m, self.board.cell_W_m,
+                                self.board.W_cells, self.board.H_cells, frame_img)
+        full = (0, 0, W, H)
+        self._compose_static(full, static.values())
+        self._compose_frame(full, dynamic.values(), cursors)
+        self.last_dirty_rects = [full]
+
+    @staticmethod
+    def _diff(prev: Dict[str, SpriteDraw], cur: Dict[str, SpriteDraw]) -> List[Rect]:
+        """Rects covering every sprite that appeared, disappeared, moved or changed frame."""
+        rects = []
+        for key, old in prev.items():
+            new = cur.get(key)
+            if new is None or new.img is not old.img or new.x != old.x or new.y != old.y:
+                rects.append(old.rect())
+                if new is not None:
+                    rects.append(new.rect())
+        for key, new in cur.items():
+            if key not in prev:
+                rects.append(new.rect())
+        return rects
+
+    def _compose_static(self, rect: Rect, sprites: Iterable[SpriteDraw]):
+        x0, y0, x1, y1 = rect
+        self._static.img[y0:y1, x0:x1] = self._background[y0:y1, x0:x1]
+        self._draw_sprites(self._static.img, rect, sprites)
+
+    def _compose_frame(self, rect: Rect, sprites: Iterable[SpriteDraw], cursors: Tuple[CursorDraw, ...]):
+        x0, y0, x1, y1 = rect
+        frame = self._frame.img.img
+        frame[y0:y1, x0:x1] = self._static.img[y0:y1, x0:x1]
+        self._draw_sprites(frame, rect, sprites)
+        view = frame[y0:y1, x0:x1]
+        for c in cursors:
+            if not (0 <= c.pos[0] < self.board.W_cells and 0 <= c.pos[1] < self.board.H_cells):
+                continue
+            if self._intersects(self._cursor_rect(c), rect):
+                (px0, py0), (px1, py1) = self.board.cursor_rect(c.pos)
+                cv2.rectangle(view, (px0 - x0, py0 - y0), (px1 - x0, py1 - y0), c.color, c.thickness)
+
+    def _draw_sprites(self, target, rect: Rect, sprites: Iterable[SpriteDraw]):
+        x0, y0, x1, y1 = rect
+        view = Img()
+        view.img = target[y0:y1, x0:x1]
+        for s in sprites:
+            if s.img is not None and s.img.img is not None and self._intersects(s.rect(), rect):
+                s.img.draw_on(view, s.x - x0, s.y - y0)
+
+    def _cursor_rect(self, cursor: CursorDraw) -> Rect:
+        (px0, py0), (px1, py1) = self.board.cursor_rect(cursor.pos)
+        pad = cursor.thickness // 2 + 1
+        return (px0 - pad, py0 - pad, px1 + pad + 1, py1 + pad + 1)
+
+    def _clip(self, rect: Rect) -> Optional[Rect]:
+        H, W = self._background.shape[:2]
+        x0, y0, x1, y1 = max(rect[0], 0), max(rect[1], 0), min(rect[2], W), min(rect[3], H)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (x0, y0, x1, y1)
+
+    @staticmethod
+    def _intersects(a: Rect, b: Rect) -> bool:
+        return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+    @staticmethod
+    def _area(rects: List[Rect]) -> int:
+        return sum((r[2] - r[0]) * (r[3] - r[1]) for r in rects)
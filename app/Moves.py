@@ -1,15 +1,23 @@
 # Moves.py  – drop-in replacement
 import pathlib
-from typing import List, Tuple
+from typing import FrozenSet, List, Optional, Tuple
 import re
 
+_EMPTY: FrozenSet[Tuple[int, int]] = frozenset()
+
+
 class Moves:
-    def __init__(self, txt_path: pathlib.Path, dims: Tuple[int, int]):
-        """Initialize moves with rules from text file and board dimensions."""
+    def __init__(self, txt_path: pathlib.Path, dims: Tuple[int, int],
+                 moves_list: Optional[List[Tuple[int, int]]] = None):
+        """Initialize moves with rules from text file and board dimensions.
+        Legal destinations for every cell are precomputed here, so lookups never allocate.
+        A `moves_list` that was already parsed (e.g. from an asset pack) skips reading the file."""
         self.dims = dims
-        self.moves_list = self.read(txt_path)
+        self.moves_list = self.read(txt_path) if moves_list is None else list(moves_list)
+        self._build_tables()
 
-    def read(self, txt_path: pathlib.Path) -> List[Tuple[int, int]]:
+    @staticmethod
+    def read(txt_path: pathlib.Path) -> List[Tuple[int, int]]:
         """Read moves from text file. Each line: 'dx,dy'."""
         moves = []
         with open(txt_path, 'r') as f:
@@ -18,7 +26,6 @@ class Moves:
                 if not line or line.startswith("//"):
                     continue
                 parts = re.split(r'[,:]', line)
-                print(parts)
                 if len(parts) >= 2:
                     try:
                         dx = int(parts[0])
@@ -28,13 +35,54 @@ class Moves:
                         continue  # skip invalid lines
         return moves
 
+    def _build_tables(self):
+        """Build per-(row, col) destination tables: ordered tuple, frozenset and bitmask."""
+        H, W = self.dims
+        self._ordered: List[List[Tuple[Tuple[int, int], ...]]] = []
+        self._sets: List[List[FrozenSet[Tuple[int, int]]]] = []
+        self._masks: List[List[int]] = []
+        for r in range(H):
+            ordered_row, set_row, mask_row = [], [], []
+            for c in range(W):
+                targets = []
+                for dr, dc in self.moves_list:
+                    nr, nc = r + dr, c + dc
+                    if 0 <= nr < H and 0 <= nc < W and (nr, nc) not in targets:
+                        targets.append((nr, nc))
+                ordered_row.append(tuple(targets))
+                set_row.append(frozenset(targets))
+                mask = 0
+                for nr, nc in targets:
+                    mask |= 1 << (nr * W + nc)
+                mask_row.append(mask)
+            self._ordered.append(ordered_row)
+            self._sets.append(set_row)
+            self._masks.append(mask_row)
+
+    def _in_bounds(self, r: int, c: int) -> bool:
+        H, W = self.dims
+        return 0 <= r < H and 0 <= c < W
+
     def get_moves(self, r: int, c: int) -> List[Tuple[int, int]]:
         """Get all possible moves from a given position, filtered by board boundaries."""
-        H, W = self.dims
-        valid_moves = []
-        for dr, dc in self.moves_list:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < H and 0 <= nc < W:
-                valid_moves.append((nr, nc))
-        return valid_moves
-    
\ No newline at end of file
+        if not self._in_bounds(r, c):
+            return []
+        return list(self._ordered[r][c])
+
+    def legal_targets(self, r: int, c: int) -> FrozenSet[Tuple[int, int]]:
+        """Return the precomputed set of legal destinations from (r, c). Shared, do not mutate."""
+        if not self._in_bounds(r, c):
+            return _EMPTY
+        return self._sets[r][c]
+
+    def targets_mask(self, r: int, c: int) -> int:
+        """Return the legal destinations from (r, c) as a bitmask (bit `row * W + col`)."""
+        if not self._in_bounds(r, c):
+            return 0
+        return self._masks[r][c]
+
+    def is_legal(self, src: Tuple[int, int], dest: Tuple[int, int]) -> bool:
+        """O(1) check that `dest` is reachable from `src` in one move."""
+        if not self._in_bounds(*src):
+            return False
+        return dest in self._sets[src[0]][src[1]]
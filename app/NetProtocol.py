@@ -0,0 +1,161 @@
+"""
+Framed binary protocol between GameServer and GameClient.
+
+Every frame is a uint16 payload length followed by the payload; the first
+payload byte is the frame kind. Cells are uint16 (row << 8 | col).
+
+client -> server
+    JOIN   game id (uint32), player (uint8: 1 black, 2 white, 0 spectator)
+    MOVE   source cell, destination cell
+    JUMP   cell
+    KEY    key name (uint8 length + utf-8), handled by the game's InputHandler
+server -> client
+    ACK    status (uint8), one per MOVE/JUMP/KEY, in order
+    TABLE  piece ids of the game (uint16 count, then uint8 length + utf-8 each)
+    UPDATE game time (uint32), row count (uint16), then rows of
+           piece index (uint16), cell (uint16), state id (uint8), x (int16), y (int16)
+    WINNER winner (uint8 length + utf-8); empty if the server aborted the game
+    FEED   a SpectatorFeed message (spectators receive FEED instead of TABLE/UPDATE)
+"""
+import struct
+from typing import List, Tuple
+
+JOIN, MOVE, JUMP, KEY = b"J", b"M", b"P", b"K"
+ACK, TABLE, UPDATE, WINNER, FEED = b"A", b"T", b"U", b"W", b"F"
+
+# ACK status codes
+OK, NOT_JOINED, NO_PIECE, NOT_YOURS, ILLEGAL, BUSY, BAD_FRAME, GAME_OVER = range(8)
+STATUS_NAMES = ("ok", "not_joined", "no_piece", "not_yours", "illegal", "busy", "bad_frame", "game_over")
+
+SPECTATOR = 0
+
+_LEN = struct.Struct("<H")
+_JOIN = struct.Struct("<IB")
+_MOVE = struct.Struct("<HH")
+_CELL = struct.Struct("<H")
+_U8 = struct.Struct("<B")
+_UPDATE = struct.Struct("<IH")
+UPDATE_ROW = struct.Struct("<HHBhh")
+
+
+class ProtocolError(Exception): ...
+
+
+def encode_cell(cell: Tuple[int, int]) -> int:
+    row, col = cell
+    return (row << 8) | col
+
+
+def decode_cell(code: int) -> Tuple[int, int]:
+    return (code >> 8, code & 0xFF)
+
+
+def frame(payload: bytes) -> bytes:
+    """Prefix `payload` with its length."""
+    if len(payload) > 0xFFFF:
+        raise ProtocolError("Frame too large.")
+    return _LEN.pack(len(payload)) + payload
+
+
+def _text(text: str) -> bytes:
+    raw = text.encode("utf-8")
+    if len(raw) > 0xFF:
+        raise ProtocolError("Text field too long.")
+    return _U8.pack(len(raw)) + raw
+
+
+def _read_text(payload: bytes, offset: int) -> Tuple[str, int]:
+    (n,) = _U8.unpack_from(payload, offset)
+    end = offset + 1 + n
+    if end > len(payload):
+        raise ProtocolError("Truncated text field.")
+    return payload[offset + 1:end].decode("utf-8"), end
+
+
+async def read_frame(reader) -> bytes:
+    """Read one frame's payload (raises asyncio.IncompleteReadError at EOF)."""
+    (n,) = _LEN.unpack(await reader.readexactly(_LEN.size))
+    return await reader.readexactly(n)
+
+
+# ─── client -> server ───────────────────────────────────────────────────────
+def join(game_id: int, player: int) -> bytes:
+    return frame(JOIN + _JOIN.pack(game_id, player))
+
+
+def move(src: Tuple[int, int], dst: Tuple[int, int]) -> bytes:
+    return frame(MOVE + _MOVE.pack(encode_cell(src), encode_cell(dst)))
+
+
+def jump(cell: Tuple[int, int]) -> bytes:
+    return frame(JUMP + _CELL.pack(encode_cell(cell)))
+
+
+def key(name: str) -> bytes:
+    return frame(KEY + _text(name))
+
+
+def parse_request(payload: bytes) -> tuple:
+    """Decode a client frame into (kind, *fields)."""
+    try:
+        kind = payload[:1]
+        if kind == JOIN:
+            return (JOIN,) + _JOIN.unpack_from(payload, 1)
+        if kind == MOVE:
+            src, dst = _MOVE.unpack_from(payload, 1)
+            return MOVE, decode_cell(src), decode_cell(dst)
+        if kind == JUMP:
+            return JUMP, decode_cell(_CELL.unpack_from(payload, 1)[0])
+        if kind == KEY:
+            return KEY, _read_text(payload, 1)[0]
+    except (struct.error, UnicodeDecodeError) as exc:
+        raise ProtocolError(str(exc)) from exc
+    raise ProtocolError(f"Unknown frame kind {kind!r}.")
+
+
+# ─── server -> client ───────────────────────────────────────────────────────
+def ack(status: int) -> bytes:
+    return frame(ACK + _U8.pack(status))
+
+
+def table(piece_ids: List[str]) -> bytes:
+    return frame(TABLE + _LEN.pack(len(piece_ids)) + b"".join(_text(pid) for pid in piece_ids))
+
+
+def update(now_ms: int, rows: bytes, n_rows: int) -> bytes:
+    """`rows` is `n_rows` UPDATE_ROW records packed back to back."""
+    return frame(UPDATE + _UPDATE.pack(now_ms & 0xFFFFFFFF, n_rows) + rows)
+
+
+def winner(name: str) -> bytes:
+    return frame(WINNER + _text(name))
+
+
+def feed(message: bytes) -> bytes:
+    return frame(FEED + message)
+
+
+def parse_reply(payload: bytes) -> tuple:
+    """Decode a server frame into (kind, *fields)."""
+    try:
+        kind = payload[:1]
+        if kind == ACK:
+            return ACK, _U8.unpack_from(payload, 1)[0]
+        if kind == TABLE:
+            (n,) = _LEN.unpack_from(payload, 1)
+            ids, offset = [], 1 + _LEN.size
+            for _ in range(n):
+                pid, offset = _read_text(payload, offset)
+                ids.append(pid)
+            return TABLE, ids
+        if kind == UPDATE:
+            now_ms, n = _UPDATE.unpack_from(payload, 1)
+            rows = [UPDATE_ROW.unpack_from(payload, 1 + _UPDATE.size + i * UPDATE_ROW.size) for i in range(n)]
+            return UPDATE, now_ms, rows
+        if kind == WINNER:
+            return WINNER, _read_text(payload, 1)[0]
+        if kind == FEED:
+            return FEED, payload[1:]
+    except (struct.error, UnicodeDecodeError) as exc:
+        raise ProtocolError(str(exc)) from exc
+    raise ProtocolError(f"Unknown frame kind {kind!r}.")
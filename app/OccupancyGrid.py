@@ -0,0 +1,114 @@
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+Cell = Tuple[int, int]  # (row, col), as in Physics.cell
+
+
+class OccupancyGrid:
+    """
+    Board-sized index of which piece stands on which cell.
+
+    `slots[row, col]` holds the slot number of the first piece on a cell
+    (-1 when empty); cells shared by several pieces additionally keep the
+    full list of occupants, so captures only need to look at those cells.
+    The grid is updated incrementally through `add`, `remove` and `sync`.
+    """
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.slots = np.full((height, width), -1, dtype=np.int32)
+        self._pieces: List[Optional[object]] = []   # slot -> piece
+        self._free: List[int] = []
+        self._slot_of: Dict[int, int] = {}          # id(piece) -> slot
+        self._cell_of: Dict[int, Cell] = {}         # slot -> indexed cell
+        self._shared: Dict[Cell, List[int]] = {}    # cell -> slots, only when more than one
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def _in_bounds(self, cell: Cell) -> bool:
+        return 0 <= cell[0] < self.height and 0 <= cell[1] < self.width
+
+    @staticmethod
+    def _cell(piece) -> Cell:
+        return tuple(piece.current_state.physics.cell)
+
+    # ─── updates ────────────────────────────────────────────────────────────
+    def add(self, piece):
+        """Index `piece` at its current cell."""
+        if id(piece) in self._slot_of:
+            return
+        if self._free:
+            slot = self._free.pop()
+            self._pieces[slot] = piece
+        else:
+            slot = len(self._pieces)
+            self._pieces.append(piece)
+        self._slot_of[id(piece)] = slot
+        self._place(slot, self._cell(piece))
+
+    def remove(self, piece):
+        """Drop `piece` from the index (e.g. when it is captured)."""
+        slot = self._slot_of.pop(id(piece), None)
+        if slot is None:
+            return
+        self._unplace(slot)
+        self._pieces[slot] = None
+        self._free.append(slot)
+
+    def sync(self, piece) -> bool:
+        """Re-index `piece` if its cell changed. Returns True if it moved."""
+        slot = self._slot_of.get(id(piece))
+        if slot is None:
+            return False
+        cell = self._cell(piece)
+        if self._cell_of[slot] == cell:
+            return False
+        self._unplace(slot)
+        self._place(slot, cell)
+        return True
+
+    def _place(self, slot: int, cell: Cell):
+        self._cell_of[slot] = cell
+        if not self._in_bounds(cell):
+            return
+        first = self.slots[cell]
+        if first < 0:
+            self.slots[cell] = slot
+        else:
+            self._shared.setdefault(cell, [int(first)]).append(slot)
+
+    def _unplace(self, slot: int):
+        cell = self._cell_of.pop(slot)
+        if not self._in_bounds(cell):
+            return
+        occupants = self._shared.get(cell)
+        if occupants is None:
+            self.slots[cell] = -1
+            return
+        occupants.remove(slot)
+        self.slots[cell] = occupants[0]
+        if len(occupants) == 1:
+            del self._shared[cell]
+
+    # ─── queries ────────────────────────────────────────────────────────────
+    def get(self, cell: Cell):
+        """Return the (first) piece on `cell`, or None. O(1)."""
+        if not self._in_bounds(cell):
+            return None
+        slot = self.slots[cell]
+        return self._pieces[slot] if slot >= 0 else None
+
+    def pieces_at(self, cell: Cell) -> list:
+        """Return every piece on `cell`, in arrival order."""
+        occupants = self._shared.get(cell)
+        if occupants is not None:
+            return [self._pieces[s] for s in occupants]
+        piece = self.get(cell)
+        return [] if piece is None else [piece]
+
+    def shared_cells(self) -> Iterator[Tuple[Cell, list]]:
+        """Yield (cell, pieces) for every cell occupied by more than one piece."""
+        for cell, occupants in list(self._shared.items()):
+            yield cell, [self._pieces[s] for s in occupants]
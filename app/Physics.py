@@ -10,6 +10,10 @@ def notation_to_cell(notation: str) -> Tuple[int, int]:
 
 class Physics:
     """Base physics class for all piece types."""
+    # Per-command attributes set by reset(); copied by clone() and snapshot().
+    STATE_ATTRS = ("pixel_pos", "start_pixel", "target_cell", "target_pixel",
+                   "start_time", "duration_ms", "moving", "next_state_when_finished")
+
     def __init__(self, start_cell: Tuple[int, int], board: Board, speed_m_s: float = 1.0):
         self.board = board
         self.cell = start_cell        # logical cell (col, row)
@@ -33,12 +37,25 @@ class Physics:
 
     def clone(self) -> "Physics":
         new = self.__class__(self.cell, self.board, self.speed_m_s)
-        for attr in ("pixel_pos", "start_pixel", "target_cell", "target_pixel",
-                     "start_time", "duration_ms", "moving", "next_state_when_finished"):
+        for attr in self.STATE_ATTRS:
             if hasattr(self, attr):
                 setattr(new, attr, getattr(self, attr))
         return new
 
+    def snapshot(self) -> tuple:
+        """Return the cell and per-command attributes as plain tuples (see `restore`)."""
+        d = self.__dict__
+        return (tuple(self.cell), tuple((attr, d[attr]) for attr in self.STATE_ATTRS if attr in d))
+
+    def restore(self, data: tuple):
+        """Load a `snapshot()`; attributes absent from it are removed."""
+        cell, attrs = data
+        d = self.__dict__
+        for attr in self.STATE_ATTRS:
+            d.pop(attr, None)
+        d.update(attrs)
+        self.cell = cell
+
     def can_be_captured(self) -> bool:
         """Default: can be captured."""
         return True
@@ -9,6 +9,19 @@ class Piece:
         self.piece_id = piece_id
         self.current_state = init_state
         self.start_time = 0
+        self.states = self._collect_states(init_state)
+
+    @staticmethod
+    def _collect_states(init_state: State) -> dict:
+        """Map state name -> State for every state reachable through transitions."""
+        states, todo = {}, [init_state]
+        while todo:
+            state = todo.pop()
+            if state.name in states:
+                continue
+            states[state.name] = state
+            todo.extend(state.transitions.values())
+        return states
 
     def on_command(self, cmd: Command, now_ms: int):
         """Handle a command for this piece."""
@@ -29,10 +42,25 @@ class Piece:
         idle_cmd = Command(timestamp=start_ms, piece_id=self.piece_id, type="Idle", params=[])
         self.current_state.reset(idle_cmd)
 
+    def snapshot(self) -> tuple:
+        """Return the piece's mutable data (current state and its timers) as plain tuples."""
+        return (self.piece_id, self.start_time, self.current_state.snapshot())
+
+    def restore(self, data: tuple):
+        """Switch to the state named in a `snapshot()` and load its data."""
+        _, self.start_time, state_data = data
+        self.current_state = self.states[state_data[0]]
+        self.current_state.restore(state_data)
+
     def update(self, now_ms: int):
         """Update the piece state based on the current time."""
         self.current_state = self.current_state.update(now_ms)
 
+    def is_static(self) -> bool:
+        """Return True if the piece is neither moving nor animating, so its pixels can be cached."""
+        state = self.current_state
+        return not getattr(state.physics, "moving", False) and not state.graphics.is_animating()
+
     def draw_on_board(self, board: Board, now_ms: int):
         """Draw the piece on the board."""
         # Get the current image and position
@@ -1,32 +1,106 @@
 import pathlib
-from typing import Tuple
-import json
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from app.AssetCache import AssetCache, asset_cache
+from app.AssetPack import load_pack
 from app.Board import Board
 from app.GraphicsFactory import GraphicsFactory
-from app.Moves import Moves
 from app.PhysicsFactory import PhysicsFactory
 from app.Piece import Piece
 from app.State import State
 
 
+STATE_TYPES = ("move", "jump", "idle", "long_rest", "short_rest")
+
+
 class PieceFactory:
-    def __init__(self, board: Board, pieces_root: pathlib.Path):
+    def __init__(self, board: Board, pieces_root: pathlib.Path,
+                 asset_pack: Optional[pathlib.Path] = None):
         """Initialize piece factory with board and 
-        generates the library of piece templates from the pieces directory."""
+        generates the library of piece templates from the pieces directory.
+        With an up-to-date `asset_pack` (see AssetPack) the assets come from the pack."""
         self.board = board
         self.pieces_root = pathlib.Path(pieces_root)
+        self.from_pack = asset_pack is not None and load_pack(
+            asset_pack, self.pieces_root, (board.cell_W_pix, board.cell_H_pix))
         self.graphics_factory = GraphicsFactory()
         self.physics_factory = PhysicsFactory(board)
         self.counter = {}  # Added: counter per piece type
+        self.load_times: Dict[str, float] = {}   # seconds spent loading each piece type (see preload)
+
+    @staticmethod
+    def _sprites_dir(states_dir: pathlib.Path, state: str) -> pathlib.Path:
+        """The sprites folder of `state`; an empty "move" folder falls back to "idle"."""
+        sprites_dir = states_dir / state / "sprites"
+        if state == "move" and not any(sprites_dir.glob("*.png")):
+            return states_dir / "idle" / "sprites"
+        return sprites_dir
+
+    def preload(self, p_types: Iterable[str], max_workers: Optional[int] = None) -> Dict[str, float]:
+        """
+        Load the assets of every piece type in `p_types` into the asset cache
+        before any piece is built: all missing sprite files are decoded and
+        resized concurrently in a pool of `max_workers` threads (cv2 releases
+        the GIL), along with the configs and move tables. Returns (and adds to
+        `load_times`) the time spent per piece type, summed over its tasks.
+        """
+        # Unknown types are left to create_piece, which reports them.
+        p_types = [p_type for p_type in dict.fromkeys(p_types) if (self.pieces_root / p_type).is_dir()]
+        cell_size = (self.board.cell_W_pix, self.board.cell_H_pix)
+        dims = (self.board.H_cells, self.board.W_cells)
+        sprite_dirs: Dict[pathlib.Path, str] = {}
+        for p_type in p_types:
+            states_dir = self.pieces_root / p_type / "states"
+            for state in STATE_TYPES:
+                sprites_dir = self._sprites_dir(states_dir, state)
+                if not asset_cache.has_frames(sprites_dir, cell_size):
+                    sprite_dirs.setdefault(sprites_dir, p_type)
+
+        def timed(p_type, fn, *args):
+            start = time.perf_counter()
+            result = fn(*args)
+            return p_type, time.perf_counter() - start, result
+
+        times: Dict[str, float] = defaultdict(float)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            frame_jobs = {sprites_dir: [pool.submit(timed, p_type, AssetCache.read_frame, file, cell_size)
+                                        for file in sorted(sprites_dir.glob("*.png"))]
+                          for sprites_dir, p_type in sprite_dirs.items()}
+            other_jobs = []
+            for p_type in p_types:
+                piece_dir = self.pieces_root / p_type
+                other_jobs.append(pool.submit(timed, p_type, asset_cache.get_moves, piece_dir / "moves.txt", dims))
+                for state in STATE_TYPES:
+                    cfg_path = piece_dir / "states" / state / "config.json"
+                    if cfg_path.exists():
+                        other_jobs.append(pool.submit(timed, p_type, asset_cache.get_config, cfg_path))
+            for sprites_dir, jobs in frame_jobs.items():
+                frames = []
+                for job in jobs:
+                    p_type, seconds, img = job.result()
+                    times[p_type] += seconds
+                    frames.append(img)
+                asset_cache.put_frames(sprites_dir, cell_size, None, tuple(frames))
+            for job in other_jobs:
+                p_type, seconds, _ = job.result()
+                times[p_type] += seconds
+        for p_type, seconds in times.items():
+            self.load_times[p_type] = self.load_times.get(p_type, 0.0) + seconds
+        return dict(times)
 
     def _build_state_machine(self, piece_dir: pathlib.Path) -> State:
         """Build a state machine for a piece from its directory."""
-        state_types = ["move", "jump", "idle", "long_rest", "short_rest"]
         states_dir = piece_dir / "states"
         init_states = {}
+
+        # Load moves (shared for all states, and for every piece of this type)
+        moves_path = piece_dir / "moves.txt"
+        moves = asset_cache.get_moves(moves_path, (self.board.H_cells, self.board.W_cells))
         
         # Create every state
-        for state in state_types:
+        for state in STATE_TYPES:
             state_dir = states_dir / state
             if not state_dir.is_dir():
                 raise ValueError(f"No {state} state directory found in {states_dir}")
@@ -35,23 +109,13 @@ class PieceFactory:
             if not cfg_path.exists():
                 raise ValueError(f"No 'config.json' found in {state_dir}")
 
-            # Load state configuration
-            with open(cfg_path, "r", encoding="utf-8") as f:
-                cfg = json.load(f)
-
-            # Load moves (shared for all states)
-            moves_path = piece_dir / "moves.txt"
-            moves = Moves(moves_path, (self.board.H_cells, self.board.W_cells))
+            # Load state configuration (cached and shared, so never mutate it)
+            cfg = asset_cache.get_config(cfg_path)
 
             # Load graphics – if loading the "move" state and its sprites folder is empty, fallback to "idle"
-            sprites_dir = state_dir / "sprites"
-            if state == "move":
-                png_files = list(sprites_dir.glob("*.png"))
-                if not png_files:  # no PNG files in move state folder
-                    # Fallback to idle state's sprites folder
-                    fallback_dir = (states_dir / "idle") / "sprites"
-                    print(f"[WARN] No sprites in {sprites_dir}; falling back to {fallback_dir} for state '{state}'.")
-                    sprites_dir = fallback_dir
+            sprites_dir = self._sprites_dir(states_dir, state)
+            if sprites_dir.parent != state_dir:
+                print(f"[WARN] No sprites in {state_dir / 'sprites'}; falling back to {sprites_dir} for state '{state}'.")
 
             graphics_cfg = cfg.get("graphics", {})
             cell_size = (self.board.cell_W_pix, self.board.cell_H_pix)
@@ -62,11 +126,11 @@ class PieceFactory:
             )
 
             # Load physics
-            physics_cfg = cfg.get("physics", {})
+            physics_cfg = dict(cfg.get("physics", {}))
             physics_cfg['type'] = state
             start_cell = (0, 0)  # Placeholder; will be set in create_piece
             physics = self.physics_factory.create(start_cell, physics_cfg)
-            init_states[state] = State(moves, graphics, physics)
+            init_states[state] = State(moves, graphics, physics, name=state)
         
         idle_state = init_states["idle"]
         move_state = init_states["move"]
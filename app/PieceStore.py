@@ -0,0 +1,205 @@
+from typing import Dict, List
+
+import numpy as np
+
+from app.Physics import MovePhysics, JumpPhysics, IdlePhysics, LongRestPhysics, ShortRestPhysics
+from app.Piece import Piece
+
+# Physics types whose update() the store knows how to vectorize.
+_BATCHED_PHYSICS = (MovePhysics, JumpPhysics, IdlePhysics, LongRestPhysics, ShortRestPhysics)
+STATE_IDS = {"idle": 0, "move": 1, "jump": 2, "long_rest": 3, "short_rest": 4}
+
+
+class PieceStore:
+    """
+    Optional struct-of-arrays store for batched piece updates.
+
+    Cell, pixel position, move interpolation and animation cursor of every
+    piece live in numpy columns; `update` advances all moving pieces and all
+    animation cursors in one vectorized step and writes the results back to
+    the Physics/Graphics objects of the rows that actually changed, so
+    Piece/State stay valid views for input, rendering and captures.
+    Only pieces whose state has an auto-transition pending are then visited
+    one by one.
+
+    Call `refresh(piece)` whenever a piece's state is changed from outside
+    (commands, resets); Game does this for you.
+    """
+    def __init__(self, pieces: List[Piece] = (), capacity: int = 64):
+        self._capacity = 0
+        self._n = 0
+        self._pieces: List[Piece] = []
+        self._row_of: Dict[int, int] = {}       # id(piece) -> row
+        self._grow(max(capacity, len(pieces)))
+        for p in pieces:
+            self.add(p)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _grow(self, capacity: int):
+        def grow(arr, shape, dtype, fill=0):
+            new = np.full((capacity,) + shape, fill, dtype=dtype)
+            if arr is not None:
+                new[:self._n] = arr[:self._n]
+            return new
+        g = lambda name: getattr(self, name, None)
+        self.cell = grow(g("cell"), (2,), np.int32)
+        self.pos = grow(g("pos"), (2,), np.float64)
+        self.state_id = grow(g("state_id"), (), np.int8, -1)
+        self.moving = grow(g("moving"), (), np.bool_)
+        self.start_pos = grow(g("start_pos"), (2,), np.float64)
+        self.target_pos = grow(g("target_pos"), (2,), np.float64)
+        self.target_cell = grow(g("target_cell"), (2,), np.int32)
+        self.start_time = grow(g("start_time"), (), np.float64)
+        self.duration = grow(g("duration"), (), np.float64)
+        self.frame_idx = grow(g("frame_idx"), (), np.int32)
+        self.n_frames = grow(g("n_frames"), (), np.int32)
+        self.frame_ms = grow(g("frame_ms"), (), np.int64)
+        self.last_frame_ms = grow(g("last_frame_ms"), (), np.int64)
+        self.animated = grow(g("animated"), (), np.bool_)
+        self.loop = grow(g("loop"), (), np.bool_)
+        self.pending = grow(g("pending"), (), np.bool_)   # auto-transition may fire
+        self.batched = grow(g("batched"), (), np.bool_)   # physics is vectorized
+        self._capacity = capacity
+
+    # ─── rows ───────────────────────────────────────────────────────────────
+    def add(self, piece: Piece):
+        """Append a row for `piece`."""
+        if id(piece) in self._row_of:
+            self.refresh(piece)
+            return
+        if self._n == self._capacity:
+            self._grow(self._capacity * 2)
+        row = self._n
+        self._n += 1
+        self._pieces.append(piece)
+        self._row_of[id(piece)] = row
+        self.refresh(piece)
+
+    def remove(self, piece: Piece):
+        """Drop `piece` (swap-remove with the last row)."""
+        row = self._row_of.pop(id(piece), None)
+        if row is None:
+            return
+        last = self._n - 1
+        if row != last:
+            for arr in self._columns():
+                arr[row] = arr[last]
+            moved = self._pieces[last]
+            self._pieces[row] = moved
+            self._row_of[id(moved)] = row
+        self._pieces.pop()
+        self._n -= 1
+
+    def _columns(self):
+        return (self.cell, self.pos, self.state_id, self.moving, self.start_pos, self.target_pos,
+                self.target_cell, self.start_time, self.duration, self.frame_idx, self.n_frames,
+                self.frame_ms, self.last_frame_ms, self.animated, self.loop, self.pending, self.batched)
+
+    def refresh(self, piece: Piece):
+        """Reload the row of `piece` from its current State objects."""
+        row = self._row_of[id(piece)]
+        state = piece.current_state
+        physics, graphics = state.physics, state.graphics
+
+        self.cell[row] = physics.cell
+        self.pos[row] = physics.get_pos()
+        self.state_id[row] = STATE_IDS.get(state.name, -1)
+        self.moving[row] = getattr(physics, "moving", False)
+        if self.moving[row]:
+            self.start_pos[row] = physics.start_pixel
+            self.target_pos[row] = physics.target_pixel
+            self.target_cell[row] = physics.target_cell
+            self.start_time[row] = physics.start_time
+            self.duration[row] = physics.duration_ms
+        self.frame_idx[row] = graphics.current_frame_idx
+        self.n_frames[row] = len(graphics.frames)
+        self.animated[row] = bool(graphics.frames) and graphics.fps > 0
+        self.frame_ms[row] = graphics.frame_time_ms() if graphics.fps > 0 else 1
+        self.last_frame_ms[row] = graphics.last_update_ms
+        self.loop[row] = graphics.loop
+        self.pending[row] = getattr(physics, "next_state_when_finished", None) is not None
+        self.batched[row] = type(physics) in _BATCHED_PHYSICS
+
+    # ─── per-tick update ────────────────────────────────────────────────────
+    def update(self, now_ms: int) -> List[Piece]:
+        """
+        Advance every piece to `now_ms`, run pending auto-transitions and
+        return the pieces whose cell or state may have changed.
+        """
+        n = self._n
+        if n == 0:
+            return []
+        changed: List[Piece] = []
+
+        # (1) move interpolation, all moving pieces at once
+        moving = np.flatnonzero(self.moving[:n] & self.batched[:n])
+        going = arrived = moving[:0]
+        if moving.size:
+            elapsed = now_ms - self.start_time[moving]
+            done = elapsed >= self.duration[moving]
+            arrived = moving[done]
+            going = moving[~done]
+            if going.size:
+                t = (elapsed[~done] / self.duration[going])[:, None]
+                start = self.start_pos[going]
+                self.pos[going] = start + (self.target_pos[going] - start) * t
+            if arrived.size:
+                self.pos[arrived] = self.target_pos[arrived]
+                self.cell[arrived] = self.target_cell[arrived]
+                self.moving[arrived] = False
+
+        # (2) animation cursors, all animated pieces at once (catching up on skipped frames)
+        animated = self.animated[:n] & self.batched[:n]
+        last = self.last_frame_ms[:n]
+        starting = np.flatnonzero(animated & (last == 0))
+        stepping = np.flatnonzero(animated & (last != 0) & (now_ms - last >= self.frame_ms[:n]))
+        if starting.size:
+            self.last_frame_ms[starting] = now_ms
+        if stepping.size:
+            steps = (now_ms - self.last_frame_ms[stepping]) // self.frame_ms[stepping]
+            idx = self.frame_idx[stepping] + steps
+            n_frames = self.n_frames[stepping]
+            self.frame_idx[stepping] = np.where(self.loop[stepping], idx % n_frames,
+                                                np.minimum(idx, n_frames - 1))
+            self.last_frame_ms[stepping] += steps * self.frame_ms[stepping]
+
+        # (3) write back only what changed
+        for row in going.tolist():
+            self._pieces[row].current_state.physics.pixel_pos = (float(self.pos[row, 0]), float(self.pos[row, 1]))
+        for row in arrived.tolist():
+            physics = self._pieces[row].current_state.physics
+            physics.cell = physics.target_cell
+            physics.pixel_pos = physics.target_pixel
+            physics.moving = False
+            changed.append(self._pieces[row])
+        for row in starting.tolist():
+            self._pieces[row].current_state.graphics.last_update_ms = now_ms
+        for row in stepping.tolist():
+            graphics = self._pieces[row].current_state.graphics
+            graphics.current_frame_idx = int(self.frame_idx[row])
+            graphics.img = graphics.frames[graphics.current_frame_idx]
+            graphics.last_update_ms = int(self.last_frame_ms[row])
+
+        # (4) pieces outside the vectorized physics fall back to the object path
+        for row in np.flatnonzero(~self.batched[:n]).tolist():
+            piece = self._pieces[row]
+            old_state = piece.current_state
+            piece.update(now_ms)
+            if piece.current_state is not old_state:
+                self.refresh(piece)
+            changed.append(piece)
+
+        # (5) auto-transitions, only for pieces that have one pending and did not just arrive
+        candidates = self.pending[:n] & ~self.moving[:n] & self.batched[:n]
+        if arrived.size:
+            candidates[arrived] = False
+        for row in np.flatnonzero(candidates).tolist():
+            piece = self._pieces[row]
+            next_state = piece.current_state.auto_transition(now_ms)
+            if next_state is not piece.current_state:
+                piece.current_state = next_state
+                self.refresh(piece)
+                changed.append(piece)
+        return changed
@@ -0,0 +1,133 @@
+import json
+import pathlib
+import time
+from typing import Callable, Dict, List, Optional
+
+# Each power of two of nanoseconds is split into SUB_BUCKETS buckets (12-25%
+# wide), from 1 ns up to 2**MAX_POW2 ns (~69 s); bigger samples land in
+# the last bucket, and `max` is tracked exactly.
+SUB_BITS = 2
+SUB_BUCKETS = 1 << SUB_BITS
+MAX_POW2 = 36
+N_BUCKETS = (MAX_POW2 + 1) * SUB_BUCKETS
+
+
+def _bucket(ns: int) -> int:
+    bits = ns.bit_length()
+    if bits <= SUB_BITS:
+        return ns
+    index = (bits - SUB_BITS) * SUB_BUCKETS + ((ns >> (bits - SUB_BITS - 1)) & (SUB_BUCKETS - 1))
+    return index if index < N_BUCKETS else N_BUCKETS - 1
+
+
+def _bucket_upper_ns(index: int) -> int:
+    """Largest sample that falls into bucket `index`."""
+    if index < SUB_BUCKETS:
+        return index
+    bits = index // SUB_BUCKETS + SUB_BITS
+    sub = index % SUB_BUCKETS
+    shift = bits - SUB_BITS - 1
+    return ((SUB_BUCKETS + sub + 1) << shift) - 1
+
+
+class PhaseHistogram:
+    """Fixed-size, log-bucketed histogram of durations in nanoseconds."""
+    def __init__(self):
+        self.buckets: List[int] = [0] * N_BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns: int):
+        self.buckets[_bucket(ns)] += 1
+        self.count += 1
+        self.total_ns += ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+
+    def percentile_ns(self, q: float) -> int:
+        """Upper bound of the bucket holding the `q` quantile (0..1); 0 when empty."""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(_bucket_upper_ns(index), self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_us": self.total_ns / self.count / 1e3 if self.count else 0.0,
+            "p50_us": self.percentile_ns(0.50) / 1e3,
+            "p95_us": self.percentile_ns(0.95) / 1e3,
+            "p99_us": self.percentile_ns(0.99) / 1e3,
+            "max_us": self.max_ns / 1e3,
+        }
+
+
+class Profiler:
+    """
+    Per-phase timers and counters for the game loop.
+
+    Game times each phase of a tick ("update", "input", "collisions") and of
+    a frame ("draw", "show") only when it was given a Profiler, so a game
+    without one pays a single `is None` check per phase. Use:
+
+        t0 = profiler.clock()
+        ... phase ...
+        profiler.record("draw", t0)
+
+    Counters ("commands", "captures", "frames_dropped", ...) are plain ints.
+    `report()` returns everything as a dict; `dump(path)` writes it as JSON;
+    with `on_report` and `report_every_ms`, `tick_report(now_ms)` (called by
+    Game.run once per loop pass) hands a report to the callback periodically.
+    """
+    clock = staticmethod(time.perf_counter_ns)
+
+    def __init__(self,
+                 on_report: Optional[Callable[[dict], None]] = None,
+                 report_every_ms: Optional[int] = None):
+        self.phases: Dict[str, PhaseHistogram] = {}
+        self.counters: Dict[str, int] = {}
+        self.on_report = on_report
+        self.report_every_ms = report_every_ms
+        self._next_report_ms: Optional[int] = None
+
+    def record(self, phase: str, start_ns: int):
+        """Record the time since `start_ns` (from `clock()`) under `phase`."""
+        elapsed = time.perf_counter_ns() - start_ns
+        hist = self.phases.get(phase)
+        if hist is None:
+            hist = self.phases[phase] = PhaseHistogram()
+        hist.record(elapsed)
+
+    def count(self, counter: str, n: int = 1):
+        self.counters[counter] = self.counters.get(counter, 0) + n
+
+    def set(self, counter: str, value: int):
+        self.counters[counter] = value
+
+    def report(self) -> dict:
+        return {"phases": {name: hist.summary() for name, hist in self.phases.items()},
+                "counters": dict(self.counters)}
+
+    def dump(self, path: pathlib.Path):
+        """Write `report()` as JSON."""
+        pathlib.Path(path).write_text(json.dumps(self.report(), indent=2))
+
+    def reset(self):
+        self.phases.clear()
+        self.counters.clear()
+
+    def tick_report(self, now_ms: int):
+        """Call `on_report(report())` every `report_every_ms` of game time."""
+        if self.on_report is None or self.report_every_ms is None:
+            return
+        if self._next_report_ms is None:
+            self._next_report_ms = now_ms + self.report_every_ms
+        elif now_ms >= self._next_report_ms:
+            self._next_report_ms = now_ms + self.report_every_ms
+            self.on_report(self.report())
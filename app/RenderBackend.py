@@ -0,0 +1,95 @@
+import pathlib
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.Board import Board
+from app.SharedFramebuffer import SharedFramebuffer, default_path
+
+
+class RenderBackend:
+    """
+    Where Game.run sends composited frames.
+
+    `present(frame)` receives the board as drawn this frame (the renderer
+    reuses its buffer, so copy the pixels to keep them) and returns False to
+    stop the game. A backend with `composites = False` gets no frames at all:
+    Game skips building and compositing them.
+    """
+    composites = True
+
+    def present(self, frame: Board) -> bool:
+        return True
+
+    def close(self):
+        """Called once when Game.run ends."""
+
+
+class CvWindowBackend(RenderBackend):
+    """Shows frames in an OpenCV window; ESC stops the game."""
+    def __init__(self, title: str = "Cong Fu Chess"):
+        self.title = title
+
+    def present(self, frame: Board) -> bool:
+        import cv2
+        cv2.imshow(self.title, frame.img.img)
+        key = cv2.waitKey(1)
+        if key == 27:  # ESC
+            return False
+        return True
+
+    def close(self):
+        import cv2
+        cv2.destroyAllWindows()
+
+
+class OffscreenBackend(RenderBackend):
+    """
+    Keeps the newest frame as a numpy array (a copy, owned by the backend
+    and overwritten by the next frame) and hands each one to
+    `on_frame(pixels, frame_no)` if given; recorders and streamers build on this.
+    """
+    def __init__(self, on_frame: Optional[Callable[[np.ndarray, int], None]] = None):
+        self.on_frame = on_frame
+        self.frame: Optional[np.ndarray] = None
+        self.frames = 0
+
+    def present(self, frame: Board) -> bool:
+        pixels = frame.img.img
+        if self.frame is None or self.frame.shape != pixels.shape:
+            self.frame = np.empty_like(pixels)
+        np.copyto(self.frame, pixels)
+        self.frames += 1
+        if self.on_frame is not None:
+            self.on_frame(self.frame, self.frames)
+        return True
+
+
+class NullBackend(RenderBackend):
+    """Renders nothing: for server-side games and benchmarks nobody watches."""
+    composites = False
+
+
+class SharedMemoryBackend(RenderBackend):
+    """
+    Writes frames into a SharedFramebuffer ring at `path` for viewer
+    processes (python -m app.SharedFramebuffer <path>); the game never
+    touches a GUI. The ring is created on the first frame (its shape is not
+    known before) and removed by close(); viewers wait for it to appear.
+    """
+    def __init__(self, path: Optional[pathlib.Path] = None, slots: int = 3):
+        self.path = pathlib.Path(path) if path is not None else default_path()
+        self.slots = slots
+        self.ring: Optional[SharedFramebuffer] = None
+
+    def present(self, frame: Board) -> bool:
+        pixels = frame.img.img
+        if self.ring is None:
+            self.ring = SharedFramebuffer(pixels.shape, self.slots, self.path)
+        self.ring.write(pixels)
+        return True
+
+    def close(self):
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
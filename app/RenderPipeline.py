@@ -0,0 +1,108 @@
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from app.Board import Board
+from app.LayeredRenderer import LayeredRenderer, SpriteDraw, CursorDraw
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """
+    Everything needed to draw one frame, and nothing mutable: sprites refer
+    to the shared read-only frame images, positions and cursors are copied.
+    """
+    seq: int
+    time_ms: int
+    sprites: Tuple[SpriteDraw, ...]
+    cursors: Tuple[CursorDraw, ...]
+
+
+class SnapshotBuffer:
+    """
+    Latest-value mailbox handing FrameSnapshots from the game loop to the
+    render thread.
+
+    It holds at most one snapshot. `publish()` replaces it without waiting
+    for the consumer, and `take()` removes it, so the render thread always
+    gets the newest snapshot. A snapshot replaced before it was taken
+    counts as dropped.
+    """
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._ready: Optional[FrameSnapshot] = None
+        self._closed = False
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, snapshot: FrameSnapshot):
+        with self._cond:
+            if self._ready is not None:
+                self.dropped += 1
+            self._ready = snapshot
+            self.published += 1
+            self._cond.notify()
+
+    def take(self, timeout: Optional[float] = None) -> Optional[FrameSnapshot]:
+        """Return the newest unseen snapshot, waiting up to `timeout` seconds; None if none/closed."""
+        with self._cond:
+            if self._ready is None and not self._closed:
+                self._cond.wait(timeout)
+            snapshot, self._ready = self._ready, None
+            return snapshot
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+class RenderThread(threading.Thread):
+    """
+    Composites and presents the latest snapshot on its own thread, so a slow
+    frame (compositing, cv2.imshow) never delays the simulation.
+    `present(frame)` returns False to ask the game to stop (e.g. ESC pressed).
+    """
+    def __init__(self, renderer: LayeredRenderer, buffer: SnapshotBuffer,
+                 present: Callable[[Board], bool], profiler=None):
+        super().__init__(name="render", daemon=True)
+        self.renderer = renderer
+        self.buffer = buffer
+        self.present = present
+        self.profiler = profiler    # records "draw" and "show" from this thread
+        self.frames = 0
+        self.last_seq = -1
+        self.stop_requested = threading.Event()
+        self.error: Optional[BaseException] = None
+
+    def run(self):
+        try:
+            while not self.buffer.closed:
+                snapshot = self.buffer.take(timeout=0.1)
+                if snapshot is None or snapshot.seq <= self.last_seq:
+                    continue
+                prof = self.profiler
+                t0 = prof.clock() if prof is not None else 0
+                frame = self.renderer.render(snapshot.sprites, snapshot.cursors)
+                if prof is not None:
+                    prof.record("draw", t0)
+                    t0 = prof.clock()
+                self.last_seq = snapshot.seq
+                self.frames += 1
+                shown = self.present(frame)
+                if prof is not None:
+                    prof.record("show", t0)
+                if not shown:
+                    self.stop_requested.set()
+                    break
+        except BaseException as exc:  # surface render failures to the game loop
+            self.error = exc
+            self.stop_requested.set()
+
+    def stop(self, timeout: float = 1.0):
+        self.buffer.close()
+        self.join(timeout)
@@ -0,0 +1,237 @@
+"""
+Ring of framebuffers in shared memory, written by a game and read by any
+number of viewer processes.
+
+    python -m app.SharedFramebuffer /dev/shm/cfchess.fb     # show a running game
+
+The ring is an mmap'd file (on /dev/shm, i.e. RAM, by default): a header,
+one small record per slot and the slots' pixels. The producer writes frame
+n into slot n % slots under a per-slot seqlock: the slot's sequence number
+is odd while it is being written and bumped to the next even value when
+done, then the header's `latest` is set to n. A reader takes the newest
+slot, notes its sequence number, uses the pixels in place and checks the
+number again; if it changed the frame was overwritten meanwhile and is
+dropped. Readers never write to the ring, so they never slow the producer
+or each other.
+"""
+import argparse
+import mmap
+import os
+import pathlib
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+MAGIC = 0x3142464643        # "CFFB1"
+_HEADER_WORDS = 8           # magic, slots, height, width, channels, latest, closed, spare
+_MAGIC, _SLOTS, _H, _W, _C, _LATEST, _CLOSED = range(7)
+_SLOT_WORDS = 4             # seq, frame_no, time_ms, spare
+_SEQ, _FRAME_NO, _TIME_MS = range(3)
+_ALIGN = 64
+
+
+def default_path() -> pathlib.Path:
+    shm = pathlib.Path("/dev/shm")
+    root = shm if shm.is_dir() else pathlib.Path(tempfile.gettempdir())
+    return root / f"cfchess-{os.getpid()}.fb"
+
+
+def _layout(slots: int, shape: Tuple[int, int, int]) -> Tuple[int, int, int]:
+    """(offset of the slot records, offset of the pixels, total size)."""
+    meta = _HEADER_WORDS * 8
+    pixels = meta + slots * _SLOT_WORDS * 8
+    pixels += -pixels % _ALIGN
+    frame = int(np.prod(shape))
+    frame += -frame % _ALIGN
+    return meta, pixels, pixels + slots * frame
+
+
+class _Ring:
+    """Numpy views over a mapped ring."""
+    def __init__(self, mapping: mmap.mmap, slots: int, shape: Tuple[int, int, int]):
+        meta, pixels, _ = _layout(slots, shape)
+        stride = int(np.prod(shape))
+        stride += -stride % _ALIGN
+        self.mapping = mapping
+        self.slots = slots
+        self.shape = shape
+        self.header = np.ndarray((_HEADER_WORDS,), np.uint64, buffer=mapping)
+        self.meta = np.ndarray((slots, _SLOT_WORDS), np.uint64, buffer=mapping, offset=meta)
+        self.pixels = np.ndarray((slots, *shape), np.uint8, buffer=mapping, offset=pixels,
+                                 strides=(stride, *np.empty(shape, np.uint8).strides))
+
+    def release(self):
+        self.header = self.meta = self.pixels = None
+        try:
+            self.mapping.close()
+        except BufferError:
+            pass  # a caller still holds a frame view; unmapped when it goes
+
+
+class SharedFramebuffer:
+    """Producer side of the ring: `write()` each composited frame."""
+    def __init__(self, shape: Tuple[int, ...], slots: int = 3, path: Optional[pathlib.Path] = None):
+        if len(shape) == 2:
+            shape = (*shape, 1)
+        self.path = pathlib.Path(path) if path is not None else default_path()
+        self.shape = tuple(int(n) for n in shape)
+        _, _, size = _layout(slots, self.shape)
+        with open(self.path, "w+b") as f:
+            f.truncate(size)
+            mapping = mmap.mmap(f.fileno(), size)
+        self._ring = _Ring(mapping, slots, self.shape)
+        header = self._ring.header
+        header[_SLOTS], header[_H], header[_W], header[_C] = slots, *self.shape
+        header[_MAGIC] = MAGIC      # last: readers only trust a ring with its magic set
+        self._seqs = [0] * slots    # the producer is the only writer, so it keeps the counters
+        self.frames = 0
+
+    def write(self, pixels: np.ndarray, time_ms: Optional[int] = None) -> int:
+        """Copy `pixels` into the next slot and publish it; returns its frame number."""
+        ring = self._ring
+        self.frames += 1
+        slot = self.frames % ring.slots
+        meta = ring.meta[slot]
+        seq = self._seqs[slot]
+        meta[_SEQ] = seq + 1                # odd: slot is being written
+        np.copyto(ring.pixels[slot], pixels.reshape(self.shape))
+        meta[_FRAME_NO] = self.frames
+        meta[_TIME_MS] = time_ms if time_ms is not None else time.monotonic_ns() // 1_000_000
+        meta[_SEQ] = self._seqs[slot] = seq + 2     # even: slot is stable
+        ring.header[_LATEST] = self.frames
+        return self.frames
+
+    def close(self):
+        """Tell readers the game is over and remove the ring."""
+        if self._ring is None:
+            return
+        self._ring.header[_CLOSED] = 1
+        self._ring.release()
+        self._ring = None
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+@dataclass
+class SharedFrame:
+    """A frame read in place; `pixels` is a view into the ring, valid while `reader.valid(frame)`."""
+    frame_no: int
+    time_ms: int
+    pixels: np.ndarray
+    slot: int
+    seq: int
+
+
+class SharedFramebufferReader:
+    """Consumer side of the ring; any number may attach to the same path."""
+    def __init__(self, path: pathlib.Path):
+        self.path = pathlib.Path(path)
+        with open(self.path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        header = np.ndarray((_HEADER_WORDS,), np.uint64, buffer=mapping)
+        if header[_MAGIC] != MAGIC:
+            mapping.close()
+            raise ValueError(f"{self.path} is not a framebuffer ring")
+        slots = int(header[_SLOTS])
+        shape = (int(header[_H]), int(header[_W]), int(header[_C]))
+        del header
+        self._ring = _Ring(mapping, slots, shape)
+        self.shape = shape
+        self.torn = 0           # frames dropped because the producer overwrote them mid-read
+
+    @classmethod
+    def wait(cls, path: pathlib.Path, timeout: Optional[float] = None,
+             poll_s: float = 0.05) -> "SharedFramebufferReader":
+        """
+        Attach to the ring at `path`, waiting for the producer to create it
+        (the ring appears with the game's first frame). Raises TimeoutError
+        after `timeout` seconds (None: wait forever).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return cls(path)
+            except (FileNotFoundError, ValueError):
+                # Not created yet, still empty, or its magic not written yet.
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(f"No framebuffer ring at {path} after {timeout}s")
+                time.sleep(poll_s)
+
+    @property
+    def closed(self) -> bool:
+        return bool(self._ring.header[_CLOSED])
+
+    @property
+    def latest(self) -> int:
+        """Number of the newest published frame (0 before the first)."""
+        return int(self._ring.header[_LATEST])
+
+    def peek(self, retries: int = 3) -> Optional[SharedFrame]:
+        """The newest frame, in place (no copy); None if there is none yet."""
+        ring = self._ring
+        for _ in range(retries):
+            frame_no = int(ring.header[_LATEST])
+            if frame_no == 0:
+                return None
+            slot = frame_no % ring.slots
+            seq = int(ring.meta[slot, _SEQ])
+            if seq % 2 == 0 and int(ring.meta[slot, _FRAME_NO]) == frame_no:
+                frame = SharedFrame(frame_no, int(ring.meta[slot, _TIME_MS]), ring.pixels[slot], slot, seq)
+                if self.valid(frame):
+                    return frame
+            self.torn += 1
+        return None
+
+    def valid(self, frame: SharedFrame) -> bool:
+        """True if `frame`'s slot was not rewritten since it was peeked."""
+        return int(self._ring.meta[frame.slot, _SEQ]) == frame.seq
+
+    def read(self, out: Optional[np.ndarray] = None, retries: int = 3) -> Optional[Tuple[int, np.ndarray]]:
+        """Copy the newest consistent frame into `out` (allocated if None): (frame_no, out) or None."""
+        for _ in range(retries):
+            frame = self.peek(retries)
+            if frame is None:
+                return None
+            if out is None:
+                out = np.empty(self.shape, np.uint8)
+            np.copyto(out, frame.pixels)
+            if self.valid(frame):
+                return frame.frame_no, out
+            self.torn += 1
+        return None
+
+    def close(self):
+        self._ring.release()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=pathlib.Path, help="ring written by SharedMemoryBackend")
+    parser.add_argument("--title", default="Cong Fu Chess (viewer)")
+    args = parser.parse_args(argv)
+    import cv2
+    reader = SharedFramebufferReader.wait(args.path)
+    out = np.empty(reader.shape, np.uint8)
+    shown = 0
+    try:
+        while not reader.closed:
+            if reader.latest != shown:
+                got = reader.read(out)        # only frames that passed the seqlock check
+                if got is not None:
+                    shown = got[0]
+                    cv2.imshow(args.title, out)
+            if cv2.waitKey(5) == 27:  # ESC
+                break
+    finally:
+        reader.close()
+        cv2.destroyAllWindows()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
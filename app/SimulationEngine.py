@@ -0,0 +1,107 @@
+import heapq
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from app.Clock import VirtualClock
+from app.Command import Command
+from app.Game import Game
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of a headless run."""
+    ticks: int
+    game_time_ms: int
+    wall_time_s: float
+    winner: Optional[str]
+    finished: bool          # True if the game ended (a king was captured)
+
+
+class SimulationEngine:
+    """
+    Runs a Game headless at fixed time steps on a virtual clock.
+
+    Each tick advances the clock by `tick_ms`, hands every Command whose
+    timestamp has been reached to the game's input queue and calls
+    `Game.tick` (the same piece update, input processing and capture
+    resolution as the live loop). Nothing is rendered and nothing waits on
+    the wall clock, so games run as fast as the CPU allows.
+    """
+    def __init__(self, game: Game, tick_ms: int = 10):
+        if not isinstance(game.clock, VirtualClock):
+            raise ValueError("SimulationEngine needs a Game created with a VirtualClock.")
+        if tick_ms <= 0:
+            raise ValueError("tick_ms must be positive.")
+        self.game = game
+        self.clock: VirtualClock = game.clock
+        self.tick_ms = tick_ms
+        self.ticks = 0
+        self._pending: List[Tuple[int, int, Command]] = []
+        self._seq = itertools.count()
+        self._started = False
+
+    def start(self):
+        """Reset every piece to Idle at the current virtual time."""
+        self.game.reset_pieces(self.clock.now_ms())
+        self._started = True
+
+    def submit(self, cmd: Command):
+        """Schedule a Command; it is applied on the first tick at or after its timestamp."""
+        heapq.heappush(self._pending, (cmd.timestamp, next(self._seq), cmd))
+
+    def submit_all(self, commands: Iterable[Command]):
+        for cmd in commands:
+            self.submit(cmd)
+
+    def step(self) -> bool:
+        """Advance one tick. Returns False once the game is over."""
+        if not self._started:
+            self.start()
+        if self.game._is_win():
+            return False
+        now = self.clock.advance(self.tick_ms)
+        while self._pending and self._pending[0][0] <= now:
+            self.game.user_input_queue.put(heapq.heappop(self._pending)[2])
+        self.game.tick(now)
+        self.ticks += 1
+        return not self.game._is_win()
+
+    def is_settled(self) -> bool:
+        """True when no Command is pending and every piece is back in Idle."""
+        if self._pending or not self.game.user_input_queue.empty():
+            return False
+        return all(getattr(p.current_state.physics, "next_state_when_finished", None) is None
+                   for p in self.game.pieces)
+
+    def run(self,
+            commands: Iterable[Command] = (),
+            max_ms: Optional[int] = None,
+            max_ticks: Optional[int] = None) -> SimulationResult:
+        """
+        Feed `commands` and tick until the game ends, `max_ms` of game time
+        has passed, or `max_ticks` ticks have run. With no limit, stops once
+        the game ends or every command has been applied and played out.
+        """
+        self.submit_all(commands)
+        start_ms = self.clock.now_ms()
+        start_wall = time.perf_counter()
+        ticks = 0
+        while True:
+            if max_ticks is not None and ticks >= max_ticks:
+                break
+            if max_ms is not None and self.clock.now_ms() - start_ms >= max_ms:
+                break
+            if max_ms is None and max_ticks is None and self._started and self.is_settled():
+                break
+            if not self.step():
+                break
+            ticks += 1
+        return SimulationResult(
+            ticks=ticks,
+            game_time_ms=self.clock.now_ms(),
+            wall_time_s=time.perf_counter() - start_wall,
+            winner=self.game.winner(),
+            finished=self.game._is_win(),
+        )
@@ -0,0 +1,164 @@
+import struct
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from app.PieceStore import STATE_IDS
+
+# ─── message format ─────────────────────────────────────────────────────────
+# header:   kind (b"K" keyframe | b"D" delta), seq (uint32), game time (uint32)
+# keyframe: piece table (uint16 count, then uint8 length + utf-8 id each),
+#           row count (uint16), rows
+# delta:    row count (uint16), rows, removed count (uint16), removed piece indexes (uint16)
+# row:      piece index (uint16), cell (uint16, row << 8 | col), state id (uint8),
+#           target cell (uint16), move start (uint32), move duration (uint32, 0 = not moving)
+KEYFRAME, DELTA = b"K", b"D"
+_HEADER = struct.Struct("<cII")
+_COUNT = struct.Struct("<H")
+_ROW = struct.Struct("<HHBHII")
+_U8 = struct.Struct("<B")
+
+Row = Tuple[int, int, int, int, int]     # cell, state id, target cell, move start, move duration
+
+
+def _cell(cell) -> int:
+    return (int(cell[0]) << 8) | int(cell[1])
+
+
+def piece_row(piece) -> Row:
+    """The spectator-visible state of `piece`: where it is, what it does and where it is going."""
+    state = piece.current_state
+    physics = state.physics
+    cell = _cell(physics.cell)
+    if getattr(physics, "moving", False):
+        return (cell, STATE_IDS.get(state.name, 0xFF), _cell(physics.target_cell),
+                int(physics.start_time) & 0xFFFFFFFF, max(int(physics.duration_ms), 1))
+    return (cell, STATE_IDS.get(state.name, 0xFF), cell, 0, 0)
+
+
+class SpectatorFeed:
+    """
+    Encodes a game as a stream of keyframes and deltas for spectators.
+
+    `next(game)` diffs the game's logical state (cells, states, captures
+    and the start/duration of moves in flight) against what was last sent
+    and returns only the changes, or None if nothing changed; every
+    `keyframe_every` messages it sends the full state instead. Spectators
+    interpolate moves themselves (see SpectatorView), so the feed does not
+    depend on how often anyone renders, and one encoded message is shared
+    by every spectator. `keyframe()` re-encodes the last sent state for a
+    late joiner, who can then apply the following deltas.
+    """
+    def __init__(self, piece_ids: List[str], keyframe_every: int = 100):
+        self.piece_ids = list(piece_ids)
+        self.index = {pid: i for i, pid in enumerate(self.piece_ids)}
+        self.keyframe_every = keyframe_every
+        self.seq = 0
+        self.time_ms = 0
+        self._rows: Dict[int, Row] = {}
+        self._since_keyframe = 0
+        self._table = _COUNT.pack(len(self.piece_ids)) + b"".join(
+            _U8.pack(len(raw)) + raw for raw in (pid.encode("utf-8") for pid in self.piece_ids))
+        self.bytes_sent = 0
+
+    def next(self, game) -> Optional[bytes]:
+        """Encode the changes since the previous message (or a keyframe when one is due)."""
+        index = self.index
+        rows = {index[p.piece_id]: piece_row(p) for p in game.pieces}
+        keyframe_due = self.seq == 0 or self._since_keyframe + 1 >= self.keyframe_every
+        if rows == self._rows and not keyframe_due:
+            return None
+        previous, self._rows = self._rows, rows
+        self.seq += 1
+        self.time_ms = game.game_time_ms() & 0xFFFFFFFF
+        if keyframe_due:
+            self._since_keyframe = 0
+            message = self.keyframe()
+        else:
+            self._since_keyframe += 1
+            changed = [(i, row) for i, row in rows.items() if previous.get(i) != row]
+            removed = [i for i in previous if i not in rows]
+            message = (_HEADER.pack(DELTA, self.seq, self.time_ms)
+                       + _COUNT.pack(len(changed)) + b"".join(_ROW.pack(i, *row) for i, row in changed)
+                       + _COUNT.pack(len(removed)) + b"".join(_COUNT.pack(i) for i in removed))
+        self.bytes_sent += len(message)
+        return message
+
+    def keyframe(self) -> bytes:
+        """The full state of the last message, with its sequence number."""
+        return (_HEADER.pack(KEYFRAME, self.seq, self.time_ms) + self._table
+                + _COUNT.pack(len(self._rows)) + b"".join(_ROW.pack(i, *row) for i, row in self._rows.items()))
+
+
+@dataclass
+class PieceView:
+    cell: Tuple[int, int]
+    state: int
+    target: Tuple[int, int]
+    move_start: int
+    move_duration: int
+
+    def position(self, now_ms: int) -> Tuple[float, float]:
+        """(row, col) of the piece at `now_ms`, interpolating a move in flight."""
+        if not self.move_duration:
+            return (float(self.cell[0]), float(self.cell[1]))
+        t = min(max((now_ms - self.move_start) / self.move_duration, 0.0), 1.0)
+        return (self.cell[0] + (self.target[0] - self.cell[0]) * t,
+                self.cell[1] + (self.target[1] - self.cell[1]) * t)
+
+
+class SpectatorView:
+    """
+    Client-side mirror of a SpectatorFeed. Deltas are applied only in
+    sequence; after a gap the view waits for the next keyframe.
+    """
+    def __init__(self):
+        self.piece_ids: List[str] = []
+        self.pieces: Dict[str, PieceView] = {}
+        self.seq = 0
+        self.time_ms = 0
+        self.synced = False
+        self.gaps = 0
+
+    def apply(self, message: bytes) -> bool:
+        """Apply one feed message; returns False if it was skipped (out of sync)."""
+        kind, seq, time_ms = _HEADER.unpack_from(message, 0)
+        offset = _HEADER.size
+        if kind == KEYFRAME:
+            (n,) = _COUNT.unpack_from(message, offset)
+            offset += _COUNT.size
+            ids = []
+            for _ in range(n):
+                (length,) = _U8.unpack_from(message, offset)
+                ids.append(message[offset + 1:offset + 1 + length].decode("utf-8"))
+                offset += 1 + length
+            self.piece_ids = ids
+            self.pieces = {}
+            offset = self._read_rows(message, offset)
+            self.synced = True
+        elif kind == DELTA:
+            if not self.synced or seq <= self.seq:
+                return False
+            if seq != self.seq + 1:
+                self.synced = False
+                self.gaps += 1
+                return False
+            offset = self._read_rows(message, offset)
+            (n,) = _COUNT.unpack_from(message, offset)
+            offset += _COUNT.size
+            for k in range(n):
+                (i,) = _COUNT.unpack_from(message, offset + k * _COUNT.size)
+                self.pieces.pop(self.piece_ids[i], None)
+        else:
+            raise ValueError(f"Unknown feed message kind {kind!r}.")
+        self.seq, self.time_ms = seq, time_ms
+        return True
+
+    def _read_rows(self, message: bytes, offset: int) -> int:
+        (n,) = _COUNT.unpack_from(message, offset)
+        offset += _COUNT.size
+        for _ in range(n):
+            i, cell, state, target, start, duration = _ROW.unpack_from(message, offset)
+            offset += _ROW.size
+            self.pieces[self.piece_ids[i]] = PieceView((cell >> 8, cell & 0xFF), state,
+                                                       (target >> 8, target & 0xFF), start, duration)
+        return offset
@@ -0,0 +1,142 @@
+import pathlib
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from app.AssetCache import AssetCache, asset_cache
+from app.Img import Img
+
+
+def _to_bgra(pixels: np.ndarray) -> np.ndarray:
+    import cv2
+    if pixels.ndim == 2:
+        return cv2.cvtColor(pixels, cv2.COLOR_GRAY2BGRA)
+    if pixels.shape[2] == 3:
+        return cv2.cvtColor(pixels, cv2.COLOR_BGR2BGRA)
+    return pixels
+
+
+@dataclass(frozen=True)
+class AtlasHandle:
+    """Picklable reference to a published atlas; pass it to SpriteAtlas.attach."""
+    shm_name: str
+    shape: Tuple[int, ...]
+    cell_size: Tuple[int, int]
+    index: Dict[Tuple[str, str], Tuple[int, int]]
+    source: Optional[str] = None
+
+
+class SpriteAtlas:
+    """
+    Every sprite frame of a pieces/ tree for one cell size, in one contiguous
+    (frames, h, w, 4) BGRA array, with an index from (piece type, state) to
+    its run of frames.
+
+    `publish()` moves the array into shared memory and returns a handle that
+    worker processes `attach()` to without copying; `install()` then serves
+    the frames from the process-wide asset cache, so Graphics built in that
+    process share the one mapping. An AssetPack file is the other way to
+    share an atlas: its frame array is an mmap of the page cache
+    (`AssetPack.atlas()`).
+
+    `source` is the resolved pieces root the atlas was decoded from (None
+    if unknown); `serves(root)` tells whether it may stand in for a tree.
+
+    The publisher owns the shared block and `close()`s it (unlinking it)
+    once every worker is done.
+    """
+    def __init__(self, frames: np.ndarray,
+                 index: Dict[Tuple[str, str], Tuple[int, int]],
+                 cell_size: Tuple[int, int],
+                 source: Optional[str] = None):
+        self.frames = frames
+        self.index = index
+        self.cell_size = tuple(cell_size)
+        self.source = source
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._owner = False
+
+    @classmethod
+    def from_tree(cls, pieces_root: pathlib.Path, cell_size: Tuple[int, int] = (100, 100)) -> "SpriteAtlas":
+        """Decode and resize every `<type>/states/<state>/sprites/*.png` under `pieces_root`."""
+        pieces_root = pathlib.Path(pieces_root)
+        frames, index = [], {}
+        for sprites_dir in sorted(pieces_root.glob("*/states/*/sprites")):
+            start = len(frames)
+            for file in sorted(sprites_dir.glob("*.png")):
+                frames.append(_to_bgra(Img().read(file, cell_size).img))
+            index[(sprites_dir.parent.parent.parent.name, sprites_dir.parent.name)] = (start, len(frames) - start)
+        w, h = cell_size
+        array = np.stack(frames) if frames else np.zeros((0, h, w, 4), dtype=np.uint8)
+        array.flags.writeable = False
+        return cls(array, index, cell_size, str(pieces_root.resolve()))
+
+    def serves(self, pieces_root: pathlib.Path) -> bool:
+        """True if the atlas was built from `pieces_root`."""
+        return self.source is not None and str(pathlib.Path(pieces_root).resolve()) == self.source
+
+    @property
+    def nbytes(self) -> int:
+        return self.frames.nbytes
+
+    def frames_of(self, p_type: str, state: str) -> np.ndarray:
+        """The frames of one piece state, as a view into the atlas."""
+        start, count = self.index[(p_type, state)]
+        return self.frames[start:start + count]
+
+    def frame(self, p_type: str, state: str, i: int) -> np.ndarray:
+        start, count = self.index[(p_type, state)]
+        if not 0 <= i < count:
+            raise IndexError(f"{p_type}/{state} has {count} frames, not {i + 1}")
+        return self.frames[start + i]
+
+    def publish(self) -> AtlasHandle:
+        """Copy the atlas into a new shared memory block (once) and return its handle."""
+        if self._shm is None:
+            shm = shared_memory.SharedMemory(create=True, size=max(self.nbytes, 1))
+            shared = np.ndarray(self.frames.shape, dtype=np.uint8, buffer=shm.buf)
+            shared[...] = self.frames
+            shared.flags.writeable = False
+            self.frames, self._shm, self._owner = shared, shm, True
+        return AtlasHandle(self._shm.name, self.frames.shape, self.cell_size, dict(self.index), self.source)
+
+    @classmethod
+    def attach(cls, handle: AtlasHandle) -> "SpriteAtlas":
+        """Map an atlas published by another process (zero-copy, read-only)."""
+        shm = shared_memory.SharedMemory(name=handle.shm_name)
+        frames = np.ndarray(handle.shape, dtype=np.uint8, buffer=shm.buf)
+        frames.flags.writeable = False
+        atlas = cls(frames, handle.index, handle.cell_size, handle.source)
+        atlas._shm = shm
+        return atlas
+
+    def install(self, pieces_root: pathlib.Path, cache: AssetCache = asset_cache):
+        """
+        Serve the frames of `<pieces_root>/<type>/states/<state>/sprites` from
+        the atlas. Blend planes are built on the first `draw_on`, so headless
+        processes never allocate per-frame copies.
+        """
+        pieces_root = pathlib.Path(pieces_root)
+        for (p_type, state), (start, count) in self.index.items():
+            imgs = []
+            for i in range(start, start + count):
+                img = Img()
+                img.img = self.frames[i]
+                imgs.append(img)
+            cache.put_frames(pieces_root / p_type / "states" / state / "sprites",
+                             self.cell_size, None, tuple(imgs))
+
+    def close(self):
+        """Detach from shared memory; the publisher also frees the block."""
+        if self._shm is None:
+            return
+        shm, self._shm = self._shm, None
+        self.frames = None
+        try:
+            shm.close()
+        except BufferError:
+            pass  # frames still referenced (e.g. by the asset cache); unmapped when they go
+        if self._owner:
+            shm.unlink()
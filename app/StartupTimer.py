@@ -0,0 +1,29 @@
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+
+class StartupTimer:
+    """
+    Wall-clock time of each startup phase ("imports", "layout", "board",
+    "pieces", ...), in the order they ran. GameFactory.create fills in the
+    asset phases when given a timer; main.py times its own imports.
+    """
+    def __init__(self):
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def total_s(self) -> float:
+        return sum(self.phases.values())
+
+    def report(self) -> str:
+        lines = [f"{name:<10}{seconds * 1e3:8.1f} ms" for name, seconds in self.phases.items()]
+        lines.append(f"{'total':<10}{self.total_s() * 1e3:8.1f} ms")
+        return "\n".join(lines)
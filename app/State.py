@@ -1,3 +1,4 @@
+import math
 from app.Moves import Moves
 from app.Graphics import Graphics
 from app.Physics import Physics
@@ -7,8 +8,10 @@ from app.Physics import notation_to_cell
 
 
 class State:
-    def __init__(self, moves: Moves, graphics: Graphics, physics: Physics):
-        """Initialize state with moves, graphics, and physics components."""
+    def __init__(self, moves: Moves, graphics: Graphics, physics: Physics, name: Optional[str] = None):
+        """Initialize state with moves, graphics, and physics components.
+        `name` is the state's folder name ("idle", "move", ...)."""
+        self.name = name
         self.moves = moves
         self.graphics = graphics
         self.physics = physics
@@ -48,21 +51,64 @@ class State:
             
             if not self.is_move_legal(dest):
                 # Illegal move: do not change state.
-                print(f"[DEBUG] Move to {dest} is illegal. Staying in current state.")
                 return self
         if event in self.transitions:
-            next_state = self.transitions[event].clone()
-            # Update position in the cloned state's physics to the current state's position.
+            # Transition targets are preallocated per piece; the caller resets
+            # them with the command, so only the position has to be carried over.
+            next_state = self.transitions[event]
             next_state.physics.cell = self.physics.cell
+            next_state.physics.pixel_pos = self.physics.get_pos()
             return next_state
         return self
 
     def update(self, now_ms: int) -> "State":
         """Update the state based on game time, and auto-transition if appropriate."""
         # Update physics and graphics components.
+        was_moving = getattr(self.physics, "moving", False)
         self.physics.update(now_ms)
         self.graphics.update(now_ms)
-        
+        if was_moving and not self.physics.moving:
+            # Arrived this tick: stay in the moving state until captures on the
+            # destination cell have been resolved.
+            return self
+        return self.auto_transition(now_ms)
+
+    MIN_DELAY_MS = 300  # minimal time in a state before an auto-transition
+
+    def next_deadline(self, now_ms: int) -> Optional[int]:
+        """
+        Earliest game time at which `update` may switch states, or None if this
+        state never auto-transitions (Idle). Used by the TimerScheduler so that
+        pieces are only polled when something can actually happen.
+        """
+        if getattr(self.physics, "next_state_when_finished", None) is None:
+            return None
+        if getattr(self.physics, "moving", False):
+            # Arrival; the transition itself is checked on the following wake.
+            return math.ceil(self.physics.start_time + self.physics.duration_ms)
+        deadline = self.command_start_time + self.MIN_DELAY_MS
+        if not self.graphics.loop and self.graphics.frames and \
+                self.graphics.current_frame_idx < len(self.graphics.frames) - 1:
+            if self.graphics.fps <= 0:
+                return None  # the last frame is never reached
+            last_frame = self.graphics.last_frame_deadline()
+            if last_frame is None:
+                return now_ms  # animation not started yet: wake on the next tick
+            deadline = max(deadline, last_frame)
+        return deadline
+
+    def advance_visuals(self, now_ms: int):
+        """
+        Advance the animation and any in-flight move interpolation for drawing,
+        without completing a move or switching states (that is left to `update`).
+        """
+        self.graphics.update(now_ms)
+        physics = self.physics
+        if getattr(physics, "moving", False) and now_ms < physics.start_time + physics.duration_ms:
+            physics.update(now_ms)
+
+    def auto_transition(self, now_ms: int) -> "State":
+        """Return the state to switch to if this one has completed its action, else self."""
         # Determine if this state has completed its action.
         # When loop is False, we consider the state complete if the last frame is shown.
         # Otherwise (if loop is True) we allow for a minimal delay.
@@ -77,8 +123,7 @@ class State:
         if state_complete:
             next_event = self.physics.next_state_when_finished
             if next_event is not None:
-                min_delay = 300  # milliseconds minimal delay before transition
-                if now_ms - self.command_start_time < min_delay:
+                if now_ms - self.command_start_time < self.MIN_DELAY_MS:
                     return self
                 # If expected transition is missing, fall back to Idle.
                 if next_event not in self.transitions:
@@ -111,13 +156,29 @@ class State:
         new_state = State(
             self.moves, 
             self.graphics.clone(), 
-            self.physics.clone()
+            self.physics.clone(),
+            self.name
         )
         new_state.transitions = self.transitions.copy()  
         new_state.current_command = self.current_command
         new_state.command_start_time = self.command_start_time
         return new_state
 
+    def snapshot(self) -> tuple:
+        """Return this state's mutable data as plain tuples: name, command, physics and animation cursor."""
+        cmd = self.current_command
+        cmd_data = None if cmd is None else (cmd.timestamp, cmd.piece_id, cmd.type, tuple(cmd.params))
+        return (self.name, self.command_start_time, cmd_data,
+                self.physics.snapshot(), self.graphics.snapshot())
+
+    def restore(self, data: tuple):
+        """Load a `snapshot()` taken from a state with the same name."""
+        _, self.command_start_time, cmd_data, physics, graphics = data
+        self.current_command = None if cmd_data is None else \
+            Command(cmd_data[0], cmd_data[1], cmd_data[2], list(cmd_data[3]))
+        self.physics.restore(physics)
+        self.graphics.restore(graphics)
+
     def is_move_legal(self, dest: tuple) -> bool:
         """
         Check if a move to the destination cell is legal for the current piece,
@@ -127,9 +188,10 @@ class State:
         """
         if not hasattr(self, 'moves') or self.moves is None:
             return False
-        pos_x, pos_y = self.physics.cell
-        
-        possible_moves = self.moves.get_moves(pos_x, pos_y)
-        print("dest ===========" , dest, "position======", (pos_x, pos_y))
-        print(possible_moves)
-        return dest in possible_moves
\ No newline at end of file
+        return self.moves.is_legal(tuple(self.physics.cell), tuple(dest))
+
+    def legal_targets(self) -> frozenset:
+        """Return every legal destination from the current cell (shared table, do not mutate)."""
+        if self.moves is None:
+            return frozenset()
+        return self.moves.legal_targets(*self.physics.cell)
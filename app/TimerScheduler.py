@@ -0,0 +1,52 @@
+import heapq
+import itertools
+from typing import Dict, List, Optional
+
+
+class TimerScheduler:
+    """
+    Min-heap of per-piece deadlines in game time.
+
+    Each piece has at most one live deadline: scheduling it again replaces
+    the previous one (stale heap entries are skipped lazily when popped).
+    `pop_due(now)` returns only the pieces whose deadline has passed, so the
+    game loop never looks at pieces that have nothing to do.
+    """
+    def __init__(self):
+        self._heap: List[tuple] = []
+        self._live: Dict[int, int] = {}    # id(piece) -> sequence number of its live entry
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def schedule(self, piece, deadline_ms: int):
+        """Wake `piece` at `deadline_ms`, replacing any earlier deadline."""
+        seq = next(self._seq)
+        self._live[id(piece)] = seq
+        heapq.heappush(self._heap, (deadline_ms, seq, piece))
+
+    def cancel(self, piece):
+        """Forget the deadline of `piece`, if any."""
+        self._live.pop(id(piece), None)
+
+    def _is_live(self, entry: tuple) -> bool:
+        return self._live.get(id(entry[2])) == entry[1]
+
+    def pop_due(self, now_ms: int) -> list:
+        """Remove and return every piece whose deadline is <= `now_ms`, earliest first."""
+        due = []
+        heap = self._heap
+        while heap and heap[0][0] <= now_ms:
+            entry = heapq.heappop(heap)
+            if self._is_live(entry):
+                del self._live[id(entry[2])]
+                due.append(entry[2])
+        return due
+
+    def next_deadline(self) -> Optional[int]:
+        """Return the earliest live deadline, or None when nothing is scheduled."""
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
@@ -1,5 +1,5 @@
 # mock_img.py
-from Img import Img
+from app.Img import Img
 
 class MockImg(Img):
     """Headless Img that just records calls."""
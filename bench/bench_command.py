@@ -0,0 +1,56 @@
+"""
+Command latency benchmark.
+
+Times `Piece.on_command` for a legal Move (the path a player hits on every
+key press), including the state transition, from a piece that sits in Idle.
+
+Run from the repository root:
+    python -m bench.bench_command [iterations]
+"""
+import contextlib
+import io
+import statistics
+import sys
+import time
+
+from app.Command import Command
+from app.GameFactory import GameFactory
+from app.PieceFactory import PieceFactory
+
+
+def bench_on_command(iterations: int = 2000) -> dict:
+    board = GameFactory().load_board('my_board.png')
+    piece = PieceFactory(board, 'pieces').create_piece("PW", (6, 0))
+    idle_state = piece.current_state
+    piece.reset(0)
+    move = Command(timestamp=0, piece_id=piece.piece_id, type="Move", params=["g1", "f1"])
+
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):  # keep debug prints out of the timing
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            piece.on_command(move, 0)
+            samples.append(time.perf_counter() - t0)
+            # back to Idle at the start cell for the next iteration
+            piece.current_state = idle_state
+            idle_state.physics.cell = (6, 0)
+            piece.reset(0)
+
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "p50_us": samples[len(samples) // 2] * 1e6,
+        "p99_us": samples[int(len(samples) * 0.99)] * 1e6,
+    }
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    result = bench_on_command(iterations)
+    print("on_command(Move): " + ", ".join(f"{k}={v:.1f}" if isinstance(v, float) else f"{k}={v}"
+                                           for k, v in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+"""
+Benchmark suite: startup, piece creation, per-tick update, drawing,
+blending, capture resolution, board lookups and key-to-command latency,
+each at several board sizes and piece counts. Runs headless.
+
+Run from the repository root:
+    python -m bench.bench_suite [--out results.json] [--baseline base.json]
+                                [--threshold 0.25] [--quick] [--only NAME ...]
+
+With --baseline, every result whose median is more than `threshold` slower
+than the baseline's is reported and the exit code is 1.
+"""
+import argparse
+import contextlib
+import io
+import json
+import pathlib
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.AssetCache import asset_cache
+from app.Board import Board
+from app.Clock import VirtualClock
+from app.Command import Command
+from app.Game import Game
+from app.GameFactory import GameFactory
+from app.Img import Img
+from app.PieceFactory import PieceFactory
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+CELL_PX = 100
+BACK_ROW = ["R", "N", "B", "Q", "K", "B", "N", "R"]
+
+# (board size, piece count): the standard game, a sparse board and two larger boards.
+CONFIGS: List[Tuple[int, int]] = [(8, 32), (8, 8), (12, 72), (16, 128)]
+QUICK_CONFIGS: List[Tuple[int, int]] = [(8, 32)]
+
+
+# ─── fixtures ───────────────────────────────────────────────────────────────
+def layout(size: int, n_pieces: int) -> Dict[Tuple[int, int], str]:
+    """Chess-like placement: black fills rows from the top, white from the bottom; one king each."""
+    cells: Dict[Tuple[int, int], str] = {}
+    per_side = n_pieces // 2
+    for color, rows in (("B", range(size)), ("W", range(size - 1, -1, -1))):
+        placed = 0
+        for k, row in enumerate(rows):
+            for col in range(size):
+                if placed == per_side:
+                    break
+                if k == 0:
+                    p_type = "K" if col == min(4, size - 1) else BACK_ROW[col % 8]
+                else:
+                    p_type = "P"
+                cells[(row, col)] = p_type + color
+                placed += 1
+    return cells
+
+
+def make_board(size: int) -> Board:
+    img = Img().read(ROOT / "my_board.png", [size * CELL_PX, size * CELL_PX])
+    return Board(CELL_PX, CELL_PX, 0.2, 0.2, size, size, img)
+
+
+def make_game(size: int, n_pieces: int, **kwargs) -> Game:
+    board = make_board(size)
+    factory = PieceFactory(board, ROOT / "pieces")
+    pieces = [factory.create_piece(p_type, cell) for cell, p_type in sorted(layout(size, n_pieces).items())]
+    game = Game(pieces, board, clock=VirtualClock(), **kwargs)
+    game.reset_pieces(0)
+    return game
+
+
+def write_csv(size: int, n_pieces: int, path: pathlib.Path):
+    grid = [[""] * size for _ in range(size)]
+    for (row, col), p_type in layout(size, n_pieces).items():
+        grid[row][col] = p_type
+    path.write_text("\n".join([",".join(str(i) for i in range(size))] + [",".join(r) for r in grid]))
+
+
+def pawn_moves(game: Game, now: int) -> List[Command]:
+    """One legal forward move for every pawn that has room."""
+    cmds = []
+    for p in game.pieces:
+        if p.piece_id[0] != "P":
+            continue
+        row, col = p.current_state.physics.cell
+        dest = (row + (1 if p.piece_id[1] == "B" else -1), col)
+        if game.get_piece_at(dest) is None and p.current_state.is_move_legal(dest):
+            src_n, dst_n = game.input_handler.coord_to_notation((row, col)), game.input_handler.coord_to_notation(dest)
+            cmds.append(Command(now, p.piece_id, "Move", [src_n, dst_n]))
+    return cmds
+
+
+# ─── timing ─────────────────────────────────────────────────────────────────
+def measure(fn: Callable[[], None], iterations: int, setup: Optional[Callable[[], None]] = None,
+            warmup: int = 3) -> dict:
+    """Time `fn` `iterations` times (after `setup` each time, untimed); stats in microseconds."""
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(iterations):
+        if setup:
+            setup()
+        t0 = clock()
+        fn()
+        samples.append(clock() - t0)
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "mean_us": statistics.fmean(samples) / 1e3,
+        "p50_us": samples[len(samples) // 2] / 1e3,
+        "p99_us": samples[min(int(len(samples) * 0.99), len(samples) - 1)] / 1e3,
+    }
+
+
+# ─── benchmarks ─────────────────────────────────────────────────────────────
+def bench_game_factory_create(size: int, n_pieces: int, scale: float) -> dict:
+    """GameFactory.create from a csv layout, warm asset cache (the standard 800 px board image)."""
+    with tempfile.TemporaryDirectory() as tmp:
+        csv = pathlib.Path(tmp) / "board.csv"
+        write_csv(size, n_pieces, csv)
+        create = lambda: GameFactory().create(csv, ROOT / "my_board.png", ROOT / "pieces", clock=VirtualClock())
+        asset_cache.clear()
+        t0 = time.perf_counter()
+        create()
+        cold_ms = (time.perf_counter() - t0) * 1e3
+        result = measure(create, max(int(20 * scale), 3), warmup=1)
+    result["cold_ms"] = cold_ms
+    return result
+
+
+def bench_create_piece(size: int, n_pieces: int, scale: float) -> dict:
+    board = make_board(size)
+    factory = PieceFactory(board, ROOT / "pieces")
+    cells = list(layout(size, n_pieces).items())
+    state = {"i": 0}
+
+    def create():
+        cell, p_type = cells[state["i"] % len(cells)]
+        state["i"] += 1
+        factory.create_piece(p_type, cell)
+    return measure(create, max(int(500 * scale), 20))
+
+
+def bench_update_all(size: int, n_pieces: int, scale: float) -> dict:
+    """Piece.update for every piece, with every pawn mid-move."""
+    game = make_game(size, n_pieces)
+    for cmd in pawn_moves(game, 0):
+        game.pieces_by_id[cmd.piece_id].on_command(cmd, 0)
+    clock = {"now": 0}
+
+    def update():
+        clock["now"] += 1
+        now = clock["now"]
+        for p in game.pieces:
+            p.update(now)
+    return measure(update, max(int(400 * scale), 20))
+
+
+def bench_draw(size: int, n_pieces: int, scale: float) -> dict:
+    """Game._draw (compositing only, no window), with every pawn moving."""
+    game = make_game(size, n_pieces)
+    for cmd in pawn_moves(game, 0):
+        game.pieces_by_id[cmd.piece_id].on_command(cmd, 0)
+    clock = game.clock
+
+    def setup():
+        clock.advance(10)
+        for p in game.pieces:
+            p.update(clock.now_ms())
+    return measure(game._draw, max(int(200 * scale), 10), setup=setup)
+
+
+def bench_draw_on(size: int, n_pieces: int, scale: float) -> dict:
+    """Img.draw_on of one piece sprite onto the board image."""
+    board = make_board(size)
+    sprite = PieceFactory(board, ROOT / "pieces").create_piece("QW", (0, 0)).current_state.graphics.get_img()
+    target = board.img.clone()
+    return measure(lambda: sprite.draw_on(target, CELL_PX, CELL_PX), max(int(2000 * scale), 50))
+
+
+def bench_resolve_collisions(size: int, n_pieces: int, scale: float) -> dict:
+    """Capture resolution for a tick with no shared cell (the common case)."""
+    game = make_game(size, n_pieces)
+    return measure(game._resolve_collisions, max(int(2000 * scale), 50))
+
+
+def bench_get_piece_at(size: int, n_pieces: int, scale: float) -> dict:
+    """One lookup per board cell."""
+    game = make_game(size, n_pieces)
+    cells = [(r, c) for r in range(size) for c in range(size)]
+    get = game.get_piece_at
+
+    def lookup_all():
+        for cell in cells:
+            get(cell)
+    result = measure(lookup_all, max(int(500 * scale), 20))
+    result["per_lookup_ns"] = result["p50_us"] * 1e3 / len(cells)
+    return result
+
+
+def bench_key_to_command(size: int, n_pieces: int, scale: float) -> dict:
+    """Final select key of a Move -> Command queued -> applied by the next tick."""
+    game = make_game(size, n_pieces)
+    handler = game.input_handler
+    piece, dest = next((p, d) for p in game.pieces if p.piece_id[1] == "W"
+                       for d in sorted(p.current_state.legal_targets()) if game.get_piece_at(d) is None)
+    blob = None
+
+    def setup():
+        nonlocal blob
+        if blob is None:
+            # white (user 2) selects the piece and puts the cursor on its destination
+            handler.player_states[2]["pos"] = tuple(piece.current_state.physics.cell)
+            handler.handle_key(2, "space")
+            handler.player_states[2]["pos"] = dest
+            blob = game.snapshot()
+        game.restore(blob)
+
+    def key_to_applied():
+        now = game.game_time_ms()
+        cmd = handler.handle_key(2, "space", timestamp=now)
+        game.user_input_queue.put(cmd)
+        game.tick(now + 1)
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = measure(key_to_applied, max(int(500 * scale), 20), setup=setup)
+    if piece.current_state.name != "move":
+        raise RuntimeError("key_to_command: the Move was not applied.")
+    return result
+
+
+BENCHMARKS: Dict[str, Callable[[int, int, float], dict]] = {
+    "game_factory_create": bench_game_factory_create,
+    "create_piece": bench_create_piece,
+    "update_all": bench_update_all,
+    "draw": bench_draw,
+    "draw_on": bench_draw_on,
+    "resolve_collisions": bench_resolve_collisions,
+    "get_piece_at": bench_get_piece_at,
+    "key_to_command": bench_key_to_command,
+}
+
+
+def result_key(name: str, size: int, n_pieces: int) -> str:
+    return f"{name}[board={size}x{size},pieces={n_pieces}]"
+
+
+def run_suite(only: Optional[List[str]] = None, quick: bool = False) -> dict:
+    """Run the (selected) benchmarks at every config; returns the JSON-ready report."""
+    names = only or list(BENCHMARKS)
+    unknown = set(names) - set(BENCHMARKS)
+    if unknown:
+        raise ValueError(f"Unknown benchmarks: {sorted(unknown)}")
+    configs = QUICK_CONFIGS if quick else CONFIGS
+    scale = 0.1 if quick else 1.0
+    results = {}
+    for name in names:
+        for size, n_pieces in configs:
+            results[result_key(name, size, n_pieces)] = BENCHMARKS[name](size, n_pieces, scale)
+    return {"meta": _meta(quick), "results": results}
+
+
+def _meta(quick: bool) -> dict:
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                             capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        rev = ""
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "git": rev, "quick": quick}
+
+
+def compare(current: dict, baseline: dict, threshold: float = 0.25, metric: str = "p50_us") -> List[dict]:
+    """
+    Compare two reports on `metric` (the median by default, the steadiest).
+    Returns one row per benchmark present in both, with `regressed` set when
+    the current value is more than `threshold` (fraction) above the baseline.
+    """
+    rows = []
+    for key, result in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if base is None or metric not in base or not base[metric]:
+            continue
+        ratio = result[metric] / base[metric]
+        rows.append({"benchmark": key, "baseline": base[metric], "current": result[metric],
+                     "ratio": ratio, "regressed": ratio > 1 + threshold})
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", type=pathlib.Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=pathlib.Path, help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="standard board only, fewer iterations")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these benchmarks")
+    args = parser.parse_args(argv)
+
+    report = run_suite(args.only, args.quick)
+    for key, result in report["results"].items():
+        print(f"{key:55s} p50={result['p50_us']:10.1f} us  p99={result['p99_us']:10.1f} us")
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+        print(f"wrote {args.out}")
+    if args.baseline:
+        rows = compare(report, json.loads(args.baseline.read_text()), args.threshold)
+        regressions = [r for r in rows if r["regressed"]]
+        for r in rows:
+            flag = "REGRESSION" if r["regressed"] else ""
+            print(f"{r['benchmark']:55s} {r['baseline']:10.1f} -> {r['current']:10.1f} us  x{r['ratio']:.2f} {flag}")
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than baseline by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
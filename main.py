@@ -1,7 +1,26 @@
-from app.GameFactory import GameFactory
+import pathlib
+import sys
+from app.StartupTimer import StartupTimer
+
+startup = StartupTimer()
+with startup.phase("imports"):
+    from app.GameFactory import GameFactory
+
+PACK = pathlib.Path("pieces.pack")   # build with: python -m app.AssetPack pieces pieces.pack
 
 def main():
-   game = GameFactory().create()
+   backend = None
+   if "--shared-framebuffer" in sys.argv:
+      # Frames go to a shared-memory ring; watch with: python -m app.SharedFramebuffer <path>
+      from app.RenderBackend import SharedMemoryBackend
+      backend = SharedMemoryBackend()
+      print(f"writing frames to {backend.path}")
+   factory = GameFactory()
+   game = factory.create(timer=startup, asset_pack=PACK if PACK.exists() else None, backend=backend)
+   if "--startup-report" in sys.argv:
+      print(startup.report())
+      for p_type, seconds in sorted(factory.load_times.items()):
+         print(f"  {p_type:<8}{seconds * 1e3:8.1f} ms")
    game.run()
     
 if __name__ == "__main__":
@@ -0,0 +1,24 @@
+import pathlib
+import pytest
+from app.Clock import VirtualClock
+from app.GameFactory import GameFactory
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def create_game(tmp_path):
+    """
+    Build a Game from the repo's board image and pieces: `create_game()` for
+    board.csv, `create_game(rows)` for an 8-column layout of csv `rows`.
+    Games run on a VirtualClock unless `clock` is given; other kwargs go to
+    GameFactory.create.
+    """
+    def create(rows=None, pieces_root=ROOT / "pieces", **kwargs):
+        board_csv = ROOT / "board.csv"
+        if rows is not None:
+            board_csv = tmp_path / "board.csv"
+            board_csv.write_text("\n".join([",".join(str(i) for i in range(8))] + list(rows)))
+        kwargs.setdefault("clock", VirtualClock())
+        return GameFactory().create(board_csv, ROOT / "my_board.png", pieces_root, **kwargs)
+    return create
@@ -0,0 +1,63 @@
+import pathlib
+import pytest
+from app.AssetCache import AssetCache
+
+PIECES = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+SPRITES = PIECES / "PW" / "states" / "idle" / "sprites"
+
+
+def test_frames_are_loaded_once_and_shared():
+    # Arrange
+    cache = AssetCache()
+    # Act
+    first = cache.get_frames(SPRITES, (32, 32))
+    second = cache.get_frames(SPRITES, (32, 32))
+    # Assert
+    assert first is second
+    assert len(first) == len(list(SPRITES.glob("*.png")))
+    assert first[0].img.shape[:2] == (32, 32)
+    assert cache.misses == 1 and cache.hits == 1
+
+
+def test_different_cell_size_is_a_separate_entry():
+    # Arrange
+    cache = AssetCache()
+    # Act
+    small = cache.get_frames(SPRITES, (32, 32))
+    big = cache.get_frames(SPRITES, (64, 64))
+    # Assert
+    assert small is not big
+    assert big[0].img.shape[:2] == (64, 64)
+    assert cache.stats()["frame_sets"] == 2
+
+
+def test_cached_frames_are_read_only():
+    # Arrange
+    cache = AssetCache()
+    frames = cache.get_frames(SPRITES, (32, 32))
+    # Act + Assert
+    with pytest.raises(ValueError):
+        frames[0].img[0, 0] = 0
+
+
+def test_missing_folder_returns_no_frames():
+    # Arrange
+    cache = AssetCache()
+    # Act
+    frames = cache.get_frames(PIECES / "no_such_piece", (32, 32))
+    # Assert
+    assert frames == ()
+
+
+def test_config_and_moves_are_parsed_once():
+    # Arrange
+    cache = AssetCache()
+    cfg_path = PIECES / "PW" / "states" / "idle" / "config.json"
+    moves_path = PIECES / "PW" / "moves.txt"
+    # Act
+    cfg1, cfg2 = cache.get_config(cfg_path), cache.get_config(cfg_path)
+    moves1, moves2 = cache.get_moves(moves_path, (8, 8)), cache.get_moves(moves_path, (8, 8))
+    # Assert
+    assert cfg1 is cfg2
+    assert moves1 is moves2
+    assert cache.stats()["misses"] == 2
@@ -0,0 +1,67 @@
+import pathlib
+import shutil
+import numpy as np
+from app.AssetCache import AssetCache
+from app.AssetPack import AssetPack, build_pack, load_pack
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def copy_pieces(tmp_path, types=("KB", "KW", "PW")):
+    root = tmp_path / "pieces"
+    for p_type in types:
+        shutil.copytree(ROOT / "pieces" / p_type, root / p_type)
+    return root
+
+
+def test_pack_serves_the_same_assets_as_the_tree(tmp_path):
+    # Arrange
+    pieces_root = copy_pieces(tmp_path)
+    build_pack(pieces_root, tmp_path / "pieces.pack")
+    from_tree, from_pack = AssetCache(), AssetCache()
+    # Act
+    installed = load_pack(tmp_path / "pieces.pack", pieces_root, (100, 100), cache=from_pack)
+    sprites = pieces_root / "PW" / "states" / "idle" / "sprites"
+    expected = from_tree.get_frames(sprites, (100, 100))
+    packed = from_pack.get_frames(sprites, (100, 100))
+    moves_path = pieces_root / "PW" / "moves.txt"
+    # Assert
+    assert installed
+    assert from_pack.stats()["misses"] == 0
+    assert len(packed) == len(expected) > 0
+    for a, b in zip(packed, expected):
+        assert a.img.shape == (100, 100, 4)
+        assert np.array_equal(a.img[..., :b.img.shape[2]], b.img)
+    assert from_pack.get_moves(moves_path, (8, 8)).moves_list == from_tree.get_moves(moves_path, (8, 8)).moves_list
+    cfg = pieces_root / "PW" / "states" / "move" / "config.json"
+    assert from_pack.get_config(cfg) == from_tree.get_config(cfg)
+
+
+def test_factory_plays_the_same_from_a_pack(tmp_path, create_game):
+    # Arrange
+    pieces_root = copy_pieces(tmp_path)
+    build_pack(pieces_root, tmp_path / "pieces.pack")
+    # Act
+    game = create_game(["KB"] + [","] * 5 + ["PW", ",KW"], pieces_root, asset_pack=tmp_path / "pieces.pack")
+    pawn = game.get_piece_at((6, 0))
+    # Assert
+    assert sorted(p.piece_id for p in game.pieces) == ["KB_1", "KW_1", "PW_1"]
+    assert (5, 0) in pawn.current_state.moves.legal_targets(6, 0)
+
+
+def test_stale_or_mismatched_pack_falls_back(tmp_path):
+    # Arrange
+    pieces_root = copy_pieces(tmp_path)
+    pack = tmp_path / "pieces.pack"
+    build_pack(pieces_root, pack)
+    (tmp_path / "junk.pack").write_bytes(b"not a pack")
+    # Act
+    wrong_size = load_pack(pack, pieces_root, (64, 64), cache=AssetCache())
+    junk = load_pack(tmp_path / "junk.pack", pieces_root, (100, 100), cache=AssetCache())
+    fresh = AssetPack.open(pack).is_fresh(pieces_root)
+    cfg = pieces_root / "PW" / "states" / "idle" / "config.json"
+    cfg.write_text(cfg.read_text() + " ")
+    stale = load_pack(pack, pieces_root, (100, 100), cache=AssetCache())
+    # Assert
+    assert fresh
+    assert not wrong_size and not junk and not stale
@@ -0,0 +1,27 @@
+import json
+from bench.bench_suite import compare, main
+
+
+def test_compare_flags_only_slowdowns_past_threshold():
+    # Arrange
+    baseline = {"results": {"a": {"p50_us": 10.0}, "b": {"p50_us": 10.0}, "gone": {"p50_us": 1.0}}}
+    current = {"results": {"a": {"p50_us": 12.0}, "b": {"p50_us": 13.0}, "new": {"p50_us": 5.0}}}
+    # Act
+    rows = {r["benchmark"]: r for r in compare(current, baseline, threshold=0.25)}
+    # Assert
+    assert set(rows) == {"a", "b"}
+    assert not rows["a"]["regressed"]
+    assert rows["b"]["regressed"]
+
+
+def test_quick_run_writes_json_and_passes_against_itself(tmp_path):
+    # Arrange
+    out = tmp_path / "bench.json"
+    # Act
+    code = main(["--quick", "--only", "get_piece_at", "resolve_collisions", "--out", str(out)])
+    report = json.loads(out.read_text())
+    slow_baseline = {"results": {k: {"p50_us": v["p50_us"] * 10} for k, v in report["results"].items()}}
+    # Assert
+    assert code == 0
+    assert set(report["results"]) == {"get_piece_at[board=8x8,pieces=32]", "resolve_collisions[board=8x8,pieces=32]"}
+    assert not any(r["regressed"] for r in compare(report, slow_baseline))
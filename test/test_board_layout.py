@@ -0,0 +1,41 @@
+import pathlib
+import subprocess
+import sys
+from app.BoardLayout import read_layout
+from app.Clock import VirtualClock
+from app.GameFactory import GameFactory
+from app.StartupTimer import StartupTimer
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def test_read_layout_matches_board_csv():
+    # Act
+    layout = read_layout(ROOT / "board.csv")
+    # Assert
+    assert (layout.rows, layout.cols) == (8, 8)
+    assert len(layout.pieces) == 32
+    assert ("PW", (6, 0)) in layout.pieces
+    assert ("NW", (7, 1)) in layout.pieces
+
+
+def test_factory_builds_board_sized_from_layout(tmp_path):
+    # Arrange – a 10 x 6 board
+    csv = tmp_path / "board.csv"
+    csv.write_text("\n".join([",".join(str(i) for i in range(10)), "KB"] + [","] * 4 + [",,,,,,,,,KW"]))
+    timer = StartupTimer()
+    # Act
+    game = GameFactory().create(csv, ROOT / "my_board.png", ROOT / "pieces", clock=VirtualClock(), timer=timer)
+    # Assert
+    assert (game.board.W_cells, game.board.H_cells) == (10, 6)
+    assert game.board.img.img.shape[:2] == (600, 1000)
+    assert game.get_piece_at((5, 9)).piece_id.startswith("KW")
+    assert {"layout", "board", "pieces"} <= set(timer.phases)
+
+
+def test_importing_the_factory_skips_pandas_and_keyboard():
+    # Act
+    code = "import sys, app.GameFactory; print(sorted({'pandas', 'keyboard'} & set(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    # Assert
+    assert out.strip() == "[]"
@@ -0,0 +1,156 @@
+import pytest
+from app.Command import Command
+from app.CommandJournal import JournalWriter, JournalFormatError, read_journal, replay, encode_cell, decode_cell
+from app.FramePacer import FramePacer
+from app.SimulationEngine import SimulationEngine
+
+ROWS = ["KB,,,,,,,", ",PB,,,,,,", ",,,,,,,", ",,,,,,,",
+        ",,,,,,,", ",,,,,,,", "PW,,PW,,,,,", "KW,NW,,,,,,"]
+
+
+def piece_at(game, cell):
+    return game.get_piece_at(cell)
+
+
+def record_ticks(game):
+    ticks, tick = [], game.tick
+    def recording(now):
+        ticks.append(now)
+        tick(now)
+    game.tick = recording
+    return ticks
+
+
+def test_cells_round_trip():
+    # Arrange / Act / Assert
+    for notation in ("a1", "g1", "h8", "c3"):
+        assert decode_cell(encode_cell(notation)) == notation
+    with pytest.raises(ValueError):
+        encode_cell("x")
+
+
+def test_recorded_game_replays_to_the_same_board(tmp_path, create_game):
+    # Arrange – play a short game headless while journaling it
+    game = create_game(ROWS)
+    pawn, knight = piece_at(game, (6, 0)), piece_at(game, (7, 1))
+    path = tmp_path / "game.cfj"
+    engine = SimulationEngine(game, tick_ms=10)
+    engine.start()
+    game.start_journal(path, game.clock.now_ms(), engine.tick_ms)
+    engine.run([Command(100, pawn.piece_id, "Move", ["g1", "f1"]),
+                Command(150, knight.piece_id, "Move", ["h2", "f3"]),
+                Command(2500, pawn.piece_id, "Jump", ["f1"])])
+    game.stop_journal()
+
+    # Act
+    journal = read_journal(path)
+    result = replay(journal, create_game(ROWS))
+
+    # Assert
+    assert [e.command.type for e in journal.entries] == ["Move", "Move", "Jump"]
+    assert journal.entries[0].applied_ms == 100
+    assert journal.entries[1].command.params == ["h2", "f3"]
+    assert journal.final_board[pawn.piece_id] == ((5, 0), "idle")
+    assert result.commands == 3
+    assert result.matches, result.mismatches
+
+
+def test_journal_errors_stop_journaling_but_not_the_game(tmp_path, create_game):
+    # Arrange – a journal whose file fails on the first write
+    class FullDisk:
+        def write(self, data):
+            raise OSError("disk full")
+        def flush(self): ...
+        def close(self): ...
+    game = create_game(ROWS)
+    pawn, knight = piece_at(game, (6, 0)), piece_at(game, (7, 1))
+    engine = SimulationEngine(game, tick_ms=10)
+    engine.start()
+    game.start_journal(tmp_path / "game.cfj", game.clock.now_ms(), engine.tick_ms)
+    real, game.journal._file = game.journal._file, FullDisk()
+    real.close()
+    # Act
+    engine.run([Command(100, pawn.piece_id, "Move", ["g1", "f1"]),
+                Command(150, knight.piece_id, "Move", ["h2", "f3"])])
+    game.stop_journal()
+    # Assert
+    assert isinstance(game.journal_error, OSError)
+    assert game.journal is None
+    assert piece_at(game, (5, 0)) is pawn and piece_at(game, (5, 2)) is knight
+
+
+def test_replay_drops_the_ticks_the_live_loop_dropped(tmp_path, create_game):
+    # Arrange – drive the game the way Game.run does, with one long stall
+    game = create_game(ROWS)
+    pawn = piece_at(game, (6, 0))
+    game.reset_pieces(0)
+    game.pacer = FramePacer(tick_hz=100, render_hz=30, max_catch_up=3)
+    game.start_journal(tmp_path / "game.cfj", 0, game.pacer.tick_ms)
+    live_ticks = record_ticks(game)
+    game.user_input_queue.put(Command(0, pawn.piece_id, "Move", ["g1", "f1"]))
+    for now in list(range(10, 300, 10)) + list(range(900, 3000, 10)):
+        game.clock.set_ms(now)
+        game._advance(now)
+    game.stop_journal()
+    journal = read_journal(tmp_path / "game.cfj")
+    replayed = create_game(ROWS)
+    replayed_ticks = record_ticks(replayed)
+
+    # Act
+    result = replay(journal, replayed)
+
+    # Assert
+    assert journal.skips == [(330, 58)]     # 330..900 dropped once 300..320 caught up
+    assert replayed_ticks == live_ticks
+    assert result.matches, result.mismatches
+
+
+def test_replay_reports_a_diverging_board(tmp_path, create_game):
+    # Arrange – a journal whose end record disagrees with its commands
+    game = create_game(ROWS)
+    pawn = piece_at(game, (6, 0))
+    path = tmp_path / "game.cfj"
+    writer = JournalWriter(path, 0, 10)
+    writer.record(100, Command(100, pawn.piece_id, "Move", ["g1", "f1"]))
+    writer.close(end_ms=2000, pieces=game.pieces)   # pawn still on g1 here
+
+    # Act
+    result = replay(read_journal(path), create_game(ROWS))
+
+    # Assert
+    assert not result.matches
+    assert any(m.startswith(pawn.piece_id) for m in result.mismatches)
+
+
+def test_rejects_foreign_files(tmp_path):
+    # Arrange
+    path = tmp_path / "junk.cfj"
+    path.write_bytes(b"not a journal at all")
+    # Act / Assert
+    with pytest.raises(JournalFormatError):
+        read_journal(path)
+
+
+def test_refuses_values_the_format_cannot_hold(tmp_path):
+    # Arrange
+    writer = JournalWriter(tmp_path / "game.cfj", start_ms=1000, tick_ms=10)
+    # Act / Assert
+    with pytest.raises(ValueError):
+        writer.record(1000, Command(1000, "P" * 256, "Jump", ["a1"]))
+    with pytest.raises(ValueError):
+        writer.record(999, Command(999, "PW_1", "Jump", ["a1"]))
+    writer.record(1000, Command(1000, "PW_1", "Jump", ["a1"]))
+    writer.close()
+    assert len(read_journal(tmp_path / "game.cfj").entries) == 1
+
+
+def test_writer_thread_errors_surface_in_record_and_close(tmp_path):
+    # Arrange – more distinct piece ids than the string table can code
+    writer = JournalWriter(tmp_path / "game.cfj", start_ms=0, tick_ms=10)
+    for i in range(0x10000):
+        writer.record(i, Command(i, f"P{i}", "Jump", ["a1"]))
+    # Act / Assert
+    with pytest.raises(ValueError):
+        writer.close()
+    with pytest.raises(ValueError):
+        writer.record(0, Command(0, "PW_1", "Jump", ["a1"]))
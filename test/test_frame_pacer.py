@@ -0,0 +1,74 @@
+import pytest
+from app.FramePacer import FramePacer
+
+
+def test_ticks_run_at_fixed_steps():
+    # Arrange
+    pacer = FramePacer(tick_hz=100, render_hz=30)
+    # Act
+    due = pacer.ticks_due(35)
+    # Assert
+    assert due == [10, 20, 30]
+    assert pacer.ticks_due(39) == []
+    assert pacer.ticks_due(40) == [40]
+
+
+def test_catch_up_is_bounded():
+    # Arrange
+    pacer = FramePacer(tick_hz=100, render_hz=30, max_catch_up=5)
+    # Act
+    due = pacer.ticks_due(1000)
+    # Assert
+    assert due == [10, 20, 30, 40, 50]
+    assert pacer.skipped_ticks == 95
+    assert pacer.ticks_due(1005) == []
+    assert pacer.ticks_due(1010) == [1010]
+
+
+def test_render_rate_is_capped():
+    # Arrange
+    pacer = FramePacer(tick_hz=100, render_hz=20)
+    # Act
+    drawn = [t for t in range(0, 200) if pacer.render_due(t)]
+    # Assert
+    assert drawn == [0, 50, 100, 150]
+
+
+def test_wait_sleeps_until_next_deadline():
+    # Arrange
+    slept = []
+    pacer = FramePacer(tick_hz=100, render_hz=10, sleep=slept.append)
+    pacer.render_due(0)
+    pacer.ticks_due(0)
+    # Act
+    pacer.wait(4)
+    # Assert
+    assert slept == [pytest.approx(0.006)]
+
+
+def test_idle_wait_sleeps_past_ticks_until_the_deadline():
+    # Arrange
+    slept = []
+    pacer = FramePacer(tick_hz=100, render_hz=10, max_catch_up=5, sleep=slept.append)
+    pacer.render_due(0)
+    pacer.ticks_due(0)
+    # Act
+    pacer.wait(4, extra_deadline=25, idle=True)     # first tick with work: 30
+    pacer.wait(4, extra_deadline=None, idle=True)   # nothing scheduled: at most 5 ticks behind
+    # Assert
+    assert slept == [pytest.approx(0.026), pytest.approx(0.046)]
+    assert pacer.ticks_due(50) == [10, 20, 30, 40, 50]
+    assert pacer.skipped_ticks == 0
+
+
+def test_achieved_rates_are_measured():
+    # Arrange
+    pacer = FramePacer(tick_hz=100, render_hz=25, window_ms=1000)
+    # Act
+    for t in range(0, 1001):
+        pacer.ticks_due(t)
+        pacer.render_due(t)
+    # Assert
+    rates = pacer.rates()
+    assert rates["achieved_tick_hz"] == pytest.approx(100)
+    assert rates["achieved_render_hz"] == pytest.approx(25, abs=1)
@@ -0,0 +1,97 @@
+import threading
+import cv2
+import pytest
+from app.GameRecorder import DROP_NEWEST, DROP_OLDEST, GameRecorder
+from app.RenderBackend import NullBackend
+from app.SimulationEngine import SimulationEngine
+
+
+class BlockedWriter:
+    """Video writer whose first write waits until `release` is set."""
+    def __init__(self, *_):
+        self.release_writes = threading.Event()
+        self.writes = 0
+        self.released = False
+
+    def write(self, frame):
+        self.release_writes.wait(5)
+        self.writes += 1
+
+    def release(self):
+        self.released = True
+
+
+def test_records_drawn_frames_at_target_fps(tmp_path, create_game):
+    # Arrange
+    game = create_game(backend=NullBackend())
+    engine = SimulationEngine(game, tick_ms=10)
+    game.start_recording(tmp_path / "game.avi", fps=20, fourcc="MJPG")
+    # Act – draw every tick for one second of game time
+    for _ in range(100):
+        engine.step()
+        game._draw()
+    stats = game.stop_recording()
+    video = cv2.VideoCapture(str(tmp_path / "game.avi"))
+    # Assert
+    assert stats["offered"] == 100
+    assert stats["encoded"] == 20 and stats["dropped"] == 0
+    assert int(video.get(cv2.CAP_PROP_FRAME_COUNT)) == 20
+    assert game.recorder is None
+
+
+@pytest.mark.parametrize("drop, kept", [(DROP_OLDEST, [7, 8, 9]), (DROP_NEWEST, [1, 2, 3])])
+def test_full_queue_drops_by_policy_without_blocking(drop, kept, create_game):
+    # Arrange – the encoder is stuck on frame 0
+    game = create_game(backend=NullBackend())
+    writer = BlockedWriter()
+    recorder = GameRecorder("unused.mp4", game.board, fps=10, max_queue=3, drop=drop,
+                            writer_factory=lambda *_: writer)
+    snapshots = [game.frame_snapshot(100 * i) for i in range(10)]
+    recorder.offer(snapshots[0])
+    while recorder.depth:
+        pass
+    # Act
+    for snapshot in snapshots[1:]:
+        recorder.offer(snapshot)
+    queued = [s.time_ms // 100 for s in recorder._queue]
+    stats = recorder.stats()
+    writer.release_writes.set()
+    final = recorder.close()
+    # Assert
+    assert queued == kept
+    assert stats["dropped"] == 6 and stats["max_depth"] == 3
+    assert stats["max_offer_us"] < 5000
+    assert final["encoded"] == 4
+
+
+def test_close_times_out_without_releasing_a_busy_writer(create_game):
+    # Arrange – the encoder is stuck inside write()
+    game = create_game(backend=NullBackend())
+    writer = BlockedWriter()
+    recorder = GameRecorder("unused.mp4", game.board, writer_factory=lambda *_: writer)
+    recorder.offer(game.frame_snapshot(0))
+    # Act
+    with pytest.raises(TimeoutError):
+        recorder.close(timeout=0.05)
+    released_while_busy = writer.released
+    writer.release_writes.set()
+    stats = recorder.close()
+    # Assert
+    assert not released_while_busy
+    assert writer.released and stats["encoded"] == 1
+
+
+def test_encoder_errors_are_reported_without_raising_from_the_game(tmp_path, create_game):
+    # Arrange
+    class FailingWriter(BlockedWriter):
+        def write(self, frame):
+            raise OSError("disk full")
+    game = create_game(backend=NullBackend())
+    game.start_recording(tmp_path / "game.avi", writer_factory=FailingWriter)
+    # Act
+    game.recorder.offer(game.frame_snapshot(0))
+    stats = game.stop_recording()
+    # Assert
+    assert stats is None
+    assert isinstance(game.recording_error, OSError)
+    assert game.recorder is None
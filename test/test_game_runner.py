@@ -0,0 +1,71 @@
+import functools
+import os
+import pathlib
+from app.Command import Command
+from app.GameRunner import GameRunner, GameSpec
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def spec(game_id, **kwargs):
+    return GameSpec(game_id, board_csv=str(ROOT / "board.csv"), board_img=str(ROOT / "my_board.png"),
+                    pieces_root=str(ROOT / "pieces"), **kwargs)
+
+
+def crash_once(marker, game):
+    """Kill the worker the first time any game with this marker starts."""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(3)
+
+
+def crash_always(game):
+    os._exit(3)
+
+
+def test_runs_games_across_workers():
+    # Arrange
+    move = [Command(100, "PW_1", "Move", ["g1", "f1"])]
+    specs = [spec(i, commands=move, max_ms=2000) for i in range(6)]
+    runner = GameRunner(workers=2, games_per_worker=3, mp_context="fork")
+
+    # Act
+    outcomes = runner.run(specs, timeout_s=60)
+    summary = GameRunner.summary(outcomes, runner.wall_time_s)
+
+    # Assert
+    assert [o.game_id for o in outcomes] == list(range(6))
+    assert all(o.error is None for o in outcomes)
+    assert all(o.ticks == 200 and o.game_time_ms == 2000 for o in outcomes)
+    assert 1 <= summary["workers"] <= 2
+    assert summary["failed"] == 0
+
+
+def test_crashed_worker_is_restarted_and_its_games_rerun(tmp_path):
+    # Arrange
+    marker = str(tmp_path / "crashed")
+    specs = [spec(0, max_ms=500, on_start=functools.partial(crash_once, marker)),
+             spec(1, max_ms=500)]
+    runner = GameRunner(workers=1, games_per_worker=2, mp_context="fork")
+
+    # Act
+    outcomes = runner.run(specs, timeout_s=60)
+
+    # Assert
+    assert runner.restarts == 1
+    assert all(o.error is None for o in outcomes)
+    assert outcomes[0].attempts == 2
+    assert outcomes[0].game_time_ms == 500
+
+
+def test_gives_up_after_max_attempts():
+    # Arrange – a game that crashes its worker every time
+    specs = [spec(0, max_ms=500, on_start=crash_always)]
+    runner = GameRunner(workers=1, games_per_worker=1, max_attempts=2, mp_context="fork")
+
+    # Act
+    outcomes = runner.run(specs, timeout_s=60)
+
+    # Assert
+    assert outcomes[0].error is not None
+    assert outcomes[0].attempts == 2
@@ -0,0 +1,106 @@
+import asyncio
+from app import NetProtocol as proto
+from app.GameClient import GameClient
+from app.GameServer import GameServer
+
+
+def test_protocol_round_trip():
+    # Arrange
+    rows = proto.UPDATE_ROW.pack(3, proto.encode_cell((5, 0)), 1, 0, 500)
+    # Act
+    request = proto.parse_request(proto.move((6, 0), (5, 0))[2:])
+    reply = proto.parse_reply(proto.update(1234, rows, 1)[2:])
+    # Assert
+    assert request == (proto.MOVE, (6, 0), (5, 0))
+    assert reply == (proto.UPDATE, 1234, [(3, proto.encode_cell((5, 0)), 1, 0, 500)])
+
+
+def test_server_validates_commands_and_pushes_updates(create_game):
+    async def scenario():
+        async with GameServer(lambda: create_game(clock=None), tick_ms=5, update_ms=20) as server:
+            black, white, spectator = [await GameClient().connect("127.0.0.1", server.port) for _ in range(3)]
+            await black.join(1, 1)
+            await white.join(1, 2)
+            await spectator.join(1, proto.SPECTATOR)
+            pawn = server.games[1].game.get_piece_at((6, 0)).piece_id
+
+            statuses = [
+                await white.move((6, 0), (5, 0)),          # legal
+                await black.move((6, 2), (5, 2)),          # white piece
+                await white.move((6, 2), (3, 2)),          # not a pawn move
+                await white.move((4, 4), (3, 4)),          # empty cell
+                await spectator.move((6, 2), (5, 2)),      # spectators only watch
+            ]
+            # black moves b2 -> c2 with the keyboard rules of InputHandler
+            keys = [await black.key(k) for k in ("down", "right", "enter", "down", "enter")]
+            await spectator.wait_for(lambda: spectator.view.pieces[pawn].state == 1)   # pawn in "move"
+            for client in (black, white, spectator):
+                await client.close()
+            return statuses, keys, server.commands_accepted
+    statuses, keys, accepted = asyncio.run(scenario())
+
+    assert statuses == [proto.OK, proto.NOT_YOURS, proto.ILLEGAL, proto.NO_PIECE, proto.NOT_YOURS]
+    assert keys == [proto.OK] * 5
+    assert accepted == 6
+
+
+def test_one_loop_hosts_many_games_and_clients(create_game):
+    async def scenario():
+        async with GameServer(lambda: create_game(clock=None), tick_ms=10, update_ms=20) as server:
+            clients = [await GameClient().connect("127.0.0.1", server.port) for _ in range(120)]
+            await asyncio.gather(*(c.join(i % 12, (i // 12) % 2 + 1) for i, c in enumerate(clients)))
+            await asyncio.gather(*(c.move((6, 0), (5, 0)) for c in clients[12:24]))
+            await asyncio.gather(*(c.wait_for(lambda c=c: any(s == 1 for _, s, _ in c.pieces.values()))
+                                   for c in clients))
+            games = len(server.games)
+            for c in clients:
+                await c.close()
+            return games, server.commands_accepted
+    games, accepted = asyncio.run(scenario())
+
+    assert games == 12
+    assert accepted == 12
+
+
+def test_server_caps_games_and_drops_them_when_their_clients_leave(create_game):
+    async def scenario():
+        async with GameServer(lambda: create_game(clock=None), tick_ms=5, update_ms=20, max_games=1) as server:
+            first, second = [await GameClient().connect("127.0.0.1", server.port) for _ in range(2)]
+            joined = await first.join(1, 1)
+            refused = await second.join(2, 1)
+            await first.close()
+            for _ in range(500):
+                if not server.games:
+                    break
+                await asyncio.sleep(0.01)
+            rejoined = await second.join(2, 1)
+            await second.close()
+            return joined, refused, rejoined
+    joined, refused, rejoined = asyncio.run(scenario())
+
+    assert (joined, refused, rejoined) == (proto.OK, proto.BUSY, proto.OK)
+
+
+def test_a_failing_game_is_aborted_without_stopping_the_others(create_game):
+    async def scenario():
+        async with GameServer(lambda: create_game(clock=None), tick_ms=5, update_ms=20) as server:
+            broken, healthy = [await GameClient().connect("127.0.0.1", server.port) for _ in range(2)]
+            await broken.join(1, 2)
+            await healthy.join(2, 2)
+
+            def tick(now_ms):
+                raise RuntimeError("corrupt game")
+            server.games[1].game.tick = tick
+            await broken.wait_for(lambda: broken.winner is not None)
+            status = await healthy.move((6, 0), (5, 0))
+            await healthy.wait_for(lambda: any(s == 1 for _, s, _ in healthy.pieces.values()))
+            statuses = status, await broken.move((6, 0), (5, 0))
+            games = sorted(server.games)
+            for client in (broken, healthy):
+                await client.close()
+            return broken.winner, statuses, games
+    winner, statuses, games = asyncio.run(scenario())
+
+    assert winner == ""
+    assert statuses == (proto.OK, proto.GAME_OVER)
+    assert games == [2]
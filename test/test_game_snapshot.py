@@ -0,0 +1,114 @@
+import pytest
+from app.Command import Command
+from app.SimulationEngine import SimulationEngine
+
+ROWS = ["KB,,,,,,,", ",PB,,,,,,", ",,,,,,,", ",,,,,,,",
+        ",,,,,,,", ",,,,,,,", "PW,,,,,,,", "KW,NW,,,,,,"]
+
+
+def board_state(game):
+    return sorted((p.piece_id, p.current_state.name, tuple(p.current_state.physics.cell),
+                   tuple(p.current_state.physics.get_pos()), p.current_state.graphics.current_frame_idx)
+                  for p in game.pieces)
+
+
+def test_snapshot_is_small_and_pixel_free(create_game):
+    # Arrange
+    game = create_game(ROWS)
+    # Act
+    blob = game.snapshot()
+    # Assert
+    assert isinstance(blob, bytes)
+    assert len(blob) < 4096
+
+
+@pytest.mark.parametrize("mode", [{}, {"use_piece_store": True}, {"use_scheduler": True}])
+def test_restore_rewinds_mid_move_and_replays_identically(mode, create_game):
+    # Arrange – snapshot while the pawn is half way
+    game = create_game(ROWS, **mode)
+    pawn = game.get_piece_at((6, 0))
+    engine = SimulationEngine(game, tick_ms=10)
+    engine.run([Command(100, pawn.piece_id, "Move", ["g1", "f1"])], max_ms=600)
+    game.input_handler.handle_key(1, "down")
+    blob = game.snapshot()
+    before = board_state(game)
+    engine.run(max_ms=3000)
+    after_first_run = board_state(game)
+
+    # Act
+    game.restore(blob)
+    restored = board_state(game)
+    engine.run(max_ms=3000)
+
+    # Assert
+    assert restored == before
+    assert game.input_handler.get_cursor_position(1) == (1, 0)
+    assert board_state(game) == after_first_run
+    assert game.get_piece_at((5, 0)) is pawn
+
+
+def test_restore_brings_back_captured_pieces_and_input_state(create_game):
+    # Arrange
+    game = create_game(ROWS)
+    knight, pawn = game.get_piece_at((7, 1)), game.get_piece_at((1, 1))
+    game.input_handler.handle_key(2, "w")
+    blob = game.snapshot()
+    cursor = game.input_handler.get_cursor_position(2)
+    game.input_handler.handle_key(2, "s")
+
+    # Act – remove the black pawn the way a capture does, then rewind
+    game.pieces.remove(pawn)
+    del game.pieces_by_id[pawn.piece_id]
+    game.occupancy.remove(pawn)
+    game.restore(blob)
+
+    # Assert
+    assert pawn in game.pieces
+    assert game.get_piece_at((1, 1)) is pawn
+    assert game.get_piece_at((7, 1)) is knight
+    assert game.input_handler.get_cursor_position(2) == cursor
+
+
+def test_restore_into_a_second_game_branches_the_position(create_game):
+    # Arrange
+    game = create_game(ROWS)
+    pawn = game.get_piece_at((6, 0))
+    SimulationEngine(game, tick_ms=10).run([Command(100, pawn.piece_id, "Move", ["g1", "f1"])], max_ms=400)
+    branch = create_game(ROWS)
+
+    # Act
+    branch.restore(game.snapshot())
+
+    # Assert
+    assert board_state(branch) == board_state(game)
+    assert branch.game_time_ms() == game.game_time_ms()
+
+
+def test_restore_rejects_unknown_versions(create_game):
+    # Arrange
+    game = create_game(ROWS)
+    blob = (99).to_bytes(2, "little") + game.snapshot()[2:]
+    # Act / Assert
+    with pytest.raises(ValueError):
+        game.restore(blob)
+
+
+def test_restore_rejects_corrupt_snapshots(create_game):
+    # Arrange
+    game = create_game(ROWS)
+    blob = game.snapshot()
+    # Act / Assert
+    with pytest.raises(ValueError):
+        game.restore(blob[:len(blob) // 2])
+
+
+def test_restore_rejects_a_snapshot_of_another_layout_without_changing_the_game(create_game):
+    # Arrange
+    other = create_game()                        # the full board.csv layout
+    game = create_game(["KB,,,,,,,"] + [",,,,,,,"] * 6 + ["KW,,,,,,,"])
+    before = board_state(game)
+    # Act / Assert
+    with pytest.raises(ValueError):
+        game.restore(other.snapshot())
+    assert board_state(game) == before
+    assert set(game.pieces_by_id) == {p.piece_id for p in game.pieces}
@@ -0,0 +1,76 @@
+import numpy as np
+from app.Img import Img
+
+
+def make_img(pixels):
+    img = Img()
+    img.img = pixels
+    return img
+
+
+def reference_blend(dst, src):
+    """Straight-alpha float blend, the way draw_on used to do it."""
+    a = src[..., 3:4] / 255.0
+    out = dst.astype(np.float64)
+    out[..., :3] = (1 - a) * dst[..., :3] + a * src[..., :3]
+    return out
+
+
+def test_draw_on_matches_float_blend():
+    # Arrange
+    rng = np.random.default_rng(0)
+    sprite = make_img(rng.integers(0, 256, (10, 12, 4), dtype=np.uint8))
+    board = make_img(np.full((40, 40, 4), 255, np.uint8))
+    board.img[..., :3] = rng.integers(0, 256, (40, 40, 3), dtype=np.uint8)
+    expected = reference_blend(board.img[5:15, 7:19].copy(), sprite.img)
+    # Act
+    sprite.draw_on(board, 7, 5)
+    # Assert
+    diff = np.abs(board.img[5:15, 7:19, :3].astype(int) - expected[..., :3])
+    assert diff.max() <= 2
+
+
+def test_draw_on_does_not_modify_sprite():
+    # Arrange
+    sprite = make_img(np.full((4, 4, 3), 9, np.uint8))
+    board = make_img(np.zeros((8, 8, 4), np.uint8))
+    # Act
+    sprite.draw_on(board, 0, 0)
+    # Assert
+    assert sprite.img.shape == (4, 4, 3)
+    assert (board.img[:4, :4, :3] == 9).all()
+
+
+def test_draw_on_clips_sprite_partly_off_board():
+    # Arrange
+    sprite = make_img(np.full((4, 4, 3), 7, np.uint8))
+    board = make_img(np.zeros((8, 8, 3), np.uint8))
+    # Act
+    sprite.draw_on(board, 6, -2)
+    # Assert
+    assert (board.img[0:2, 6:8] == 7).all()
+    assert board.img[2:, :].sum() == 0 and board.img[:, :6].sum() == 0
+
+
+def test_draw_on_entirely_off_board_is_noop():
+    # Arrange
+    sprite = make_img(np.full((4, 4, 3), 7, np.uint8))
+    board = make_img(np.zeros((8, 8, 3), np.uint8))
+    # Act
+    sprite.draw_on(board, 20, 20)
+    # Assert
+    assert board.img.sum() == 0
+
+
+def test_transparent_pixels_keep_background():
+    # Arrange
+    pixels = np.zeros((4, 4, 4), np.uint8)
+    pixels[..., :3] = 200
+    pixels[0, 0, 3] = 255
+    sprite = make_img(pixels)
+    board = make_img(np.full((4, 4, 3), 50, np.uint8))
+    # Act
+    sprite.draw_on(board, 0, 0)
+    # Assert
+    assert (board.img[0, 0] == 200).all()
+    assert (board.img[1:, :] == 50).all()
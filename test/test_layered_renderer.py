@@ -0,0 +1,82 @@
+import numpy as np
+from app.Board import Board
+from app.Img import Img
+from app.LayeredRenderer import LayeredRenderer, SpriteDraw, CursorDraw
+
+
+def make_img(pixels):
+    img = Img()
+    img.img = pixels
+    return img
+
+
+def make_board():
+    rng = np.random.default_rng(1)
+    return Board(10, 10, 1, 1, 8, 8, make_img(rng.integers(0, 256, (80, 80, 4), dtype=np.uint8)))
+
+
+def make_sprites():
+    rng = np.random.default_rng(2)
+    frames = []
+    for _ in range(3):
+        pixels = rng.integers(0, 256, (10, 10, 4), dtype=np.uint8)
+        pixels[2:5, 2:5, 3] = 0  # some transparency
+        frames.append(make_img(pixels))
+    return frames
+
+
+def naive_render(board, sprites, cursors):
+    """Full redraw in the renderer's layer order: static sprites, moving sprites, cursors."""
+    frame = board.clone()
+    for s in sorted(sprites, key=lambda s: not s.static):
+        s.img.draw_on(frame.img, s.x, s.y)
+    for c in cursors:
+        frame.draw_cursor(c.pos, c.color, c.thickness)
+    return frame.img.img
+
+
+def test_incremental_frames_match_full_redraw():
+    # Arrange
+    board = make_board()
+    frames = make_sprites()
+    renderer = LayeredRenderer(board)
+    rng = np.random.default_rng(3)
+    sprites = {f"P{i}": SpriteDraw(f"P{i}", frames[i % 3], i * 10, (i % 8) * 10, i % 2 == 0) for i in range(8)}
+    cursor = CursorDraw((0, 0), (0, 0, 255), 3)
+    # Act + Assert
+    for step in range(40):
+        key = f"P{rng.integers(0, 8)}"
+        old = sprites[key]
+        sprites[key] = SpriteDraw(key, frames[rng.integers(0, 3)],
+                                  int(old.x + rng.integers(-7, 8)), int(old.y + rng.integers(-7, 8)),
+                                  bool(rng.integers(0, 2)))
+        if step % 5 == 0:
+            cursor = CursorDraw((int(rng.integers(0, 8)), int(rng.integers(0, 8))), (0, 0, 255), 3)
+        frame = renderer.render(sprites.values(), [cursor])
+        assert np.array_equal(frame.img.img, naive_render(board, list(sprites.values()), [cursor]))
+
+
+def test_unchanged_scene_redraws_nothing():
+    # Arrange
+    board = make_board()
+    frames = make_sprites()
+    renderer = LayeredRenderer(board)
+    sprites = [SpriteDraw("P1", frames[0], 10, 10), SpriteDraw("P2", frames[1], 30, 30, True)]
+    renderer.render(sprites)
+    # Act
+    renderer.render(sprites)
+    # Assert
+    assert renderer.last_dirty_rects == []
+
+
+def test_removed_sprite_is_erased():
+    # Arrange
+    board = make_board()
+    frames = make_sprites()
+    renderer = LayeredRenderer(board)
+    renderer.render([SpriteDraw("P1", frames[0], 10, 10)])
+    # Act
+    frame = renderer.render([])
+    # Assert
+    assert np.array_equal(frame.img.img, board.img.img)
+    assert renderer.last_dirty_rects == [(10, 10, 20, 20)]
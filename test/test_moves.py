@@ -83,4 +83,31 @@ def test_read_moves_skips_comments_and_empty_lines():
     moves = Moves(path, dims)
     # Assert
     assert moves.moves_list == [(1,0), (0,1)]
-    os.unlink(path)
\ No newline at end of file
+    os.unlink(path)
+
+def test_legal_targets_and_mask_match_get_moves():
+    """Checks that the precomputed set and bitmask agree with get_moves."""
+    # Arrange
+    lines = ["1,0", "-1,0", "0,1", "0,-1", "2,2"]
+    path = create_moves_file(lines)
+    moves = Moves(path, (4, 5))
+    # Act + Assert
+    for r in range(4):
+        for c in range(5):
+            expected = set(moves.get_moves(r, c))
+            assert moves.legal_targets(r, c) == expected
+            mask = moves.targets_mask(r, c)
+            assert {(i // 5, i % 5) for i in range(20) if mask >> i & 1} == expected
+    os.unlink(path)
+
+def test_is_legal_is_constant_lookup_and_bounds_safe():
+    """Checks is_legal for legal, illegal and off-board positions."""
+    # Arrange
+    path = create_moves_file(["1,0", "0,1"])
+    moves = Moves(path, (8, 8))
+    # Act + Assert
+    assert moves.is_legal((0, 0), (1, 0))
+    assert not moves.is_legal((0, 0), (1, 1))
+    assert not moves.is_legal((-1, -1), (0, -1))
+    assert moves.legal_targets(8, 8) == frozenset()
+    os.unlink(path)
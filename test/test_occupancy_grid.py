@@ -0,0 +1,70 @@
+from app.OccupancyGrid import OccupancyGrid
+
+
+class MockPhysics:
+    def __init__(self, cell):
+        self.cell = cell
+
+class MockState:
+    def __init__(self, cell):
+        self.physics = MockPhysics(cell)
+
+class MockPiece:
+    """Mock piece exposing only current_state.physics.cell"""
+    def __init__(self, piece_id, cell):
+        self.piece_id = piece_id
+        self.current_state = MockState(cell)
+
+
+def test_get_returns_piece_or_none():
+    # Arrange
+    grid = OccupancyGrid(8, 8)
+    p = MockPiece("PW_1", (6, 0))
+    grid.add(p)
+    # Act + Assert
+    assert grid.get((6, 0)) is p
+    assert grid.get((5, 0)) is None
+    assert grid.get((-1, 3)) is None
+
+
+def test_sync_moves_piece_to_new_cell():
+    # Arrange
+    grid = OccupancyGrid(8, 8)
+    p = MockPiece("PW_1", (6, 0))
+    grid.add(p)
+    # Act
+    p.current_state.physics.cell = (5, 0)
+    moved = grid.sync(p)
+    # Assert
+    assert moved
+    assert grid.get((6, 0)) is None
+    assert grid.get((5, 0)) is p
+    assert not grid.sync(p)
+
+
+def test_shared_cells_lists_only_colocated_pieces():
+    # Arrange
+    grid = OccupancyGrid(8, 8)
+    a, b, c = MockPiece("A", (1, 1)), MockPiece("B", (2, 2)), MockPiece("C", (3, 3))
+    for p in (a, b, c):
+        grid.add(p)
+    # Act
+    b.current_state.physics.cell = (1, 1)
+    grid.sync(b)
+    # Assert
+    assert list(grid.shared_cells()) == [((1, 1), [a, b])]
+    assert grid.pieces_at((1, 1)) == [a, b]
+
+
+def test_remove_promotes_remaining_occupant():
+    # Arrange
+    grid = OccupancyGrid(8, 8)
+    a, b = MockPiece("A", (4, 4)), MockPiece("B", (4, 4))
+    grid.add(a)
+    grid.add(b)
+    # Act
+    grid.remove(a)
+    # Assert
+    assert grid.get((4, 4)) is b
+    assert list(grid.shared_cells()) == []
+    assert len(grid) == 1
@@ -0,0 +1,37 @@
+import pathlib
+import numpy as np
+import pytest
+from app.AssetCache import AssetCache, asset_cache
+from app.GameFactory import GameFactory
+from app.PieceFactory import PieceFactory
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def test_preload_decodes_every_sprite_before_building_pieces():
+    # Arrange
+    asset_cache.clear()
+    factory = PieceFactory(GameFactory().load_board(ROOT / "my_board.png"), ROOT / "pieces")
+    # Act
+    times = factory.preload(["PW", "KB", "PW", "XX"], max_workers=4)
+    misses = asset_cache.stats()["misses"]
+    factory.create_piece("PW", (6, 0))
+    factory.create_piece("KB", (0, 4))
+    # Assert
+    assert set(times) == {"PW", "KB"} and all(t > 0 for t in times.values())
+    assert asset_cache.stats()["misses"] == misses
+    with pytest.raises(ValueError):
+        factory.create_piece("XX", (0, 0))
+
+
+def test_preloaded_frames_match_sequential_loading():
+    # Arrange
+    asset_cache.clear()
+    sprites = ROOT / "pieces" / "QW" / "states" / "move" / "sprites"
+    expected = AssetCache().get_frames(sprites, (100, 100))
+    # Act
+    PieceFactory(GameFactory().load_board(ROOT / "my_board.png"), ROOT / "pieces").preload(["QW"])
+    frames = asset_cache.get_frames(sprites, (100, 100))
+    # Assert
+    assert len(frames) == len(expected)
+    assert all(np.array_equal(a.img, b.img) and not a.img.flags.writeable for a, b in zip(frames, expected))
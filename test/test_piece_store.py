@@ -0,0 +1,48 @@
+from app.Command import Command
+from app.SimulationEngine import SimulationEngine
+
+
+def observe(game):
+    return sorted((p.piece_id, p.current_state.name, tuple(p.current_state.physics.cell),
+                   p.current_state.physics.get_pos(), p.current_state.graphics.current_frame_idx)
+                  for p in game.pieces)
+
+
+COMMANDS = [
+    Command(50, "PW_1", "Move", ["g1", "f1"]),
+    Command(60, "PB_2", "Move", ["b2", "c2"]),
+    Command(400, "NW_1", "Jump", ["h2"]),
+    Command(900, "PW_3", "Move", ["g3", "e3"]),
+    Command(2500, "PW_1", "Move", ["f1", "e1"]),
+]
+
+
+def test_batched_update_matches_object_update(create_game):
+    # Arrange
+    plain, batched = create_game(use_piece_store=False), create_game(use_piece_store=True)
+    engines = [SimulationEngine(plain, tick_ms=7), SimulationEngine(batched, tick_ms=7)]
+    for engine in engines:
+        engine.submit_all(COMMANDS)
+    # Act + Assert
+    for _ in range(700):
+        for engine in engines:
+            engine.step()
+        assert observe(plain) == observe(batched)
+
+
+def test_store_rows_follow_captures(create_game):
+    # Arrange – the white king takes the black pawn on a1
+    game = create_game(["PB,,,,,,,KB", ",KW,,,,,,"] + [",,,,,,,"] * 6, use_piece_store=True)
+    pawn, king = game.get_piece_at((0, 0)), game.get_piece_at((1, 1))
+    engine = SimulationEngine(game, tick_ms=10)
+    # Act
+    engine.run([Command(0, king.piece_id, "Move", ["b2", "a1"])], max_ms=3000)
+    # Assert
+    store = game.piece_store
+    assert pawn not in game.pieces and pawn not in store._pieces
+    assert len(store) == len(game.pieces) == 2
+    for p in game.pieces:
+        row = store._row_of[id(p)]
+        assert store._pieces[row] is p
+        assert tuple(store.cell[row]) == tuple(p.current_state.physics.cell)
+    assert tuple(store.cell[store._row_of[id(king)]]) == (0, 0)
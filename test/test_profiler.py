@@ -0,0 +1,49 @@
+import json
+from app.Command import Command
+from app.Profiler import PhaseHistogram, Profiler
+from app.SimulationEngine import SimulationEngine
+
+
+def test_histogram_percentiles_stay_within_a_bucket():
+    # Arrange
+    hist = PhaseHistogram()
+    # Act
+    for ns in range(1, 10_001):
+        hist.record(ns * 1000)
+    # Assert
+    assert hist.count == 10_000
+    assert 5_000_000 <= hist.percentile_ns(0.50) <= 5_000_000 * 1.25
+    assert 9_900_000 <= hist.percentile_ns(0.99) <= hist.max_ns == 10_000_000
+    assert len(hist.buckets) == len(PhaseHistogram().buckets)
+
+
+def test_game_records_phases_and_counts(create_game):
+    # Arrange – the white king takes the black king
+    profiler = Profiler()
+    game = create_game(["KB,,,,,,,", ",KW,,,,,,"] + [",,,,,,,"] * 6, profiler=profiler)
+    king = next(p for p in game.pieces if p.piece_id.startswith("KW"))
+    engine = SimulationEngine(game, tick_ms=10)
+    # Act
+    result = engine.run([Command(0, king.piece_id, "Move", ["b2", "a1"])], max_ms=5000)
+    report = profiler.report()
+    # Assert
+    assert result.finished
+    assert {"update", "input", "collisions"} <= set(report["phases"])
+    assert report["phases"]["update"]["count"] == engine.ticks == report["counters"]["ticks"]
+    assert report["counters"]["commands"] == 1
+    assert report["counters"]["captures"] == 1
+
+
+def test_tick_report_calls_back_on_cadence(tmp_path):
+    # Arrange
+    reports = []
+    profiler = Profiler(on_report=reports.append, report_every_ms=100)
+    profiler.count("commands")
+    # Act
+    for now in range(0, 1000, 10):
+        profiler.tick_report(now)
+    profiler.dump(tmp_path / "profile.json")
+    # Assert
+    assert len(reports) == 9
+    assert reports[0]["counters"] == {"commands": 1}
+    assert json.loads((tmp_path / "profile.json").read_text()) == profiler.report()
@@ -0,0 +1,40 @@
+import numpy as np
+from app.RenderBackend import CvWindowBackend, NullBackend, OffscreenBackend
+
+
+def test_offscreen_backend_receives_copies_of_drawn_frames(create_game):
+    # Arrange
+    seen = []
+    backend = OffscreenBackend(on_frame=lambda pixels, n: seen.append((pixels.copy(), n)))
+    game = create_game(backend=backend)
+    game.reset_pieces(0)
+    # Act
+    game._draw()
+    shown = game._show()
+    # Assert
+    assert shown
+    assert backend.frames == 1 and seen[0][1] == 1
+    assert np.array_equal(backend.frame, game._current_frame.img.img)
+    assert backend.frame is not game._current_frame.img.img
+    assert not np.array_equal(backend.frame, game.board.img.img)   # pieces were composited
+
+
+def test_null_backend_skips_compositing(monkeypatch, create_game):
+    # Arrange
+    game = create_game(backend=NullBackend())
+    game.reset_pieces(0)
+    blank = game._current_frame
+    monkeypatch.setattr(game.renderer, "render", lambda *a, **k: (_ for _ in ()).throw(AssertionError("rendered")))
+    # Act
+    game._draw()
+    shown = game._show()
+    # Assert
+    assert shown
+    assert game._current_frame is blank
+
+
+def test_window_backend_is_the_default(create_game):
+    # Act
+    game = create_game()
+    # Assert
+    assert isinstance(game.backend, CvWindowBackend)
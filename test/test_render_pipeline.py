@@ -0,0 +1,66 @@
+import threading
+import numpy as np
+from app.Board import Board
+from app.Img import Img
+from app.LayeredRenderer import LayeredRenderer, SpriteDraw, CursorDraw
+from app.RenderPipeline import FrameSnapshot, SnapshotBuffer, RenderThread
+
+
+def make_board():
+    img = Img()
+    img.img = np.zeros((80, 80, 4), dtype=np.uint8)
+    return Board(10, 10, 1, 1, 8, 8, img)
+
+
+def make_sprite(value):
+    img = Img()
+    img.img = np.full((10, 10, 4), value, dtype=np.uint8)
+    return img
+
+
+def snapshot(seq, x=0):
+    return FrameSnapshot(seq, seq * 10, (SpriteDraw("p", make_sprite(255), x, 0),), (CursorDraw((0, 0), (0, 0, 255), 1),))
+
+
+def test_buffer_keeps_only_the_newest_snapshot():
+    # Arrange
+    buffer = SnapshotBuffer()
+
+    # Act
+    for seq in range(1, 4):
+        buffer.publish(snapshot(seq))
+    first = buffer.take(timeout=0)
+    second = buffer.take(timeout=0)
+
+    # Assert
+    assert first.seq == 3
+    assert second is None
+    assert buffer.published == 3
+    assert buffer.dropped == 2
+
+
+def test_render_thread_presents_latest_snapshot_and_stops_on_request():
+    # Arrange
+    buffer = SnapshotBuffer()
+    presented = []
+    done = threading.Event()
+
+    def present(frame):
+        presented.append(frame.img.img.copy())
+        done.set()
+        return False  # like ESC: ask the game to stop
+
+    thread = RenderThread(LayeredRenderer(make_board()), buffer, present)
+    thread.start()
+
+    # Act
+    buffer.publish(snapshot(1, x=20))
+    assert done.wait(2.0)
+    thread.stop()
+
+    # Assert
+    assert thread.stop_requested.is_set()
+    assert thread.error is None
+    assert thread.frames == 1
+    assert presented[0][0:10, 20:30].min() == 255
+    assert presented[0][0:10, 40:50].max() == 0
@@ -0,0 +1,106 @@
+import multiprocessing as mp
+import pathlib
+import numpy as np
+import pytest
+from app.Clock import VirtualClock
+from app.GameFactory import GameFactory
+from app.RenderBackend import SharedMemoryBackend
+from app.SharedFramebuffer import SharedFramebuffer, SharedFramebufferReader
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+SHAPE = (120, 160, 4)
+
+
+def frame(n):
+    return np.full(SHAPE, n % 256, np.uint8)
+
+
+def read_until_closed(path, results):
+    """Viewer process: report how many distinct frames it saw and whether any was torn."""
+    reader = SharedFramebufferReader(path)
+    seen, torn, out = set(), 0, np.empty(SHAPE, np.uint8)
+    while not reader.closed:
+        got = reader.read(out)
+        if got is not None:
+            frame_no, pixels = got
+            if not (pixels == frame_no % 256).all():
+                torn += 1
+            seen.add(frame_no)
+    results.put((len(seen), torn))
+
+
+def test_reader_sees_newest_frame_in_place(tmp_path):
+    # Arrange
+    ring = SharedFramebuffer(SHAPE, slots=3, path=tmp_path / "ring.fb")
+    reader = SharedFramebufferReader(tmp_path / "ring.fb")
+    # Act
+    empty = reader.peek()
+    for n in range(1, 6):
+        ring.write(frame(n), time_ms=10 * n)
+    newest = reader.peek()
+    # Assert
+    assert empty is None
+    assert (newest.frame_no, newest.time_ms) == (5, 50)
+    assert (newest.pixels == 5).all() and not newest.pixels.flags.writeable
+    ring.write(frame(6))
+    ring.write(frame(7))
+    assert reader.valid(newest)
+    ring.write(frame(8))            # wraps around onto frame 5's slot
+    assert not reader.valid(newest)
+    reader.close()
+    ring.close()
+    assert not (tmp_path / "ring.fb").exists()
+
+
+def test_viewer_processes_never_see_torn_frames(tmp_path):
+    # Arrange
+    path = tmp_path / "ring.fb"
+    ring = SharedFramebuffer(SHAPE, slots=3, path=path)
+    ctx = mp.get_context("fork")
+    results = ctx.Queue()
+    viewers = [ctx.Process(target=read_until_closed, args=(path, results)) for _ in range(2)]
+    for v in viewers:
+        v.start()
+    # Act
+    for n in range(1, 3001):
+        ring.write(frame(n))
+    ring.close()
+    outcomes = [results.get(timeout=10) for _ in viewers]
+    for v in viewers:
+        v.join(5)
+    # Assert
+    assert all(seen > 0 and torn == 0 for seen, torn in outcomes)
+
+
+def test_backend_publishes_game_frames(tmp_path):
+    # Arrange
+    backend = SharedMemoryBackend(tmp_path / "game.fb")
+    game = GameFactory().create(ROOT / "board.csv", ROOT / "my_board.png", ROOT / "pieces",
+                                clock=VirtualClock(), backend=backend)
+    game.reset_pieces(0)
+    # Act
+    game._draw()
+    game._show()
+    reader = SharedFramebufferReader(tmp_path / "game.fb")
+    frame_no, pixels = reader.read()
+    backend.close()
+    # Assert
+    assert frame_no == 1
+    assert np.array_equal(pixels, game._current_frame.img.img)
+    assert reader.closed
+    reader.close()
+
+
+def test_reader_waits_for_the_ring_to_appear(tmp_path):
+    # Arrange
+    path = tmp_path / "late.fb"
+    # Act
+    with pytest.raises(TimeoutError):
+        SharedFramebufferReader.wait(path, timeout=0.1)
+    ring = SharedFramebuffer(SHAPE, path=path)
+    ring.write(frame(1))
+    reader = SharedFramebufferReader.wait(path, timeout=1)
+    # Assert
+    assert reader.latest == 1
+    reader.close()
+    ring.close()
@@ -0,0 +1,57 @@
+import pytest
+from app.Clock import MonotonicClock
+from app.Command import Command
+from app.SimulationEngine import SimulationEngine
+
+
+def piece_at(game, p_type):
+    return next(p for p in game.pieces if p.piece_id.startswith(p_type))
+
+
+def test_move_plays_out_headless(create_game):
+    # Arrange
+    game = create_game(["KB,,,,,,,", ",,,,,,,", ",,,,,,,", ",,,,,,,",
+                                  ",,,,,,,", ",,,,,,,", "PW,,,,,,,", "KW,,,,,,,"])
+    pawn = piece_at(game, "PW")
+    engine = SimulationEngine(game, tick_ms=10)
+    # Act
+    result = engine.run([Command(100, pawn.piece_id, "Move", ["g1", "f1"])])
+    # Assert
+    assert pawn.current_state.physics.cell == (5, 0)
+    assert engine.is_settled()
+    assert not result.finished
+    assert result.game_time_ms > 100
+
+
+def test_run_stops_at_max_ms(create_game):
+    # Arrange
+    game = create_game(["KB,,,,,,,"] + [",,,,,,,"] * 6 + ["KW,,,,,,,"])
+    engine = SimulationEngine(game, tick_ms=20)
+    # Act
+    result = engine.run(max_ms=1000)
+    # Assert
+    assert result.ticks == 50
+    assert result.game_time_ms == 1000
+    assert result.winner is None
+
+
+def test_king_capture_ends_game(create_game):
+    # Arrange
+    game = create_game(["KB,,,,,,,", ",KW,,,,,,"] + [",,,,,,,"] * 6)
+    king = piece_at(game, "KW")
+    engine = SimulationEngine(game, tick_ms=5)
+    # Act
+    result = engine.run([Command(0, king.piece_id, "Move", ["b2", "a1"])], max_ms=5000)
+    # Assert
+    assert result.finished
+    assert result.winner == "White"
+    assert game.get_piece_at((0, 0)) is king
+
+
+def test_engine_requires_virtual_clock(create_game):
+    # Arrange
+    game = create_game(["KB,,,,,,,"] + [",,,,,,,"] * 7)
+    game.clock = MonotonicClock()
+    # Act + Assert
+    with pytest.raises(ValueError):
+        SimulationEngine(game)
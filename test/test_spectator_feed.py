@@ -0,0 +1,112 @@
+from app.Command import Command
+from app.SimulationEngine import SimulationEngine
+from app.SpectatorFeed import SpectatorFeed, SpectatorView, piece_row
+
+ROWS = ["KB,,,,,,,", ",PB,,,,,,", ",,,,,,,", ",,,,,,,",
+        ",,,,,,,", ",,,,,,,", "PW,,,,,,,", "KW,NW,,,,,,"]
+
+
+class SpectatorEngine(SimulationEngine):
+    def __init__(self, game):
+        super().__init__(game, tick_ms=10)
+        self.feed = SpectatorFeed(sorted(game.pieces_by_id), keyframe_every=50)
+
+    def run_feed(self, views, ms):
+        messages = []
+        for _ in range(ms // self.tick_ms):
+            self.step()
+            message = self.feed.next(self.game)
+            if message is not None:
+                messages.append(message)
+                for view in views:
+                    view.apply(message)
+        return messages
+
+
+def assert_view_matches(view, game):
+    assert set(view.pieces) == {p.piece_id for p in game.pieces}
+    for p in game.pieces:
+        cell, state, target, start, duration = piece_row(p)
+        v = view.pieces[p.piece_id]
+        assert (v.cell, v.state, v.move_duration) == ((cell >> 8, cell & 0xFF), state, duration)
+
+
+def test_only_changes_are_sent(create_game):
+    # Arrange
+    game = create_game(ROWS)
+    engine = SpectatorEngine(game)
+    view = SpectatorView()
+
+    # Act – idle board: a keyframe, then nothing until the next keyframe is due
+    quiet = engine.run_feed([view], 200)
+    engine.submit(Command(engine.clock.now_ms() + 10, game.get_piece_at((6, 0)).piece_id, "Move", ["g1", "f1"]))
+    busy = engine.run_feed([view], 200)
+
+    # Assert
+    assert len(quiet) == 1 and quiet[0][:1] == b"K"
+    assert len(busy) == 1 and busy[0][:1] == b"D"
+    assert len(busy[0]) < len(quiet[0]) / 3
+    assert_view_matches(view, game)
+
+
+def test_late_joiner_syncs_from_keyframe_and_interpolates(create_game):
+    # Arrange
+    game = create_game(ROWS)
+    engine = SpectatorEngine(game)
+    early = SpectatorView()
+    pawn = game.get_piece_at((6, 0))
+    engine.submit(Command(100, pawn.piece_id, "Move", ["g1", "f1"]))
+    engine.run_feed([early], 300)
+
+    # Act
+    late = SpectatorView()
+    late.apply(engine.feed.keyframe())
+    engine.run_feed([early, late], 2000)
+
+    # Assert
+    for view in (early, late):
+        assert view.synced
+        assert_view_matches(view, game)
+    moving = early.pieces[pawn.piece_id]
+    assert moving.position(0) == (5.0, 0.0)
+
+
+def test_view_interpolates_moves_between_messages(create_game):
+    # Arrange
+    game = create_game(ROWS)
+    engine = SpectatorEngine(game)
+    view = SpectatorView()
+    pawn = game.get_piece_at((6, 0))
+    engine.submit(Command(100, pawn.piece_id, "Move", ["g1", "f1"]))
+    # Act
+    engine.run_feed([view], 200)
+    piece = view.pieces[pawn.piece_id]
+    # Assert – one message describes the whole move
+    assert piece.state == 1
+    assert piece.move_start == 100
+    assert piece.position(100) == (6.0, 0.0)
+    assert piece.position(100 + piece.move_duration // 2) == (5.5, 0.0)
+    assert piece.position(5000) == (5.0, 0.0)
+
+
+def test_gap_waits_for_next_keyframe(create_game):
+    # Arrange
+    game = create_game(ROWS)
+    engine = SpectatorEngine(game)
+    view = SpectatorView()
+    view.apply(engine.feed.next(game))
+    pawn = game.get_piece_at((6, 0))
+    engine.submit(Command(20, pawn.piece_id, "Move", ["g1", "f1"]))
+    missed = engine.run_feed([], 100)
+
+    # Act
+    engine.submit(Command(engine.clock.now_ms() + 10, game.get_piece_at((7, 1)).piece_id, "Move", ["h2", "f3"]))
+    later = engine.run_feed([], 100)
+    applied = view.apply(later[0])
+    view.apply(engine.feed.keyframe())
+
+    # Assert
+    assert missed and not applied
+    assert view.gaps == 1
+    assert view.synced
+    assert_view_matches(view, game)
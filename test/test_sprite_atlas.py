@@ -0,0 +1,117 @@
+import mmap
+import pathlib
+import shutil
+import numpy as np
+import pytest
+from app.AssetCache import AssetCache
+from app.AssetPack import AssetPack, build_pack
+from app.GameRunner import GameRunner, GameSpec
+from app.SpriteAtlas import SpriteAtlas
+
+ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+
+def mapped(arr):
+    """True if `arr` is a view into an mmap (shared memory or a file)."""
+    base = arr
+    while isinstance(base, np.ndarray):
+        base = base.base
+    if isinstance(base, memoryview):
+        base = base.obj
+    return isinstance(base, mmap.mmap)
+
+
+def check_frames_are_mapped(game):
+    for piece in game.pieces:
+        if not all(mapped(f.img) for f in piece.current_state.graphics.frames):
+            raise AssertionError(f"{piece.piece_id} frames are private copies")
+
+
+def check_frames_are_private(game):
+    for piece in game.pieces:
+        if any(mapped(f.img) for f in piece.current_state.graphics.frames):
+            raise AssertionError(f"{piece.piece_id} got another tree's frames from the atlas")
+
+
+def test_atlas_indexes_every_state_of_the_tree():
+    # Act
+    atlas = SpriteAtlas.from_tree(ROOT / "pieces")
+    expected = AssetCache().get_frames(ROOT / "pieces" / "QW" / "states" / "jump" / "sprites", (100, 100))
+    # Assert
+    assert atlas.frames.shape == (300, 100, 100, 4)
+    assert len(atlas.index) == 60
+    assert len(atlas.frames_of("QW", "jump")) == len(expected)
+    assert np.array_equal(atlas.frame("QW", "jump", 1)[..., :expected[1].img.shape[2]], expected[1].img)
+    with pytest.raises(IndexError):
+        atlas.frame("QW", "jump", len(expected))
+
+
+def test_published_atlas_attaches_zero_copy():
+    # Arrange
+    atlas = SpriteAtlas.from_tree(ROOT / "pieces")
+    handle = atlas.publish()
+    cache = AssetCache()
+    # Act
+    view = SpriteAtlas.attach(handle)
+    view.install(ROOT / "pieces", cache)
+    frames = cache.get_frames(ROOT / "pieces" / "PW" / "states" / "idle" / "sprites", (100, 100))
+    # Assert
+    try:
+        assert np.array_equal(view.frames, atlas.frames)
+        assert not view.frames.flags.writeable
+        assert cache.stats()["misses"] == 0
+        assert all(mapped(f.img) for f in frames)
+    finally:
+        view.close()
+        atlas.close()
+    with pytest.raises(FileNotFoundError):
+        SpriteAtlas.attach(handle)
+
+
+def test_pack_frames_form_an_mmap_backed_atlas(tmp_path):
+    # Arrange
+    build_pack(ROOT / "pieces", tmp_path / "pieces.pack")
+    # Act
+    atlas = AssetPack.open(tmp_path / "pieces.pack").atlas()
+    # Assert
+    assert atlas.index == SpriteAtlas.from_tree(ROOT / "pieces").index
+    assert mapped(atlas.frame("PW", "idle", 0))
+
+
+def test_runner_workers_share_the_published_atlas():
+    # Arrange
+    atlas = SpriteAtlas.from_tree(ROOT / "pieces")
+    specs = [GameSpec(i, board_csv=str(ROOT / "board.csv"), board_img=str(ROOT / "my_board.png"),
+                      pieces_root=str(ROOT / "pieces"), max_ms=200, on_start=check_frames_are_mapped)
+             for i in range(2)]
+    runner = GameRunner(workers=1, games_per_worker=2, mp_context="fork", atlas=atlas)
+    # Act
+    try:
+        outcomes = runner.run(specs, timeout_s=60)
+    finally:
+        atlas.close()
+    # Assert
+    assert all(o.error is None for o in outcomes), outcomes[0].error
+
+
+def test_atlas_only_serves_the_tree_it_was_built_from(tmp_path):
+    # Arrange – a second pieces tree next to the one the atlas holds
+    other = tmp_path / "pieces"
+    for p_type in ("KB", "KW"):
+        shutil.copytree(ROOT / "pieces" / p_type, other / p_type)
+    csv = tmp_path / "board.csv"
+    csv.write_text("\n".join([",".join(str(i) for i in range(8)), "KB"] + [","] * 6 + [",KW"]))
+    atlas = SpriteAtlas.from_tree(ROOT / "pieces")
+    specs = [GameSpec(0, board_csv=str(csv), board_img=str(ROOT / "my_board.png"),
+                      pieces_root=str(other), max_ms=200, on_start=check_frames_are_private),
+             GameSpec(1, board_csv=str(ROOT / "board.csv"), board_img=str(ROOT / "my_board.png"),
+                      pieces_root=str(ROOT / "pieces"), max_ms=200, on_start=check_frames_are_mapped)]
+    runner = GameRunner(workers=1, games_per_worker=2, mp_context="fork", atlas=atlas)
+    # Act
+    try:
+        outcomes = runner.run(specs, timeout_s=60)
+    finally:
+        atlas.close()
+    # Assert
+    assert atlas.serves(ROOT / "pieces") and not atlas.serves(other)
+    assert [o.error for o in outcomes] == [None, None]
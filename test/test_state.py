@@ -0,0 +1,49 @@
+import pathlib
+from app.Board import Board
+from app.Command import Command
+from app.Img import Img
+from app.PieceFactory import PieceFactory
+
+PIECES = pathlib.Path(__file__).resolve().parent.parent / "pieces"
+
+
+def create_piece(p_type="PW", cell=(6, 0)):
+    board = Board(32, 32, 1, 1, 8, 8, Img())
+    piece = PieceFactory(board, PIECES).create_piece(p_type, cell)
+    piece.reset(0)
+    return piece
+
+
+def test_move_command_uses_preallocated_state():
+    # Arrange
+    piece = create_piece()
+    idle_state = piece.current_state
+    move_state = idle_state.transitions["Move"]
+    # Act
+    piece.on_command(Command(0, piece.piece_id, "Move", ["g1", "f1"]), 0)
+    # Assert
+    assert piece.current_state is move_state
+    assert piece.current_state.physics.target_cell == (5, 0)
+
+
+def test_transition_shares_frames_and_does_not_reload(monkeypatch):
+    # Arrange
+    piece = create_piece()
+    frames = piece.current_state.transitions["Move"].graphics.frames
+    def fail(*_, **__):
+        raise AssertionError("sprites must not be read on the command path")
+    monkeypatch.setattr(Img, "read", fail)
+    # Act
+    piece.on_command(Command(0, piece.piece_id, "Move", ["g1", "f1"]), 0)
+    # Assert
+    assert piece.current_state.graphics.frames is frames
+
+
+def test_illegal_move_stays_in_idle():
+    # Arrange
+    piece = create_piece()
+    idle_state = piece.current_state
+    # Act
+    piece.on_command(Command(0, piece.piece_id, "Move", ["g1", "a1"]), 0)
+    # Assert
+    assert piece.current_state is idle_state
@@ -0,0 +1,65 @@
+from app.Command import Command
+from app.SimulationEngine import SimulationEngine
+from app.TimerScheduler import TimerScheduler
+
+
+def test_pop_due_returns_only_expired_in_order():
+    # Arrange
+    scheduler = TimerScheduler()
+    scheduler.schedule("a", 300)
+    scheduler.schedule("b", 100)
+    scheduler.schedule("c", 500)
+    # Act
+    due = scheduler.pop_due(300)
+    # Assert
+    assert due == ["b", "a"]
+    assert scheduler.next_deadline() == 500
+    assert len(scheduler) == 1
+
+
+def test_reschedule_replaces_and_cancel_forgets():
+    # Arrange
+    scheduler = TimerScheduler()
+    scheduler.schedule("a", 100)
+    scheduler.schedule("a", 400)
+    scheduler.schedule("b", 200)
+    # Act
+    scheduler.cancel("b")
+    # Assert
+    assert scheduler.pop_due(300) == []
+    assert scheduler.next_deadline() == 400
+    assert scheduler.pop_due(400) == ["a"]
+    assert scheduler.next_deadline() is None
+
+
+def observe(game):
+    return sorted((p.piece_id, p.current_state.name, tuple(p.current_state.physics.cell))
+                  for p in game.pieces)
+
+
+def test_scheduled_game_matches_polling_game(create_game):
+    # Arrange
+    commands = [Command(50, "PW_1", "Move", ["g1", "f1"]),
+                Command(60, "PB_2", "Move", ["b2", "c2"]),
+                Command(400, "NW_1", "Jump", ["h2"]),
+                Command(2500, "PW_1", "Move", ["f1", "e1"])]
+    polled, scheduled = create_game(use_scheduler=False), create_game(use_scheduler=True)
+    engines = [SimulationEngine(polled, tick_ms=7), SimulationEngine(scheduled, tick_ms=7)]
+    for engine in engines:
+        engine.submit_all(commands)
+    # Act + Assert
+    for _ in range(700):
+        for engine in engines:
+            engine.step()
+        assert observe(polled) == observe(scheduled)
+    assert scheduled.next_deadline_ms() is None  # everybody back in Idle
+
+
+def test_idle_pieces_are_not_scheduled(create_game):
+    # Arrange
+    game = create_game(use_scheduler=True)
+    engine = SimulationEngine(game, tick_ms=10)
+    # Act
+    engine.start()
+    # Assert
+    assert len(game.scheduler) == 0